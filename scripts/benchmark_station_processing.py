@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark vectorized connector processing against the old per-row apply.
+
+Usage: PYTHONPATH=. python scripts/benchmark_station_processing.py [rows]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaner import DataCleaner
+from src.data_processing.station_processor import StationProcessor
+
+CONNECTORS = ["J1772", "J1772COMBO", "CHADEMO", "TESLA", "NEMA1450", "NEMA515", "DC_FAST"]
+
+def make_stations(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(0, 5, rows)
+    lists = [list(rng.choice(CONNECTORS, size)) for size in sizes]
+    # Some rows have no connector data at all
+    lists = [None if i % 50 == 0 else lst for i, lst in enumerate(lists)]
+    return pd.DataFrame({"ev_connector_types": lists})
+
+def legacy(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame(index=df.index)
+    out['connectors'] = df['ev_connector_types'].apply(
+        lambda x: list(set(x)) if isinstance(x, list) else ['Unknown'])
+    out['connector_count'] = out['connectors'].str.len()
+    out['has_fast_charging'] = df['ev_connector_types'].apply(
+        lambda x: any('DC' in c for c in x) if isinstance(x, list) else False)
+    out['connector_types'] = df['ev_connector_types'].apply(
+        lambda x: sorted(set(x)) if isinstance(x, list) else [])
+    return out
+
+def vectorized(df: pd.DataFrame) -> pd.DataFrame:
+    processor, cleaner = StationProcessor(), DataCleaner()
+    out = processor._add_metadata(processor._extract_connectors(df.copy()))
+    out['connector_types'] = cleaner._standardize_connectors(df.copy())['connector_types']
+    return out
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_stations(rows)
+
+    old, old_time = timed(legacy, df)
+    new, new_time = timed(vectorized, df)
+
+    # set() order is arbitrary, so compare the old connectors sorted
+    assert [sorted(c) for c in old['connectors']] == new['connectors'].tolist()
+    assert (old['connector_count'].to_numpy() == new['connector_count'].to_numpy()).all()
+    assert (old['has_fast_charging'].to_numpy() == new['has_fast_charging'].to_numpy()).all()
+    assert old['connector_types'].tolist() == new['connector_types'].tolist()
+
+    print(f"Rows:       {rows:,}")
+    print(f"apply:      {old_time:.3f}s")
+    print(f"vectorized: {new_time:.3f}s")
+    print(f"speedup:    {old_time / new_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+# src/data_collection/page_cache.py
+import hashlib
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.config.paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+class PageCache:
+    """Content-addressed on-disk cache of cleaned PDF pages.
+
+    Entries are keyed by (file hash, page index, cleaner version), so an
+    edited PDF or a change to the cleaning rules never serves stale text.
+    Least recently used pages are evicted once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR / "pdf_pages", max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "pages.sqlite"
+        self.max_bytes = max_bytes
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS pages (
+                        file_hash TEXT, page INTEGER, cleaner_version TEXT,
+                        text TEXT, size INTEGER, last_access REAL,
+                        PRIMARY KEY (file_hash, page, cleaner_version)
+                    )""")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS documents (
+                        file_hash TEXT PRIMARY KEY, pages INTEGER
+                    )""")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_access ON pages (last_access)")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+        """SHA-256 of the file contents"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_page_count(self, file_hash: str) -> Optional[int]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT pages FROM documents WHERE file_hash = ?", (file_hash,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def get_page(self, file_hash: str, page: int, cleaner_version: str) -> Tuple[bool, Optional[str]]:
+        """Single-page lookup returning (hit, text)"""
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT text FROM pages WHERE file_hash = ? AND page = ? AND cleaner_version = ?",
+                    (file_hash, page, cleaner_version)
+                ).fetchone()
+                if row is None:
+                    return False, None
+                conn.execute(
+                    "UPDATE pages SET last_access = ? WHERE file_hash = ? AND page = ? AND cleaner_version = ?",
+                    (time.time(), file_hash, page, cleaner_version)
+                )
+            return True, row[0]
+        finally:
+            conn.close()
+
+    def get_pages(self, file_hash: str, pages: Iterable[int], cleaner_version: str) -> Dict[int, Optional[str]]:
+        """Return cached page texts (``None`` for pages without text) keyed by index"""
+        conn = self._connect()
+        try:
+            with conn:
+                rows = conn.execute(
+                    "SELECT page, text FROM pages WHERE file_hash = ? AND cleaner_version = ?",
+                    (file_hash, cleaner_version)
+                ).fetchall()
+                wanted = set(pages)
+                hits = {page: text for page, text in rows if page in wanted}
+                if hits:
+                    conn.execute(
+                        "UPDATE pages SET last_access = ? WHERE file_hash = ? AND cleaner_version = ?",
+                        (time.time(), file_hash, cleaner_version)
+                    )
+            return hits
+        finally:
+            conn.close()
+
+    def put_pages(self, file_hash: str, page_count: int, pages: List[Tuple[int, Optional[str]]],
+                  cleaner_version: str):
+        """Store freshly extracted pages and evict old entries if over budget"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO documents (file_hash, pages) VALUES (?, ?)",
+                    (file_hash, page_count)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (file_hash, page, cleaner_version, text, len(text.encode('utf-8')) if text else 0, now)
+                        for page, text in pages
+                    ]
+                )
+            self._evict(conn)
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used pages until the cache fits in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        to_free = total - self.max_bytes
+        victims = []
+        for rowid, size in conn.execute("SELECT rowid, size FROM pages ORDER BY last_access"):
+            victims.append((rowid,))
+            to_free -= size
+            if to_free <= 0:
+                break
+        with conn:
+            conn.executemany("DELETE FROM pages WHERE rowid = ?", victims)
+        logger.info(f"Evicted {len(victims)} cached pages")
\ No newline at end of file
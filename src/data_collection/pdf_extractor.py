@@ -1,14 +1,45 @@
 # src/data_collection/pdf_extractor.py
 import PyPDF2
+import os
 import re
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.data_collection.page_cache import PageCache
+
+# Bump whenever _clean_text changes so cached pages are re-extracted
+CLEANER_VERSION = "1"
+
+# (page index, cleaned text, error message)
+PageResult = Tuple[int, Optional[str], Optional[str]]
+
+def _read_pages(reader: PyPDF2.PdfReader, indices: Sequence[int]) -> List[PageResult]:
+    """Extract and clean the given pages, recording per-page errors"""
+    results = []
+    for i in indices:
+        try:
+            page_text = reader.pages[i].extract_text()
+            results.append((i, PDFExtractor._clean_text(page_text) if page_text else None, None))
+        except Exception as e:
+            results.append((i, None, str(e)))
+    return results
+
+def _extract_page_shard(pdf_path: str, indices: Sequence[int]) -> List[PageResult]:
+    """Worker: open a private reader and extract one shard of pages"""
+    with open(pdf_path, 'rb') as f:
+        return _read_pages(PyPDF2.PdfReader(f), indices)
 
 class PDFExtractor:
-    def __init__(self, pdf_path: str):
-        """Initialize with either absolute or relative path"""
+    def __init__(self, pdf_path: str, max_workers: Optional[int] = None, cache: Optional[PageCache] = None):
+        """Initialize with either absolute or relative path
+
+        ``max_workers`` > 1 shards page ranges across a process pool.
+        ``cache`` serves unchanged pages from the on-disk page cache.
+        """
         self.pdf_path = Path(pdf_path).absolute()
+        self.max_workers = max_workers
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
         
         if not self.pdf_path.exists():
@@ -24,23 +55,19 @@ class PDFExtractor:
         }
 
         try:
-            with open(self.pdf_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                result['pages'] = len(reader.pages)
+            page_results = self._extract_pages()
+            result['pages'] = len(page_results)
                 
-                text_parts = []
-                for i, page in enumerate(reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            cleaned = self._clean_text(page_text)
-                            text_parts.append(f"--- PAGE {i+1} ---\n{cleaned}")
-                    except Exception as e:
-                        self.logger.warning(f"Page {i+1} error: {str(e)}")
-                
-                if text_parts:
-                    result['text'] = "\n\n".join(text_parts)
-                    result['status'] = "success"
+            text_parts = []
+            for i, cleaned, error in page_results:
+                if error:
+                    self.logger.warning(f"Page {i+1} error: {error}")
+                elif cleaned is not None:
+                    text_parts.append(f"--- PAGE {i+1} ---\n{cleaned}")
+            
+            if text_parts:
+                result['text'] = "\n\n".join(text_parts)
+                result['status'] = "success"
 
             return result
 
@@ -48,7 +75,99 @@ class PDFExtractor:
             self.logger.error(f"Extraction failed: {str(e)}")
             return result
 
-    def _clean_text(self, text: str) -> str:
+    def iter_pages(self, cache_batch: int = 64) -> Iterator[Dict]:
+        """Lazily yield one record per page so memory stays bounded by a single page
+
+        Freshly extracted pages go to the cache ``cache_batch`` at a time, so a
+        long document costs a few cache writes (and eviction passes), not one per page.
+        """
+        file_hash = self.cache.file_hash(self.pdf_path) if self.cache else None
+        pending: List[Tuple[int, Optional[str]]] = []
+        
+        with open(self.pdf_path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            page_count = len(reader.pages)
+            
+            try:
+                for i in range(page_count):
+                    hit, cleaned, error = False, None, None
+                    if self.cache:
+                        hit, cleaned = self.cache.get_page(file_hash, i, CLEANER_VERSION)
+                    if not hit:
+                        _, cleaned, error = _read_pages(reader, [i])[0]
+                        if self.cache and error is None:
+                            pending.append((i, cleaned))
+                            if len(pending) >= cache_batch:
+                                self.cache.put_pages(file_hash, page_count, pending, CLEANER_VERSION)
+                                pending = []
+                    
+                    if error:
+                        self.logger.warning(f"Page {i+1} error: {error}")
+                    yield {
+                        "source": self.pdf_path.name,
+                        "page": i + 1,
+                        "pages": page_count,
+                        "text": cleaned,
+                        "status": "error" if error else "success",
+                        "error": error
+                    }
+            finally:
+                # Also reached when the consumer stops early, so extracted pages aren't lost
+                if pending:
+                    self.cache.put_pages(file_hash, page_count, pending, CLEANER_VERSION)
+
+    def _extract_pages(self) -> List[PageResult]:
+        """Return every page in order, extracting only pages missing from the cache"""
+        file_hash, page_count, cached = None, None, {}
+        if self.cache:
+            file_hash = self.cache.file_hash(self.pdf_path)
+            page_count = self.cache.get_page_count(file_hash)
+            if page_count is not None:
+                cached = self.cache.get_pages(file_hash, range(page_count), CLEANER_VERSION)
+
+        fresh: List[PageResult] = []
+        if page_count is None or len(cached) < page_count:
+            with open(self.pdf_path, 'rb') as f:
+                reader = PyPDF2.PdfReader(f)
+                page_count = len(reader.pages)
+                missing = [i for i in range(page_count) if i not in cached]
+                
+                if self._use_pool(len(missing)):
+                    fresh = self._extract_parallel(missing)
+                else:
+                    fresh = _read_pages(reader, missing)
+            
+            if self.cache:
+                # Failed pages are left out so they are retried next run
+                self.cache.put_pages(
+                    file_hash, page_count,
+                    [(i, text) for i, text, error in fresh if error is None],
+                    CLEANER_VERSION
+                )
+        
+        if cached:
+            self.logger.info(f"Served {len(cached)}/{page_count} pages of {self.pdf_path.name} from cache")
+        page_results = fresh + [(i, text, None) for i, text in cached.items()]
+        return sorted(page_results, key=lambda r: r[0])
+
+    def _use_pool(self, page_count: int) -> bool:
+        return bool(self.max_workers) and self.max_workers > 1 and page_count > 1
+
+    def _extract_parallel(self, indices: List[int]) -> List[PageResult]:
+        """Shard contiguous page ranges across worker processes"""
+        workers = min(self.max_workers or os.cpu_count() or 1, len(indices))
+        # A few shards per worker keeps the pool balanced when page costs differ
+        shard_size = max(1, -(-len(indices) // (workers * 4)))
+        shards = [indices[s:s + shard_size] for s in range(0, len(indices), shard_size)]
+        
+        self.logger.info(f"Extracting {len(indices)} pages with {workers} processes")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_extract_page_shard, [str(self.pdf_path)] * len(shards), shards)
+            # map() yields shards in submission order, so pages stay in order
+            return [page for shard in results for page in shard]
+
+    @staticmethod
+    def _clean_text(text: str) -> str:
         """Enhanced text cleaning"""
         text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
         text = re.sub(r'[^\w\s.,:;\-\n]', '', text)  # Keep basic punctuation
@@ -0,0 +1,137 @@
+# src/data_collection/station_delta.py
+import os
+import hashlib
+import logging
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+class StationDeltaTracker:
+    """Detect added, changed and removed stations between scraper runs"""
+    KEY_COL = "id"
+    HASH_COL = "content_hash"
+    CHANGE_COL = "change_type"
+    CURRENT_FILE = "stations_current.parquet"
+    DELTA_SUBDIR = "deltas"
+
+    def __init__(self, state_dir: str, ignore_cols: Iterable[str] = ("date_last_confirmed",)):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.current_path = self.state_dir / self.CURRENT_FILE
+        self.delta_dir = self.state_dir / self.DELTA_SUBDIR
+        self.delta_dir.mkdir(exist_ok=True)
+        self.ignore_cols = set(ignore_cols)
+        self.logger = logging.getLogger(__name__)
+
+    def compute_hashes(self, df: pd.DataFrame) -> pd.Series:
+        """Stable per-station content hash (column order independent)"""
+        cols = sorted(
+            c for c in df.columns
+            if c not in self.ignore_cols and c not in (self.HASH_COL, self.CHANGE_COL)
+        )
+        if df.empty:
+            return pd.Series([], index=df.index, dtype=object)
+        # One C-level JSON serialization for the whole frame, then hash each record line
+        records = self._canonical(df[cols]).to_json(orient="records", lines=True, date_format="iso").splitlines()
+        return pd.Series(
+            [hashlib.sha1(r.encode("utf-8")).hexdigest() for r in records],
+            index=df.index
+        )
+
+    @staticmethod
+    def _canonical(df: pd.DataFrame) -> pd.DataFrame:
+        """Numbers as float64 so 5 and 5.0 (an int column that gained a NaN) hash the same"""
+        numeric = [c for c in df.columns
+                   if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+        return df.astype({c: "float64" for c in numeric}) if numeric else df
+
+    @classmethod
+    def snapshot_path(cls, path) -> Path:
+        """Full station table behind ``path``
+
+        A delta state dir or one of its delta files resolves to the compacted
+        current table, which already has removed stations dropped; any other
+        path is returned as is.
+        """
+        path = Path(path)
+        if path.is_dir():
+            return path / cls.CURRENT_FILE
+        if path.parent.name == cls.DELTA_SUBDIR and (path.parent.parent / cls.CURRENT_FILE).exists():
+            return path.parent.parent / cls.CURRENT_FILE
+        return path
+
+    def load_current(self) -> pd.DataFrame:
+        """Load the compacted current table (empty on first run)"""
+        if not self.current_path.exists():
+            return pd.DataFrame(columns=[self.KEY_COL, self.HASH_COL])
+        return pd.read_parquet(self.current_path)
+
+    def diff(self, snapshot: pd.DataFrame, current: Optional[pd.DataFrame] = None,
+             partial: bool = False) -> pd.DataFrame:
+        """Return only added/changed/removed station records.
+
+        With ``partial=True`` the snapshot is treated as an updated-since pull,
+        so stations missing from it are not reported as removed.
+        """
+        if self.KEY_COL not in snapshot.columns:
+            raise ValueError(f"Snapshot missing key column: {self.KEY_COL}")
+
+        current = self.load_current() if current is None else current
+        snapshot = snapshot.drop_duplicates(subset=self.KEY_COL, keep="last").copy()
+        snapshot[self.HASH_COL] = self.compute_hashes(snapshot)
+
+        previous = current.set_index(self.KEY_COL)[self.HASH_COL]
+        previous_hash = snapshot[self.KEY_COL].map(previous)
+
+        added = snapshot[previous_hash.isna()]
+        changed = snapshot[previous_hash.notna() & (previous_hash != snapshot[self.HASH_COL])]
+        parts = [
+            added.assign(**{self.CHANGE_COL: "added"}),
+            changed.assign(**{self.CHANGE_COL: "changed"})
+        ]
+        if not partial:
+            # Removed stations keep their last known record so the delta has one schema
+            removed = current[~current[self.KEY_COL].isin(snapshot[self.KEY_COL])]
+            parts.append(removed.assign(**{self.CHANGE_COL: "removed"}))
+
+        parts = [p for p in parts if not p.empty]
+        if not parts:
+            return snapshot.iloc[0:0].assign(**{self.CHANGE_COL: pd.Series(dtype=object)})
+        return pd.concat(parts, ignore_index=True)
+
+    def compact(self, current: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        """Fold a delta into the current table"""
+        touched = current[self.KEY_COL].isin(delta[self.KEY_COL])
+        upserts = delta[delta[self.CHANGE_COL] != "removed"].drop(columns=self.CHANGE_COL)
+        parts = [p for p in (current[~touched], upserts) if not p.empty]
+        if not parts:
+            return current.iloc[0:0]
+        return (pd.concat(parts, ignore_index=True)
+                .sort_values(self.KEY_COL)
+                .reset_index(drop=True))
+
+    def apply(self, snapshot: pd.DataFrame, partial: bool = False) -> Optional[Path]:
+        """Diff a fresh snapshot, write the delta file and update the current table"""
+        current = self.load_current()
+        delta = self.diff(snapshot, current, partial=partial)
+        counts = delta[self.CHANGE_COL].value_counts().to_dict()
+        self.logger.info(
+            f"Station delta: {counts.get('added', 0)} added, "
+            f"{counts.get('changed', 0)} changed, {counts.get('removed', 0)} removed"
+        )
+
+        if delta.empty:
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        delta_path = self.delta_dir / f"stations_delta_{timestamp}.parquet"
+        self._write_atomic(delta, delta_path)
+        self._write_atomic(self.compact(current, delta), self.current_path)
+        return delta_path
+
+    def _write_atomic(self, df: pd.DataFrame, path: Path):
+        """Write to a temp file and rename so readers never see a partial file"""
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
\ No newline at end of file
@@ -4,8 +4,13 @@ import pandas as pd
 import time
 from datetime import datetime
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from apscheduler.schedulers.blocking import BlockingScheduler
+from src.data_collection.station_delta import StationDeltaTracker
 
 # Configuration
 load_dotenv()
@@ -13,8 +18,16 @@ API_KEY = os.getenv("API_KEY")
 BASE_URL = "https://developer.nrel.gov/api/alt-fuel-stations/v1"
 CSV_FALLBACK_URL = "https://data.nrel.gov/system/files/156/alt_fuel_stations.csv"
 OUTPUT_DIR = "data/ev_stations"
+DELTA_STATE_DIR = "data/ev_stations_delta"  # Current table and deltas, kept apart from full snapshots
 LOG_FILE = "logs/ev_scraper.log"
 
+# Pagination
+PAGE_SIZE = 200  # NREL caps a single page at 200 stations
+MAX_WORKERS = 8  # Concurrent page requests
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+REQUEST_TIMEOUT = 15
+
 # Setup directories
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs("logs", exist_ok=True)
@@ -33,33 +46,117 @@ def run_scraper():
     """Wrapper function for the scheduler"""
     try:
         logging.info("=== Starting scraping job ===")
-        scrape_ev_data()
+        scrape_ev_data(delta=True)
         logging.info("=== Job completed ===")
     except Exception as e:
         logging.error(f"Job failed: {str(e)}")
 
-def scrape_ev_data():
-    """Main scraping function"""
+def build_session(pool_size: int = MAX_WORKERS,
+                  max_retries: int = MAX_RETRIES,
+                  backoff_factor: float = BACKOFF_FACTOR) -> requests.Session:
+    """Create a keep-alive session with retry/backoff shared by all page requests"""
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _fetch_page(session: requests.Session, url: str, params: Dict, offset: int, limit: int) -> Dict:
+    """Fetch a single offset page of stations"""
+    response = session.get(url, params={**params, "offset": offset, "limit": limit}, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_stations_paginated(
+    api_key: Optional[str] = API_KEY,
+    base_url: str = BASE_URL,
+    page_size: int = PAGE_SIZE,
+    max_workers: int = MAX_WORKERS,
+    max_pages: Optional[int] = None,
+    session: Optional[requests.Session] = None
+) -> pd.DataFrame:
+    """Fetch every station by issuing offset pages concurrently over a pooled session"""
+    url = f"{base_url}.json"
+    params = {
+        "api_key": api_key,
+        "fuel_type": "ELEC",
+        "country": "US"
+    }
+    owns_session = session is None
+    session = session or build_session(pool_size=max_workers)
+    
     try:
-        # Your existing scraping logic here
-        params = {
-            "api_key": API_KEY,
-            "fuel_type": "ELEC",
-            "country": "US",
-            "limit": 200
-        }
+        # First page tells us how many stations there are in total
+        first = _fetch_page(session, url, params, 0, page_size)
+        total = int(first.get("total_results", len(first["fuel_stations"])))
+        offsets = list(range(page_size, total, page_size))
+        if max_pages is not None:
+            offsets = offsets[:max(max_pages - 1, 0)]
+        logging.info(f"Fetching {total} stations in {len(offsets) + 1} pages ({max_workers} workers)")
         
+        pages: List[List[Dict]] = [first["fuel_stations"]]
+        if offsets:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() preserves offset order, so the snapshot is stable between runs
+                results = executor.map(
+                    lambda offset: _fetch_page(session, url, params, offset, page_size),
+                    offsets
+                )
+                pages.extend(page["fuel_stations"] for page in results)
+    finally:
+        if owns_session:
+            session.close()
+    
+    df = pd.DataFrame([station for page in pages for station in page])
+    if "id" in df.columns:
+        # Offsets can shift if stations are added mid-pull
+        df = df.drop_duplicates(subset="id", keep="first").reset_index(drop=True)
+    return df
+
+def scrape_ev_data(paginated: bool = True, max_workers: int = MAX_WORKERS, delta: bool = False):
+    """Main scraping function
+
+    In delta mode only added/changed/removed stations are written (plus the
+    compacted ``stations_current.parquet``) under DELTA_STATE_DIR instead of
+    a full snapshot. ``process_stations`` accepts the returned delta file
+    (or DELTA_STATE_DIR) and processes the current table behind it.
+    """
+    try:
         logging.info("Fetching EV station data...")
-        response = requests.get(f"{BASE_URL}.json", params=params, timeout=15)
-        response.raise_for_status()
+        start = time.perf_counter()
+        
+        if paginated:
+            df = fetch_stations_paginated(max_workers=max_workers)
+        else:
+            params = {
+                "api_key": API_KEY,
+                "fuel_type": "ELEC",
+                "country": "US",
+                "limit": PAGE_SIZE
+            }
+            response = requests.get(f"{BASE_URL}.json", params=params, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            
+            data = response.json()
+            df = pd.DataFrame(data["fuel_stations"])
         
-        data = response.json()
-        df = pd.DataFrame(data["fuel_stations"])
+        if delta:
+            delta_file = StationDeltaTracker(DELTA_STATE_DIR).apply(df)
+            logging.info(f"Delta scrape finished in {time.perf_counter() - start:.1f}s")
+            return delta_file
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = f"{OUTPUT_DIR}/stations_{timestamp}.parquet"
         df.to_parquet(output_file)
-        logging.info(f"Saved {len(df)} stations to {output_file}")
+        logging.info(f"Saved {len(df)} stations to {output_file} in {time.perf_counter() - start:.1f}s")
+        return output_file
         
     except Exception as e:
         logging.error(f"Scraping failed: {str(e)}")
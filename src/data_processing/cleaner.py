@@ -1,40 +1,63 @@
 # src/data_processing/cleaner.py
 import pandas as pd
+import pyarrow as pa
 import re
 import logging
 from typing import Dict, List
 from src.config.paths import PDF_DIR
+from src.data_processing.connectors import sorted_sets, to_connector_lists
+from src.data_processing.streaming import stream_transform
 
 logger = logging.getLogger(__name__)
 
 class DataCleaner:
+    REQUIRED_COLS = [
+        'id', 'station_name', 'latitude', 'longitude',
+        'ev_connector_types', 'ev_network'
+    ]
+
     def __init__(self):
         self.pdf_dir = PDF_DIR
 
     def clean_station_data(self, raw_df: pd.DataFrame) -> pd.DataFrame:
         """Clean EV station API data"""
-        REQUIRED_COLS = [
-            'id', 'station_name', 'latitude', 'longitude',
-            'ev_connector_types', 'ev_network'
-        ]
-        
         # Validate input
-        missing_cols = [col for col in REQUIRED_COLS if col not in raw_df]
+        missing_cols = [col for col in self.REQUIRED_COLS if col not in raw_df]
         if missing_cols:
             logger.error(f"Missing columns: {missing_cols}")
             raise ValueError("Input data missing required columns")
         
-        df = raw_df[REQUIRED_COLS].copy()
+        df = self._clean(raw_df[self.REQUIRED_COLS].copy())
+        
+        logger.info(f"Cleaned {len(df)} station records")
+        return df
+
+    def clean_station_file(self, parquet_path: str, output_path: str, batch_size: int = 65_536) -> int:
+        """Streaming variant: clean a parquet snapshot batch by batch
+
+        Only REQUIRED_COLS are read and each batch is cleaned in place (no
+        full-frame copy), then appended to ``output_path``.
+        """
+        try:
+            rows = stream_transform(
+                parquet_path, output_path, self._clean, self.REQUIRED_COLS,
+                derived_fields=[pa.field('connector_types', pa.list_(pa.string()))],
+                batch_size=batch_size
+            )
+        except ValueError as e:
+            logger.error(str(e))
+            raise ValueError("Input data missing required columns")
         
+        logger.info(f"Cleaned {rows} station records")
+        return rows
+
+    def _clean(self, df: pd.DataFrame) -> pd.DataFrame:
         # Cleaning operations
-        df = (df
+        return (df
               .pipe(self._clean_text_fields)
               .pipe(self._handle_missing_values)
               .pipe(self._standardize_connectors)
              )
-        
-        logger.info(f"Cleaned {len(df)} station records")
-        return df
 
     def _clean_text_fields(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean all text columns"""
@@ -46,13 +69,15 @@ class DataCleaner:
     def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
         """Handle null values consistently"""
         df['ev_network'] = df['ev_network'].fillna('UNKNOWN')
-        df['ev_connector_types'] = df['ev_connector_types'].fillna('[]')
+        # Empty lists rather than the string '[]', which made the column unwritable to parquet
+        missing = df['ev_connector_types'].isna()
+        df.loc[missing, 'ev_connector_types'] = pd.Series(
+            [[] for _ in range(missing.sum())], index=df.index[missing], dtype=object
+        )
         return df
 
     def _standardize_connectors(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize connector types"""
-        df['connector_types'] = (
-            df['ev_connector_types']
-            .apply(lambda x: sorted(set(x)) if isinstance(x, list) else [])
-        )
+        connector_types, _ = sorted_sets(to_connector_lists(df['ev_connector_types']), [])
+        df['connector_types'] = pd.Series(connector_types, index=df.index)
         return df
\ No newline at end of file
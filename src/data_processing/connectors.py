@@ -0,0 +1,97 @@
+# src/data_processing/connectors.py
+"""Vectorized helpers for list-valued connector columns.
+
+Connector lists are converted once to an Arrow ``list<string>`` array and
+then flattened to (row, value) pairs, so dedup, sort, count and substring
+checks run as column operations instead of per-row Python lambdas.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import List, Tuple
+
+CONNECTOR_TYPE = pa.list_(pa.string())
+# Connector lists come back from parquet as numpy arrays; other sequences (tuples) stay non-lists
+LIST_TYPES = (list, np.ndarray)
+# Largest vocabulary that fits an int64 bitmask per row
+MAX_BITMASK_VOCAB = 62
+
+def to_connector_lists(series: pd.Series) -> pa.ListArray:
+    """Arrow list array of connectors; non-list entries (None, NaN, '[]') become null"""
+    is_list = series.map(type).isin(LIST_TYPES)
+    values = series.where(is_list, None).to_numpy(dtype=object)
+    return pa.array(values, type=CONNECTOR_TYPE, from_pandas=True)
+
+def unique_sorted(lists: pa.ListArray) -> pa.ListArray:
+    """Per-row ``sorted(set(x))``, keeping null rows null"""
+    parents = pc.list_parent_indices(lists).to_numpy()
+    encoded = pc.dictionary_encode(pc.list_flatten(lists))
+    valid = encoded.indices.is_valid().to_numpy(zero_copy_only=False)
+
+    # Rank the (small) connector vocabulary once, then dedup/sort integer keys
+    vocab = encoded.dictionary
+    order = pc.sort_indices(vocab).to_numpy()
+    rank = np.empty(len(vocab), dtype=np.int64)
+    rank[order] = np.arange(len(vocab))
+
+    width = max(len(vocab), 1)
+    codes = encoded.indices.fill_null(0).to_numpy()[valid]
+    keys = np.sort(parents[valid].astype(np.int64) * width + rank[codes])
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+    rows, ranks = np.divmod(keys, width)
+
+    counts = np.bincount(rows, minlength=len(lists))
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+    return pa.ListArray.from_arrays(
+        pa.array(offsets, type=pa.int32()),
+        vocab.take(pa.array(order[ranks], type=pa.int64())),
+        mask=lists.is_null()
+    )
+
+def any_contains(lists: pa.ListArray, pattern: str) -> np.ndarray:
+    """Per-row ``any(pattern in c for c in x)``; null rows are False"""
+    parents = pc.list_parent_indices(lists).to_numpy()
+    matches = pc.match_substring(pc.list_flatten(lists), pattern).fill_null(False)
+    hits = np.bincount(parents, weights=matches.to_numpy(zero_copy_only=False), minlength=len(lists))
+    return hits > 0
+
+def connector_bitmasks(lists: pa.ListArray) -> Tuple[np.ndarray, List[str]]:
+    """One int64 bitmask per row over the connector vocabulary (null rows are -1)"""
+    parents = pc.list_parent_indices(lists).to_numpy()
+    flat = pc.list_flatten(lists)
+    encoded = pc.dictionary_encode(flat.drop_null())
+    vocab = encoded.dictionary.to_pylist()
+    if len(vocab) > MAX_BITMASK_VOCAB:
+        raise ValueError(f"Connector vocabulary too large for bitmasks ({len(vocab)})")
+
+    parents = parents[pc.is_valid(flat).to_numpy(zero_copy_only=False)]
+    bits = np.left_shift(1, encoded.indices.to_numpy().astype(np.int64))
+    # bitwise_or (not a sum) so duplicate connectors within a row collapse
+    masks = np.zeros(len(lists), dtype=np.int64)
+    np.bitwise_or.at(masks, parents, bits)
+    masks[lists.is_null().to_numpy(zero_copy_only=False)] = -1
+    return masks, vocab
+
+def sorted_sets(lists: pa.ListArray, default: list) -> Tuple[List[list], np.ndarray]:
+    """Per-row ``sorted(set(x))`` as Python lists plus their lengths.
+
+    Rows are reduced to a bitmask over the connector vocabulary, so each
+    distinct connector set is built and sorted once. Rows with the same set
+    share that list object, so treat the results as read-only.
+    """
+    try:
+        masks, vocab = connector_bitmasks(lists)
+    except ValueError:
+        rows = unique_sorted(lists).to_pylist()
+        rows = [default if row is None else row for row in rows]
+        return rows, np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+
+    codes, uniques = pd.factorize(masks)
+    patterns = np.empty(len(uniques), dtype=object)
+    for i, mask in enumerate(uniques):
+        patterns[i] = list(default) if mask == -1 else sorted(
+            value for bit, value in enumerate(vocab) if mask >> bit & 1
+        )
+    lengths = np.fromiter(map(len, patterns), dtype=np.int64, count=len(patterns))
+    return patterns[codes].tolist(), lengths[codes]
\ No newline at end of file
@@ -1,13 +1,25 @@
 # src/data_processing/process.py
+import os
+import re
+import time
 import logging
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 
 from src.data_collection.pdf_extractor import PDFExtractor
+from src.data_collection.page_cache import PageCache
+from src.data_collection.station_delta import StationDeltaTracker
 from src.data_processing.station_processor import StationProcessor
 from src.data_processing.tokenizer import TextTokenizer
 from src.data_processing.storage import DataStorage
+from src.data_processing.spatial_index import StationSpatialIndex
+from src.data_processing.station_dedup import StationDeduplicator
+
+PathArg = Union[str, Sequence[str]]
 
 def configure_logging():
     logging.basicConfig(
@@ -19,38 +31,119 @@ def configure_logging():
         ]
     )
 
-def run_pipeline(
-    pdf_path: str = "D:/ev-charging-qa-pipeline/data/pdfs/sample.pdf",
-    station_path: str = "D:/ev-charging-qa-pipeline/data/ev_stations/stations_20250729_195245.parquet"
-) -> Tuple[bool, bool]:
-    """Run complete processing pipeline"""
+def pdf_artifact_name(pdf_path: str) -> str:
+    """Storage name of one document's output, so concurrent documents never share a name"""
+    return "processed_pdf_" + re.sub(r"[^\w.-]+", "_", Path(pdf_path).stem)
+
+def process_pdf(pdf_path: str, stream_pdf: bool = False, n_process: int = 1) -> bool:
+    """PDF branch: extract, tokenize and store one document.
+
+    Runs in a worker process, so it builds its own extractor, tokenizer and storage.
+    """
     logger = logging.getLogger(__name__)
-    storage = DataStorage()
-    
-    # 1. Process PDF
-    pdf_success = False
     try:
-        logger.info("Processing PDF...")
-        pdf_data = PDFExtractor(pdf_path).extract_text()
+        logger.info(f"Processing PDF {pdf_path}...")
+        storage = DataStorage()
+        extractor = PDFExtractor(pdf_path, cache=PageCache())
         
-        if pdf_data['status'] == 'success':
-            tokenized = TextTokenizer().batch_process([pdf_data])
-            storage.save(tokenized, "processed_pdf", "json")
-            pdf_success = True
+        if stream_pdf:
+            pages = TextTokenizer().process_stream(extractor.iter_pages())
+            first = next(pages, None)
+            if first is None:
+                logger.warning(f"No text extracted from {pdf_path}")
+                return False
+            storage.save_stream(chain([first], pages), pdf_artifact_name(pdf_path))
+            return True
+        
+        pdf_data = extractor.extract_text()
+        if pdf_data['status'] != 'success':
+            return False
+        tokenized = TextTokenizer(n_process=n_process).batch_process([pdf_data])
+        storage.save(tokenized, pdf_artifact_name(pdf_path), "parquet")
+        return True
     except Exception as e:
-        logger.error(f"PDF processing failed: {str(e)}")
+        logger.error(f"PDF processing failed for {pdf_path}: {str(e)}")
+        return False
+
+def process_stations(station_paths: List[str]) -> bool:
+    """Station branch: clean every snapshot and store them as one table
 
-    # 2. Process Stations
-    station_success = False
+    Delta files (or a delta state dir) from the scraper's delta mode stand
+    for their compacted current table, so processed stations follow every
+    change, removals included.
+    """
+    logger = logging.getLogger(__name__)
     try:
         logger.info("Processing station data...")
-        stations = StationProcessor().process_stations(station_path)
-        storage.save(stations, "processed_stations", "parquet")
-        station_success = True
+        # Several deltas of one state dir share the same current table
+        station_paths = list(dict.fromkeys(StationDeltaTracker.snapshot_path(p) for p in station_paths))
+        with ThreadPoolExecutor(max_workers=len(station_paths)) as executor:
+            frames = list(executor.map(StationProcessor().process_stations, station_paths))
+        
+        stations = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if len(frames) > 1 and 'id' in stations.columns:
+            # Later snapshots win for stations present in several feeds
+            stations = stations.drop_duplicates(subset='id', keep='last').reset_index(drop=True)
+        
+        storage = DataStorage()
+        if 'id' in stations.columns:
+            # Same site listed under slightly different names would otherwise yield duplicate QA pairs
+            stations, merge_log = StationDeduplicator().deduplicate(stations)
+            storage.save(merge_log, "station_merge_log", "parquet")
+        stations_path = storage.save(stations, "processed_stations", "parquet")
+        StationSpatialIndex.from_frame(stations, stations_file=stations_path.name).save(storage)
+        return True
     except Exception as e:
         logger.error(f"Station processing failed: {str(e)}")
+        return False
 
-    logger.info(f"Pipeline completed - PDF: {pdf_success}, Stations: {station_success}")
+def run_pipeline(
+    pdf_path: PathArg = "D:/ev-charging-qa-pipeline/data/pdfs/sample.pdf",
+    station_path: PathArg = "D:/ev-charging-qa-pipeline/data/ev_stations/stations_20250729_195245.parquet",
+    stream_pdf: bool = False,
+    max_pdf_workers: Optional[int] = None
+) -> Tuple[bool, bool]:
+    """Run complete processing pipeline
+
+    The PDF and station branches share nothing, so they run concurrently:
+    stations in a thread, CPU-heavy PDF work in worker processes (one per
+    document). Each branch reports success only if all its inputs succeeded.
+
+    ``stream_pdf`` tokenizes and writes the PDF page by page (JSONL) so
+    memory stays bounded by one page for very large documents.
+    """
+    logger = logging.getLogger(__name__)
+    pdf_paths = [pdf_path] if isinstance(pdf_path, (str, Path)) else list(pdf_path)
+    station_paths = [station_path] if isinstance(station_path, (str, Path)) else list(station_path)
+    start = time.perf_counter()
+    
+    cpus = os.cpu_count() or 1
+    pdf_workers = max(1, min(len(pdf_paths), max_pdf_workers or cpus))
+    # Split the cores between concurrent documents for spaCy's own workers
+    n_process = max(1, cpus // pdf_workers)
+    
+    pdf_success, station_success = False, False
+    with ProcessPoolExecutor(max_workers=pdf_workers) as pdf_pool, \
+            ThreadPoolExecutor(max_workers=1) as station_pool:
+        station_future = station_pool.submit(process_stations, station_paths) if station_paths else None
+        pdf_futures = [pdf_pool.submit(process_pdf, path, stream_pdf, n_process) for path in pdf_paths]
+        
+        pdf_results = []
+        for path, future in zip(pdf_paths, pdf_futures):
+            try:
+                pdf_results.append(future.result())
+            except Exception as e:
+                logger.error(f"PDF worker crashed for {path}: {str(e)}")
+                pdf_results.append(False)
+        pdf_success = bool(pdf_results) and all(pdf_results)
+        
+        if station_future is not None:
+            station_success = station_future.result()
+
+    logger.info(
+        f"Pipeline completed in {time.perf_counter() - start:.1f}s - "
+        f"PDF: {pdf_success} ({sum(pdf_results)}/{len(pdf_paths)}), Stations: {station_success}"
+    )
     return pdf_success, station_success
 
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+# src/data_processing/spatial_index.py
+import json
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import List, Optional, Tuple
+from src.data_processing.connectors import connector_bitmasks, to_connector_lists
+from src.data_processing.storage import DataStorage
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = np.pi * EARTH_RADIUS_KM / 180
+INDEX_NAME = "station_index"
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in kilometres (one point to many, or element-wise pairs)"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+class StationSpatialIndex:
+    """Grid index over station coordinates for radius and k-nearest lookups.
+
+    Stations are bucketed into ``cell_deg`` x ``cell_deg`` lat/lon cells and
+    stored sorted by cell key, so every latitude row of cells a query
+    touches is one contiguous slice found by binary search. Exact haversine
+    distances are then computed only for those candidates.
+    """
+
+    def __init__(self, stations: pd.DataFrame, connector_vocab: List[str], cell_deg: float = 0.1,
+                 stations_file: Optional[str] = None):
+        self.cell_deg = cell_deg
+        self.lon_cells = int(np.ceil(360 / cell_deg))
+        self.connector_vocab = list(connector_vocab)
+        # Station artifact the index was built from, so readers can match the two
+        self.stations_file = stations_file
+
+        keys = self._cell_keys(stations['latitude'].to_numpy(), stations['longitude'].to_numpy())
+        order = np.argsort(keys, kind="stable")
+        self.stations = stations.iloc[order].reset_index(drop=True)
+        self.keys = keys[order]
+        self.lats = self.stations['latitude'].to_numpy(dtype=np.float64)
+        self.lons = self.stations['longitude'].to_numpy(dtype=np.float64)
+        self.fast = self.stations['has_fast_charging'].to_numpy(dtype=bool)
+        self.connector_masks = self.stations['connector_mask'].to_numpy(dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cell_deg: float = 0.1,
+                   stations_file: Optional[str] = None) -> "StationSpatialIndex":
+        """Build from StationProcessor output (rows without coordinates are skipped)"""
+        df = df[df['latitude'].notna() & df['longitude'].notna()]
+        source = 'connectors' if 'connectors' in df.columns else 'ev_connector_types'
+        masks, vocab = connector_bitmasks(to_connector_lists(df[source]))
+
+        stations = pd.DataFrame({
+            'id': df['id'].to_numpy() if 'id' in df.columns else np.arange(len(df)),
+            'station_name': df['station_name'].to_numpy() if 'station_name' in df.columns else None,
+            'latitude': df['latitude'].to_numpy(dtype=np.float64),
+            'longitude': df['longitude'].to_numpy(dtype=np.float64),
+            'has_fast_charging': (df['has_fast_charging'].fillna(False).to_numpy(dtype=bool)
+                                  if 'has_fast_charging' in df.columns else np.zeros(len(df), dtype=bool)),
+            'connector_mask': np.where(masks < 0, 0, masks)
+        })
+        return cls(stations, vocab, cell_deg=cell_deg, stations_file=stations_file)
+
+    def save(self, storage: Optional[DataStorage] = None) -> Path:
+        """Persist through DataStorage as parquet, already sorted by cell, with grid settings in the metadata"""
+        table = pa.Table.from_pandas(self.stations, preserve_index=False)
+        meta = {"cell_deg": self.cell_deg, "connector_vocab": self.connector_vocab,
+                "stations_file": self.stations_file}
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b"station_index": json.dumps(meta).encode()
+        })
+        path = (storage or DataStorage()).save(table, INDEX_NAME, "parquet")
+        logger.info(f"Saved spatial index over {len(self.stations)} stations to {path.name}")
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None, storage: Optional[DataStorage] = None) -> "StationSpatialIndex":
+        """Load ``path``, or the latest index in ``storage``"""
+        if path is None:
+            storage = storage or DataStorage()
+            entry = storage.latest_entry(INDEX_NAME)
+            if entry is None:
+                raise FileNotFoundError(f"No {INDEX_NAME} in {storage.output_dir}")
+            path = storage.output_dir / entry["file"]
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[b"station_index"])
+        return cls(table.to_pandas(), meta["connector_vocab"], cell_deg=meta["cell_deg"],
+                   stations_file=meta.get("stations_file"))
+
+    def query_radius(self, lat: float, lon: float, radius_km: float,
+                     fast_only: bool = False, connector: Optional[str] = None) -> pd.DataFrame:
+        """Stations within ``radius_km``, nearest first"""
+        idx, dist = self._within(lat, lon, radius_km, fast_only, connector)
+        order = np.argsort(dist, kind="stable")
+        return self._result(idx[order], dist[order])
+
+    def nearest(self, lat: float, lon: float, k: int = 5,
+                fast_only: bool = False, connector: Optional[str] = None) -> pd.DataFrame:
+        """The ``k`` nearest matching stations"""
+        radius = self.cell_deg * KM_PER_DEG_LAT
+        while True:
+            idx, dist = self._within(lat, lon, radius, fast_only, connector)
+            # Everything inside the radius was checked, so the k closest found are exact
+            if len(idx) >= k or radius >= np.pi * EARTH_RADIUS_KM:
+                break
+            radius *= 4
+        top = np.argsort(dist, kind="stable")[:k]
+        return self._result(idx[top], dist[top])
+
+    def _within(self, lat: float, lon: float, radius_km: float,
+                fast_only: bool, connector: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = self._candidates(lat, lon, radius_km)
+        mask = np.ones(len(candidates), dtype=bool)
+        if fast_only:
+            mask &= self.fast[candidates]
+        if connector is not None:
+            if connector not in self.connector_vocab:
+                return candidates[:0], np.empty(0)
+            bit = np.int64(1) << self.connector_vocab.index(connector)
+            mask &= (self.connector_masks[candidates] & bit) != 0
+        candidates = candidates[mask]
+
+        dist = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        keep = dist <= radius_km
+        return candidates[keep], dist[keep]
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Row positions of stations in every grid cell the query circle can touch"""
+        dlat = radius_km / KM_PER_DEG_LAT
+        lat_lo, lat_hi = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        cos_lat = np.cos(np.radians(max(abs(lat_lo), abs(lat_hi))))
+        dlon = 180.0 if cos_lat < 1e-6 else min(dlat / cos_lat, 180.0)
+
+        lon_ranges = [(lon - dlon, lon + dlon)]
+        if dlon >= 180.0:
+            lon_ranges = [(-180.0, 180.0)]
+        elif lon - dlon < -180.0:
+            lon_ranges = [(-180.0, lon + dlon), (lon - dlon + 360.0, 180.0)]
+        elif lon + dlon > 180.0:
+            lon_ranges = [(lon - dlon, 180.0), (-180.0, lon + dlon - 360.0)]
+
+        slices = []
+        for row in range(self._lat_cell(lat_lo), self._lat_cell(lat_hi) + 1):
+            for lo, hi in lon_ranges:
+                start = np.searchsorted(self.keys, row * self.lon_cells + self._lon_cell(lo), side="left")
+                end = np.searchsorted(self.keys, row * self.lon_cells + self._lon_cell(hi), side="right")
+                if end > start:
+                    slices.append(np.arange(start, end))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def _result(self, idx: np.ndarray, dist: np.ndarray) -> pd.DataFrame:
+        result = self.stations.iloc[idx][['id', 'station_name', 'latitude', 'longitude', 'has_fast_charging']]
+        return result.assign(distance_km=dist).reset_index(drop=True)
+
+    def _lat_cell(self, lat):
+        return np.floor((np.asarray(lat) + 90.0) / self.cell_deg).astype(np.int64)
+
+    def _lon_cell(self, lon):
+        return np.minimum(np.floor((np.asarray(lon) + 180.0) / self.cell_deg).astype(np.int64), self.lon_cells - 1)
+
+    def _cell_keys(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return self._lat_cell(lats) * self.lon_cells + self._lon_cell(lons)
\ No newline at end of file
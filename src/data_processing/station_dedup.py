@@ -0,0 +1,152 @@
+# src/data_processing/station_dedup.py
+import logging
+import numpy as np
+import pandas as pd
+from typing import Tuple
+from rapidfuzz import fuzz
+from rapidfuzz.process import cpdist
+from rapidfuzz.utils import default_process
+from src.data_processing.spatial_index import KM_PER_DEG_LAT, haversine_km
+
+# Half of the 3x3 neighbourhood (row offset, column offset); the mirrored offsets are covered by symmetry
+NEIGHBOUR_OFFSETS = [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+MERGE_LOG_COLS = ['station_id', 'canonical_id', 'station_name', 'canonical_name', 'distance_m', 'name_score']
+
+class StationDeduplicator:
+    """Collapse near-identical station rows (same site, slightly different names).
+
+    Stations are blocked into latitude rows ``max_distance_m`` tall, split
+    into longitude cells at least ``max_distance_m`` wide at the poleward
+    edge of the row and the one above it, so any pair within
+    ``max_distance_m`` lies in the same or adjacent cells and only those
+    pairs are ever compared. Pairs closer than
+    ``max_distance_m`` whose names score at least ``name_threshold`` (and
+    contain the same numbers) match. Matches are settled from the lowest id
+    up: a station merges into the lowest-id station it matches directly, so
+    a chain A~B~C never merges C into A unless C matches A itself.
+    """
+
+    def __init__(self, max_distance_m: float = 100.0, name_threshold: float = 90.0):
+        self.max_distance_m = max_distance_m
+        self.name_threshold = name_threshold
+        self.logger = logging.getLogger(__name__)
+
+    def deduplicate(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Keep one row per canonical station; returns (stations, merge log)"""
+        df = self.assign_canonical_ids(df)
+        merge_log = self._merge_log(df)
+        # By position, not id: repeated ids in a snapshot must not keep both rows
+        deduped = df[self._canonical == np.arange(len(df))].reset_index(drop=True)
+        self.logger.info(f"Merged {len(merge_log)} duplicate stations, {len(deduped)} remain")
+        return deduped, merge_log
+
+    def assign_canonical_ids(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add ``canonical_id`` (the station's own id unless it was merged)"""
+        df = df.reset_index(drop=True)
+        left, right, distance = self._candidate_pairs(df)
+
+        names = df['station_name'].fillna('').to_numpy(dtype=object)
+        scores = cpdist(names[left], names[right], scorer=fuzz.token_sort_ratio,
+                        processor=default_process, workers=-1)
+        # Names differing only in a number ("Garage Level 1"/"Level 2") are separate stations
+        numbers = df['station_name'].fillna('').str.findall(r'\d+').str.join(' ').to_numpy(dtype=object)
+        matched = (scores >= self.name_threshold) & (numbers[left] == numbers[right])
+        self._pairs = pd.DataFrame({
+            'left': left[matched], 'right': right[matched],
+            'distance_m': distance[matched], 'name_score': scores[matched]
+        })
+
+        ids = df['id'].to_numpy()
+        self._canonical = self._canonical_positions(ids, left[matched], right[matched])
+        return df.assign(canonical_id=ids[self._canonical])
+
+    def _candidate_pairs(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Row pairs in neighbouring cells that lie within ``max_distance_m``"""
+        lats = df['latitude'].to_numpy(dtype=np.float64)
+        lons = df['longitude'].to_numpy(dtype=np.float64)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+
+        # Cells in degrees: a fixed height, and widths shared by each pair of adjacent
+        # rows (so both rows of a pair are binned alike, whatever their latitude)
+        cell_deg = self.max_distance_m / (KM_PER_DEG_LAT * 1000)
+        pos = np.flatnonzero(valid)
+        rows = np.floor(lats[valid] / cell_deg)
+        same_row = pd.DataFrame({
+            'pos': pos, 'cy': rows.astype(np.int64),
+            'cx': np.floor(lons[valid] / self._cell_width(rows, cell_deg)).astype(np.int64)
+        })
+        # Each station again as the upper row of a pair, binned with the lower row's width
+        upper_row = pd.DataFrame({
+            'pos': pos, 'cy': (rows - 1).astype(np.int64),
+            'cx': np.floor(lons[valid] / self._cell_width(rows - 1, cell_deg)).astype(np.int64)
+        })
+
+        lefts, rights = [], []
+        for dy, dx in NEIGHBOUR_OFFSETS:
+            others = same_row if dy == 0 else upper_row
+            shifted = others.assign(cx=others['cx'] - dx)
+            pairs = same_row.merge(shifted, on=['cx', 'cy'], suffixes=('_l', '_r'))
+            if (dy, dx) == (0, 0):
+                pairs = pairs[pairs['pos_l'] < pairs['pos_r']]
+            lefts.append(pairs['pos_l'].to_numpy())
+            rights.append(pairs['pos_r'].to_numpy())
+        left, right = np.concatenate(lefts), np.concatenate(rights)
+
+        distance = haversine_km(lats[left], lons[left], lats[right], lons[right]) * 1000
+        close = distance <= self.max_distance_m
+        return left[close], right[close], distance[close]
+
+    @staticmethod
+    def _cell_width(rows: np.ndarray, cell_deg: float) -> np.ndarray:
+        """Longitude width (degrees) covering ``cell_deg`` of distance across rows ``r`` and ``r + 1``"""
+        poleward = np.minimum(np.maximum(np.abs(rows), np.abs(rows + 2)) * cell_deg, 90.0)
+        # Near the poles a single cell spans every longitude
+        return cell_deg / np.maximum(np.cos(np.radians(poleward)), cell_deg / 360)
+
+    @staticmethod
+    def _canonical_positions(ids: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Row position of each station's canonical station
+
+        Pairs are settled in id order (row position breaks ties between
+        repeated ids): a station still standing absorbs every unmerged
+        station it matches, and a merged station absorbs nothing.
+        """
+        n = len(ids)
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.lexsort((np.arange(n), ids))] = np.arange(n)
+        # Orient each pair as (lower-ranked, higher-ranked) and settle the lower ranks first
+        low = np.where(rank[left] < rank[right], left, right)
+        high = np.where(rank[left] < rank[right], right, left)
+        order = np.lexsort((rank[high], rank[low]))
+
+        canonical = np.arange(n)
+        for a, b in zip(low[order].tolist(), high[order].tolist()):
+            if canonical[a] == a and canonical[b] == b:
+                canonical[b] = a
+        return canonical
+
+    def _merge_log(self, df: pd.DataFrame) -> pd.DataFrame:
+        """One row per merged station with its canonical station and the pair that matched them"""
+        merged = np.flatnonzero(self._canonical != np.arange(len(df)))
+        if not len(merged):
+            return pd.DataFrame(columns=MERGE_LOG_COLS)
+
+        # Evidence for each merged row: its (direct) pair with the canonical station
+        pairs = pd.concat([
+            self._pairs.rename(columns={'left': 'pos', 'right': 'other'}),
+            self._pairs.rename(columns={'right': 'pos', 'left': 'other'})
+        ])
+        evidence = (pairs[pairs['other'].to_numpy() == self._canonical[pairs['pos'].to_numpy()]]
+                    .drop_duplicates('pos')
+                    .set_index('pos'))
+
+        canonical = self._canonical[merged]
+        names = df['station_name'].to_numpy(dtype=object)
+        return pd.DataFrame({
+            'station_id': df['id'].to_numpy()[merged],
+            'canonical_id': df['id'].to_numpy()[canonical],
+            'station_name': names[merged],
+            'canonical_name': names[canonical],
+            'distance_m': evidence.loc[merged, 'distance_m'].to_numpy(),
+            'name_score': evidence.loc[merged, 'name_score'].to_numpy()
+        })
\ No newline at end of file
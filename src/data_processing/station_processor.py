@@ -1,30 +1,33 @@
 # src/data_processing/station_processor.py
 import pandas as pd
+import pyarrow as pa
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from src.data_processing.connectors import any_contains, sorted_sets, to_connector_lists
+from src.data_processing.streaming import available_columns, stream_transform
 
 class StationProcessor:
+    REQUIRED_COLS = ['station_name', 'latitude', 'longitude', 'ev_connector_types']
+    # Columns kept by the streaming mode (whichever exist in the snapshot)
+    STREAM_COLS = [
+        'id', 'station_name', 'latitude', 'longitude', 'ev_connector_types',
+        'ev_network', 'ev_dc_fast_num', 'ev_level2_evse_num',
+        'street_address', 'city', 'state', 'zip', 'country', 'updated_at'
+    ]
+    DERIVED_FIELDS = [
+        pa.field('connectors', pa.list_(pa.string())),
+        pa.field('connector_count', pa.int64()),
+        pa.field('has_fast_charging', pa.bool_())
+    ]
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
     def process_stations(self, parquet_path: str) -> pd.DataFrame:
         """Process the station data from your parquet file"""
         try:
-            df = pd.read_parquet(parquet_path)
-            
-            # Validate required columns
-            required_cols = {'station_name', 'latitude', 'longitude', 'ev_connector_types'}
-            missing = required_cols - set(df.columns)
-            if missing:
-                raise ValueError(f"Missing columns: {missing}")
-
-            # Clean data
-            df = (df
-                .pipe(self._clean_names)
-                .pipe(self._extract_connectors)
-                .pipe(self._add_metadata)
-            )
+            df = self._transform(pd.read_parquet(parquet_path))
             
             self.logger.info(f"Processed {len(df)} stations")
             return df
@@ -33,6 +36,46 @@ class StationProcessor:
             self.logger.error(f"Station processing failed: {str(e)}")
             raise
 
+    def process_stations_streaming(self, parquet_path: str, output_path: str,
+                                   columns: Optional[List[str]] = None,
+                                   batch_size: int = 65_536) -> int:
+        """Process a snapshot row group by row group straight into ``output_path``
+
+        Reads only ``columns`` (default: STREAM_COLS present in the file),
+        so peak memory stays flat as the station table grows.
+        """
+        try:
+            columns = available_columns(parquet_path, (columns or self.STREAM_COLS) + ['change_type'])
+            rows = stream_transform(
+                parquet_path, output_path, self._transform, columns,
+                derived_fields=self.DERIVED_FIELDS, batch_size=batch_size
+            )
+            
+            self.logger.info(f"Processed {rows} stations")
+            return rows
+
+        except Exception as e:
+            self.logger.error(f"Station processing failed: {str(e)}")
+            raise
+
+    def _transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Validate and clean one frame (a whole snapshot or a single batch)"""
+        # Delta files carry removed stations for bookkeeping only
+        if 'change_type' in df.columns:
+            df = df[df['change_type'] != 'removed'].copy()
+        
+        # Validate required columns
+        missing = set(self.REQUIRED_COLS) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+
+        # Clean data
+        return (df
+            .pipe(self._clean_names)
+            .pipe(self._extract_connectors)
+            .pipe(self._add_metadata)
+        )
+
     def _clean_names(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean station names"""
         df['station_name'] = (
@@ -44,17 +87,12 @@ class StationProcessor:
 
     def _extract_connectors(self, df: pd.DataFrame) -> pd.DataFrame:
         """Process connector types"""
-        df['connectors'] = (
-            df['ev_connector_types']
-            .apply(lambda x: list(set(x)) if isinstance(x, list) else ['Unknown'])
-        )
-        df['connector_count'] = df['connectors'].str.len()
+        connectors, counts = sorted_sets(to_connector_lists(df['ev_connector_types']), ['Unknown'])
+        df['connectors'] = pd.Series(connectors, index=df.index)
+        df['connector_count'] = counts
         return df
 
     def _add_metadata(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add derived fields"""
-        df['has_fast_charging'] = (
-            df['ev_connector_types']
-            .apply(lambda x: any('DC' in c for c in x) if isinstance(x, list) else False)
-        )
+        df['has_fast_charging'] = any_contains(to_connector_lists(df['ev_connector_types']), 'DC')
         return df
\ No newline at end of file
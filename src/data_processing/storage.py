@@ -1,46 +1,285 @@
 # src/data_processing/storage.py
+import os
+import time
+import hashlib
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import json
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from src.config.paths import PROCESSED_DIR
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 logger = logging.getLogger(__name__)
 
 class DataStorage:
+    """Versioned artifact store for processed data.
+
+    Every save goes through a temp file plus rename and is then recorded in
+    ``manifest.json`` (file, version, rows, schema, checksum), so readers
+    never see half-written files and the latest artifact is found without
+    scanning the directory.
+    """
+    MANIFEST = "manifest.json"
+    FORMATS = ("parquet", "arrow", "json", "jsonl")
+
     def __init__(self, output_dir: Path = PROCESSED_DIR):
-        self.output_dir = output_dir
+        self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.output_dir / self.MANIFEST
 
     def save(self, data, name: str, format: str = "parquet") -> Path:
         """Generic save method"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.{format}"
-        path = self.output_dir / filename
+        if format not in self.FORMATS or format == "jsonl":
+            raise ValueError(f"Unsupported format: {format}")
+        version, path, tmp_path = self._reserve_version(name, format)
         
         try:
-            if format == "parquet":
-                if isinstance(data, pd.DataFrame):
-                    data.to_parquet(path)
+            if format in ("parquet", "arrow"):
+                if isinstance(data, pa.Table):
+                    # Arrow tables are written as is, so their schema metadata survives
+                    table, schema = data, {field.name: str(field.type) for field in data.schema}
                 else:
-                    pd.DataFrame(data).to_parquet(path)
-            elif format == "json":
-                with open(path, 'w') as f:
-                    json.dump(data, f, indent=2)
+                    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+                    table, schema = pa.Table.from_pandas(df), {col: str(dtype) for col, dtype in df.dtypes.items()}
+                if format == "parquet":
+                    # Tokenized documents become list/struct columns; zstd keeps them compact
+                    pq.write_table(table, tmp_path, compression="zstd")
+                else:
+                    # Uncompressed Arrow IPC so loads can memory-map it
+                    feather.write_feather(table, tmp_path, compression="uncompressed")
+                rows = table.num_rows
             else:
-                raise ValueError(f"Unsupported format: {format}")
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f, indent=2)
+                rows = len(data) if hasattr(data, '__len__') else None
+                schema = self._record_schema(data[0] if isinstance(data, list) and data else None)
                 
-            logger.info(f"Saved {path.name} ({len(data) if hasattr(data, '__len__') else '?'} records)")
+            self._commit(tmp_path, path, name, version, format, rows, schema)
+            logger.info(f"Saved {path.name} ({rows if rows is not None else '?'} records)")
+            return path
+            
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.error(f"Failed to save {path}: {str(e)}")
+            raise
+
+    def save_stream(self, records: Iterable[Dict], name: str) -> Path:
+        """Write records as JSON lines while they are produced"""
+        version, path, tmp_path = self._reserve_version(name, "jsonl")
+        
+        count, first = 0, None
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+                    first = first or record
+                    count += 1
+                    
+            self._commit(tmp_path, path, name, version, "jsonl", count, self._record_schema(first))
+            logger.info(f"Saved {path.name} ({count} records)")
             return path
             
         except Exception as e:
+            tmp_path.unlink(missing_ok=True)
             logger.error(f"Failed to save {path}: {str(e)}")
             raise
 
-    def load_latest(self, prefix: str) -> pd.DataFrame:
-        """Load most recent processed file"""
-        files = sorted(self.output_dir.glob(f"{prefix}*.parquet"))
+    def latest_entry(self, name: str) -> Optional[Dict]:
+        """Manifest record of the newest version of ``name``"""
+        entry = self._read_manifest().get(name)
+        return entry["versions"][entry["latest"]] if entry else None
+
+    def latest_by_prefix(self, prefix: str) -> Dict[str, Dict]:
+        """Newest manifest record of every artifact whose name starts with ``prefix``
+
+        Per-document outputs (``processed_pdf_<stem>``) are one name each, so
+        this returns one record per document.
+        """
+        return {
+            name: entry["versions"][entry["latest"]]
+            for name, entry in sorted(self._read_manifest().items())
+            if name.startswith(prefix)
+        }
+
+    def load_latest(self, prefix: str, columns: Optional[List[str]] = None,
+                    memory_map: bool = False, verify: bool = False) -> pd.DataFrame:
+        """Load most recent processed file
+
+        ``prefix`` is an artifact name, or a prefix shared by several names,
+        in which case the newest version across all of them is loaded.
+        """
+        entry = self.latest_entry(prefix) or max(
+            self.latest_by_prefix(prefix).values(),
+            key=lambda e: self._version_key(e["version"]), default=None
+        )
+        if entry:
+            path = self.output_dir / entry["file"]
+            if verify and self._checksum(path) != entry["checksum"]:
+                raise IOError(f"Checksum mismatch for {path.name}")
+            return self.load(path, columns=columns, memory_map=memory_map)
+        
+        # Files written before the manifest existed
+        files = sorted(
+            f for fmt in self.FORMATS for f in self.output_dir.glob(f"{prefix}*.{fmt}")
+        )
         if not files:
             raise FileNotFoundError(f"No files found with prefix {prefix}")
-        return pd.read_parquet(files[-1])
\ No newline at end of file
+        return self.load(files[-1], columns=columns, memory_map=memory_map)
+
+    @staticmethod
+    def load(path: Path, columns: Optional[List[str]] = None, memory_map: bool = False) -> pd.DataFrame:
+        """Load a processed file, reading only ``columns`` when given"""
+        path = Path(path)
+        if path.suffix == ".parquet":
+            # Column projection: other columns are never read or decoded
+            return pd.read_parquet(path, columns=columns, memory_map=memory_map)
+        if path.suffix == ".arrow":
+            # Memory-mapped reads share pages with the OS cache instead of copying
+            return feather.read_table(path, columns=columns, memory_map=memory_map).to_pandas()
+        if path.suffix == ".json":
+            with open(path, 'r') as f:
+                df = pd.DataFrame(json.load(f))
+        elif path.suffix == ".jsonl":
+            df = pd.read_json(path, lines=True)
+        else:
+            raise ValueError(f"Unsupported format: {path.suffix}")
+        return df[columns] if columns else df
+
+    @staticmethod
+    def iter_jsonl(path: Path) -> Iterator[Dict]:
+        """Lazily read records written by save_stream"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _reserve_version(self, name: str, format: str) -> Tuple[str, Path, Path]:
+        """Pick an unused version and claim it by creating its temp file.
+
+        Done under the manifest lock, so concurrent saves of the same name
+        within one second get distinct versions instead of sharing a temp file.
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        version, suffix = timestamp, 1
+        with self._manifest_lock():
+            # Temp files of in-flight saves count as taken
+            while (any(self.output_dir.glob(f"{name}_{version}.*"))
+                   or any(self.output_dir.glob(f".{name}_{version}.*.tmp"))):
+                version = f"{timestamp}_{suffix}"
+                suffix += 1
+            path = self.output_dir / f"{name}_{version}.{format}"
+            tmp_path = self._tmp_path(path)
+            tmp_path.touch(exist_ok=False)
+        return version, path, tmp_path
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        # Hidden and suffixed so prefix globs never match it
+        return path.with_name(f".{path.name}.tmp")
+
+    def _commit(self, tmp_path: Path, path: Path, name: str, version: str,
+                format: str, rows: Optional[int], schema: Dict):
+        """Atomically publish a finished temp file and record it in the manifest"""
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        checksum = self._checksum(tmp_path)
+        os.replace(tmp_path, path)
+        
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            entry = manifest.setdefault(name, {"latest": None, "versions": {}})
+            entry["versions"][version] = {
+                "file": path.name,
+                "version": version,
+                "format": format,
+                "rows": rows,
+                "schema": schema,
+                "checksum": checksum,
+                "created_at": datetime.now().isoformat()
+            }
+            entry["latest"] = max(entry["versions"], key=self._version_key)
+            self._write_json_atomic(manifest, self.manifest_path)
+
+    def _read_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json_atomic(data: Dict, path: Path):
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _version_key(version: str):
+        """Versions compare numerically: ``20250101_120000_10`` is newer than ``..._9``"""
+        return tuple(int(part) for part in version.split("_"))
+
+    @contextmanager
+    def _manifest_lock(self, timeout: float = 30.0):
+        """Cross-process lock on the manifest.
+
+        An OS file lock rather than the lock file's existence, so the lock
+        dies with its holder and a crashed save never blocks later ones.
+        """
+        lock_path = self.output_dir / f".{self.MANIFEST}.lock"
+        deadline = time.monotonic() + timeout
+        with open(lock_path, 'a+b') as f:
+            while not self._try_lock(f):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not lock {self.manifest_path}")
+                time.sleep(0.05)
+            try:
+                yield
+            finally:
+                self._unlock(f)
+
+    @staticmethod
+    def _try_lock(f) -> bool:
+        try:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _unlock(f):
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @staticmethod
+    def _checksum(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _record_schema(record: Optional[Dict]) -> Dict:
+        if not isinstance(record, dict):
+            return {}
+        return {key: type(value).__name__ for key, value in record.items()}
\ No newline at end of file
@@ -0,0 +1,57 @@
+# src/data_processing/streaming.py
+import os
+import logging
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Callable, List, Sequence
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def stream_transform(
+    input_path: str,
+    output_path: str,
+    transform: Callable[[pd.DataFrame], pd.DataFrame],
+    columns: Sequence[str],
+    derived_fields: Sequence[pa.Field] = (),
+    batch_size: int = 65_536
+) -> int:
+    """Clean a parquet file batch by batch and append each batch to ``output_path``.
+
+    Only ``columns`` are read from disk, one row group (or ``batch_size``
+    rows) at a time, so peak memory is bounded by a single batch. The
+    output schema is fixed up front from the input schema plus
+    ``derived_fields``, so batches with all-null columns still line up.
+    Returns the number of rows written.
+    """
+    source = pq.ParquetFile(input_path)
+    missing = [c for c in columns if c not in source.schema_arrow.names]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+
+    schema = pa.schema(
+        [source.schema_arrow.field(c) for c in columns]
+        + [f for f in derived_fields if f.name not in columns]
+    )
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    rows = 0
+    try:
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            for batch in source.iter_batches(batch_size=batch_size, columns=list(columns)):
+                df = transform(batch.to_pandas())
+                writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+                rows += len(df)
+        os.replace(tmp_path, output_path)
+    except Exception:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Streamed {rows} rows from {Path(input_path).name} to {output_path.name}")
+    return rows
+
+def available_columns(input_path: str, wanted: Sequence[str]) -> List[str]:
+    """Subset of ``wanted`` present in the parquet file, in the requested order"""
+    names = set(pq.read_schema(input_path).names)
+    return [c for c in wanted if c in names]
\ No newline at end of file
@@ -1,13 +1,25 @@
 # src/data_processing/tokenizer.py
+import re
 import spacy
 import logging
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Sequence
 from src.config.paths import PROCESSED_DIR
 
 logger = logging.getLogger(__name__)
 
+ALL_OUTPUTS = ("tokens", "lemmas", "entities", "sentences")
+
+# Pipeline components each output depends on (en_core_web_* naming)
+OUTPUT_COMPONENTS = {
+    "tokens": set(),
+    "lemmas": {"tok2vec", "tagger", "attribute_ruler", "lemmatizer"},
+    "entities": {"tok2vec", "ner"},
+    "sentences": {"tok2vec", "parser", "senter", "sentencizer"}
+}
+
 class TextTokenizer:
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    def __init__(self, model_name: str = "en_core_web_sm", batch_size: int = 64,
+                 n_process: int = 1, max_chunk_chars: int = 100_000):
         try:
             self.nlp = spacy.load(model_name)
         except OSError:
@@ -15,6 +27,9 @@ class TextTokenizer:
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", model_name])
             self.nlp = spacy.load(model_name)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.max_chunk_chars = min(max_chunk_chars, self.nlp.max_length)
 
     def process_text(self, text: str) -> Dict:
         """Tokenize single document"""
@@ -29,22 +44,124 @@ class TextTokenizer:
             "sentences": [sent.text for sent in doc.sents]
         }
 
-    def batch_process(self, documents: List[Dict]) -> List[Dict]:
-        """Process multiple PDF extracts"""
-        results = []
-        for doc in documents:
+    def batch_process(self, documents: List[Dict], outputs: Sequence[str] = ALL_OUTPUTS) -> List[Dict]:
+        """Process multiple PDF extracts
+
+        Documents are split into page/paragraph chunks and streamed through
+        ``nlp.pipe`` with only the components the requested outputs need,
+        then merged back per source.
+        """
+        unknown = set(outputs) - set(ALL_OUTPUTS)
+        if unknown:
+            raise ValueError(f"Unknown outputs: {unknown}")
+
+        chunks = []
+        for doc_idx, doc in enumerate(documents):
             if not doc.get('text'):
                 logger.warning(f"Skipping empty document: {doc.get('source')}")
                 continue
+            chunks.extend((chunk, doc_idx) for chunk in self._split_chunks(doc['text']))
+
+        merged: Dict[int, Dict] = {}
+        disable = self._components_to_disable(outputs)
+        try:
+            parsed = self.nlp.pipe(
+                chunks,
+                as_tuples=True,
+                batch_size=self.batch_size,
+                n_process=self.n_process,
+                disable=disable
+            )
+            for spacy_doc, doc_idx in parsed:
+                self._merge_chunk(merged, doc_idx, spacy_doc, outputs)
+        except Exception as e:
+            # nlp.pipe fails as a whole; fall back chunk by chunk (each stays under
+            # nlp.max_length) and drop only the documents with a bad chunk
+            logger.error(f"Batched tokenization failed, retrying per chunk: {str(e)}")
+            merged, failed = {}, set()
+            for chunk, doc_idx in chunks:
+                if doc_idx in failed:
+                    continue
+                try:
+                    self._merge_chunk(merged, doc_idx, self.nlp(chunk, disable=disable), outputs)
+                except Exception as chunk_error:
+                    logger.error(f"Failed to process {documents[doc_idx].get('source')}: {str(chunk_error)}")
+                    failed.add(doc_idx)
+                    merged.pop(doc_idx, None)
+
+        results = []
+        for doc_idx in sorted(merged):
+            analysis = merged[doc_idx]
+            if "entities" in analysis:
+                analysis["entity_count"] = len(analysis["entities"])
+            results.append({**documents[doc_idx], **analysis})
+        return results
+
+    def process_stream(self, pages: Iterable[Dict]) -> Iterator[Dict]:
+        """Tokenize page records one at a time (e.g. from PDFExtractor.iter_pages)"""
+        for page in pages:
+            if not page.get('text'):
+                continue
                 
             try:
-                analysis = self.process_text(doc['text'])
-                results.append({
-                    **doc,
+                analysis = self.process_text(page['text'])
+                yield {
+                    **page,
                     **analysis,
                     "token_count": len(analysis['tokens']),
                     "entity_count": len(analysis['entities'])
-                })
+                }
             except Exception as e:
-                logger.error(f"Failed to process {doc.get('source')}: {str(e)}")
-        return results
\ No newline at end of file
+                logger.error(f"Failed to process {page.get('source')} page {page.get('page')}: {str(e)}")
+
+    def _components_to_disable(self, outputs: Sequence[str]) -> List[str]:
+        """Pipeline components not needed for the requested outputs"""
+        needed = set().union(*(OUTPUT_COMPONENTS[o] for o in outputs))
+        if "sentences" in outputs and "parser" in self.nlp.pipe_names:
+            # The parser already sets boundaries; a second segmenter would be wasted work
+            needed -= {"senter", "sentencizer"}
+        return [name for name in self.nlp.pipe_names if name not in needed]
+
+    def _merge_chunk(self, merged: Dict[int, Dict], doc_idx: int, spacy_doc, outputs: Sequence[str]):
+        """Append one parsed chunk's analysis to its document's running result"""
+        analysis = merged.setdefault(doc_idx, {key: [] for key in outputs})
+        for key, values in self._analyze(spacy_doc, outputs).items():
+            analysis[key].extend(values)
+        analysis["token_count"] = analysis.get("token_count", 0) + len(spacy_doc)
+
+    def _analyze(self, doc, outputs: Sequence[str]) -> Dict[str, List]:
+        analysis = {}
+        if "tokens" in outputs:
+            analysis["tokens"] = [token.text for token in doc]
+        if "lemmas" in outputs:
+            analysis["lemmas"] = [token.lemma_ for token in doc]
+        if "entities" in outputs:
+            analysis["entities"] = [{"text": ent.text, "label": ent.label_} for ent in doc.ents]
+        if "sentences" in outputs:
+            analysis["sentences"] = [sent.text for sent in doc.sents]
+        return analysis
+
+    def _split_chunks(self, text: str) -> List[str]:
+        """Split on page markers, then on sentence ends for oversized pages"""
+        chunks = []
+        for page in re.split(r'\n\n(?=--- PAGE \d+ ---)', text):
+            if len(page) <= self.max_chunk_chars:
+                chunks.append(page)
+                continue
+
+            current = ""
+            for piece in re.split(r'(?<=[.!?])\s+', page):
+                while len(piece) > self.max_chunk_chars:
+                    if current:
+                        chunks.append(current)
+                        current = ""
+                    chunks.append(piece[:self.max_chunk_chars])
+                    piece = piece[self.max_chunk_chars:]
+                if current and len(current) + len(piece) + 1 > self.max_chunk_chars:
+                    chunks.append(current)
+                    current = piece
+                else:
+                    current = f"{current} {piece}" if current else piece
+            if current:
+                chunks.append(current)
+        return chunks
\ No newline at end of file
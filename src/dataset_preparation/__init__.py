@@ -3,5 +3,8 @@ from .qa_generator import EVQAGenerator
 from .augmentor import DatasetAugmentor
 from .formatter import EVQAFormatter
 from .validator import QAValidator
+from .generation_cache import GenerationCache
+from .deduplicator import QADeduplicator
+from .splitter import HashSplitter
 
-__all__ = ['EVQAGenerator', 'DatasetAugmentor', 'EVQAFormatter', 'QAValidator']
\ No newline at end of file
+__all__ = ['EVQAGenerator', 'DatasetAugmentor', 'EVQAFormatter', 'QAValidator', 'GenerationCache', 'QADeduplicator', 'HashSplitter']
\ No newline at end of file
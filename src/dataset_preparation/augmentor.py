@@ -1,32 +1,147 @@
+import logging
+import time
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from collections import Counter
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
+from .qa_generator import EVQAGenerator
 from .validator import QAValidator
 
+def _timed(fn: Callable, *args) -> Tuple[pd.DataFrame, float]:
+    """Run one source task and report how long it took inside the worker"""
+    start = time.perf_counter()
+    qa_pairs = fn(*args)
+    # Station templates already come back as a frame
+    qa_df = qa_pairs if isinstance(qa_pairs, pd.DataFrame) else pd.DataFrame(qa_pairs)
+    return qa_df, time.perf_counter() - start
+
+def _worker_generator(factory: Callable[..., EVQAGenerator], settings: Dict) -> EVQAGenerator:
+    """The configured generator, rebuilt in the worker; pool work never needs the model"""
+    return factory(**{**settings, "use_gpt": False})
+
+def _station_source_qa(path: str, factory: Callable[..., EVQAGenerator], settings: Dict) -> pd.DataFrame:
+    """Process-pool task: template QA for one station table"""
+    return _worker_generator(factory, settings).generate_from_source(pd.read_parquet(path), 'stations')
+
+def _rule_based_source_qa(path: str, factory: Callable[..., EVQAGenerator], settings: Dict) -> List[Dict]:
+    """Process-pool task: rule-mined QA for one processed PDF (never loads the model)"""
+    return _worker_generator(factory, settings).generate_from_source(Path(path), 'pdf', False)
+
 class DatasetAugmentor:
-    def __init__(self, qa_generator):
+    def __init__(self, qa_generator, executor: Optional[Executor] = None, max_workers: Optional[int] = None):
+        """Station and rule-based sources run on ``executor`` (a process pool
+        of ``max_workers`` by default); GPT sources share one model worker
+        thread so the model is loaded and run once, alongside them."""
         self.qa_generator = qa_generator
         self.validator = QAValidator()
+        self.executor = executor
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        # Result of the single validation pass over everything generated by the last run
+        self.validation = None
+        # One record per source of the last run: path, type, worker, status, pairs, seconds, error
+        self.source_reports: List[Dict] = []
+
+    def augment_dataset(self, sources: List[Dict], output_path: Optional[Union[str, Path]] = None) -> pd.DataFrame:
+        """Valid QA pairs of every source, in source order
+
+        Each source is validated as soon as it finishes, and with
+        ``output_path`` its valid pairs are appended there as JSON lines
+        right away (in completion order), so finished sources are on disk
+        before the slowest one is done.
+        """
+        start = time.perf_counter()
+        results, checks = {}, {}
+        out = None
+        if output_path is not None:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            out = open(output_path, 'w', encoding='utf-8')
+        try:
+            for i, qa_df in self.iter_sources(sources):
+                checks[i] = self.validator.validate_frame(qa_df)
+                results[i] = qa_df[checks[i]['valid']]
+                if out is not None and len(results[i]):
+                    # Older pandas leave off the final newline
+                    out.write(results[i].to_json(orient="records", lines=True, force_ascii=False).rstrip("\n") + "\n")
+                    out.flush()
+        finally:
+            if out is not None:
+                out.close()
 
-    def augment_dataset(self, sources: List[Dict]) -> pd.DataFrame:
-        all_qa = []
-        
-        for source in sources:
-            try:
-                if source['type'] == 'pdf':
-                    qa_pairs = self.qa_generator.generate_from_source(
-                        Path(source['path']), 
-                        'pdf'
-                    )
+        # Concatenate in source order so the output doesn't depend on which source finished first
+        order = sorted(results)
+        valid = [results[i] for i in order]
+        qa_df = pd.concat(valid, ignore_index=True) if valid else pd.DataFrame()
+        self.logger.info(f"Built {len(qa_df)} valid QA pairs from {len(valid)}/{len(sources)} sources "
+                         f"in {time.perf_counter() - start:.1f}s")
+        self.validation = self._combine_validation([checks[i] for i in order])
+        return qa_df
+
+    @staticmethod
+    def _combine_validation(checks: List[Dict]) -> Dict:
+        """One validate_frame result for all sources, as if validated together"""
+        breakdown = Counter()
+        for check in checks:
+            breakdown.update(check['error_breakdown'])
+        return {
+            "valid": np.concatenate([c['valid'] for c in checks]) if checks else np.zeros(0, dtype=bool),
+            "valid_pairs": sum(c['valid_pairs'] for c in checks),
+            "invalid_pairs": sum(c['invalid_pairs'] for c in checks),
+            "error_breakdown": dict(breakdown)
+        }
+
+    def iter_sources(self, sources: List[Dict]) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """(source index, QA frame) as each source finishes; failures go to ``source_reports``"""
+        self.source_reports = []
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.max_workers)
+        model_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qa-model")
+        try:
+            # Pool tasks go in first, so forked workers are started before the model thread runs
+            tasks = sorted(enumerate(sources), key=lambda item: self._uses_model(item[1]))
+            futures: Dict[Future, Tuple[int, Dict, str]] = {}
+            for i, source in tasks:
+                if self._uses_model(source):
+                    future = model_worker.submit(_timed, self.qa_generator.generate_from_source,
+                                                 Path(source['path']), 'pdf', True)
+                    futures[future] = (i, source, "model")
+                elif source['type'] in ('pdf', 'stations'):
+                    futures[executor.submit(*self._pool_task(source))] = (i, source, "pool")
                 else:
-                    df = pd.read_parquet(source['path'])
-                    qa_pairs = self.qa_generator.generate_from_source(df, 'stations')
-                
-                valid_pairs = [qa for qa in qa_pairs if self.validator.validate_single(qa)['valid']]
-                all_qa.extend(valid_pairs)
-                
-            except Exception as e:
-                print(f"Failed processing {source['path']}: {str(e)}")
-                continue
-                
-        return pd.DataFrame(all_qa)
\ No newline at end of file
+                    self._record_error(source, None, ValueError(f"Unknown source type: {source['type']}"))
+
+            for future in as_completed(futures):
+                i, source, worker = futures[future]
+                try:
+                    qa_df, seconds = future.result()
+                except Exception as e:
+                    self._record_error(source, worker, e)
+                    continue
+                report = {"path": str(source['path']), "type": source['type'], "worker": worker}
+                self.logger.info(f"{source['path']}: {len(qa_df)} pairs in {seconds:.1f}s ({worker})")
+                self.source_reports.append({**report, "status": "ok", "pairs": len(qa_df),
+                                            "seconds": round(seconds, 3), "error": None})
+                yield i, qa_df
+        finally:
+            model_worker.shutdown(cancel_futures=True)
+            if self.executor is None:
+                executor.shutdown(cancel_futures=True)
+
+    def _uses_model(self, source: Dict) -> bool:
+        """PDF sources generated with GPT-2 (per-source "use_gpt" overrides the generator)"""
+        use_gpt = source.get('use_gpt')
+        return source['type'] == 'pdf' and (self.qa_generator.use_gpt if use_gpt is None else use_gpt)
+
+    def _pool_task(self, source: Dict) -> Tuple:
+        # Workers rebuild the generator from its class and settings, so templates,
+        # cache and subclass overrides apply there too
+        task = _rule_based_source_qa if source['type'] == 'pdf' else _station_source_qa
+        return _timed, task, str(source['path']), type(self.qa_generator), self.qa_generator.settings()
+
+    def _record_error(self, source: Dict, worker: Optional[str], error: Exception):
+        self.logger.error(f"Failed processing {source['path']}: {error}", exc_info=error)
+        self.source_reports.append({
+            "path": str(source['path']), "type": source['type'], "worker": worker, "status": "error",
+            "pairs": 0, "seconds": None, "error": f"{type(error).__name__}: {error}"
+        })
\ No newline at end of file
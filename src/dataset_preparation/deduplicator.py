@@ -0,0 +1,145 @@
+# src/dataset_preparation/deduplicator.py
+import logging
+from typing import Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+REPORT_COLUMNS = ['question', 'answer', 'source', 'kept_question', 'kept_answer', 'similarity']
+# Multiplier for the polynomial rolling hash over shingle bytes
+ROLLING_BASE = np.uint64(1_099_511_628_211)
+
+class QADeduplicator:
+    """Near-duplicate QA removal with MinHash signatures and LSH banding.
+
+    Question+answer text is lowercased and cut into character shingles.
+    Every pair gets a ``num_perm`` MinHash signature. Pairs that collide in
+    any LSH band and whose signatures agree on at least ``threshold`` of
+    positions (estimated Jaccard similarity) are linked. A pair is dropped
+    only if it is at least ``threshold`` similar to the kept pair it is
+    dropped for, so a chain A~B~C never drops C for a dissimilar A.
+    Candidate search is one sort per band, so the cost grows as n log n
+    instead of with all n^2 pairs.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 5,
+                 chunk_size: int = 50_000, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.chunk_size = chunk_size
+        self.bands, self.rows = self._optimal_bands(threshold, num_perm)
+        self.logger = logging.getLogger(__name__)
+
+        rng = np.random.default_rng(seed)
+        # Odd multipliers make each (a * x + b) mod 2^64 a permutation of the hash space
+        self._perm_a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._perm_b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 2**63, self.rows, dtype=np.uint64) | np.uint64(1)
+
+    def deduplicate(self, qa_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Return (deduplicated pairs, report of dropped pairs and what they duplicate)"""
+        if len(qa_df) < 2:
+            return qa_df.reset_index(drop=True), pd.DataFrame(columns=REPORT_COLUMNS)
+
+        qa_df = qa_df.reset_index(drop=True)
+        signatures = self.signatures(qa_df)
+        kept_as = self._cluster(signatures)
+
+        dropped = np.flatnonzero(kept_as != np.arange(len(qa_df)))
+        kept = kept_as[dropped]
+        report = pd.DataFrame({
+            'question': qa_df['question'].to_numpy()[dropped],
+            'answer': qa_df['answer'].to_numpy()[dropped],
+            'source': qa_df['source'].to_numpy()[dropped] if 'source' in qa_df.columns else None,
+            'kept_question': qa_df['question'].to_numpy()[kept],
+            'kept_answer': qa_df['answer'].to_numpy()[kept],
+            'similarity': (signatures[dropped] == signatures[kept]).mean(axis=1)
+        })
+
+        self.logger.info(
+            f"Dropped {len(dropped)} of {len(qa_df)} QA pairs as near-duplicates (threshold {self.threshold})"
+        )
+        return qa_df.drop(index=dropped).reset_index(drop=True), report
+
+    def signatures(self, qa_df: pd.DataFrame) -> np.ndarray:
+        """MinHash signature per pair, shape (n, num_perm), as uint32"""
+        text = pc.binary_join_element_wise(
+            pc.fill_null(pa.array(qa_df['question'], type=pa.large_string(), from_pandas=True), ""),
+            pc.fill_null(pa.array(qa_df['answer'], type=pa.large_string(), from_pandas=True), ""),
+            pa.scalar(" ", type=pa.large_string())
+        )
+        text = pc.replace_substring_regex(pc.utf8_lower(text), r"\s+", " ")
+        # Texts shorter than one shingle become a single padded shingle
+        text = pc.utf8_rpad(text, width=self.shingle_size, padding=" ")
+        if isinstance(text, pa.ChunkedArray):
+            text = text.combine_chunks()
+
+        signatures = np.empty((len(qa_df), self.num_perm), dtype=np.uint32)
+        for start in range(0, len(qa_df), self.chunk_size):
+            chunk = text.slice(start, self.chunk_size)
+            signatures[start:start + len(chunk)] = self._minhash(chunk)
+        return signatures
+
+    def _minhash(self, text: pa.LargeStringArray) -> np.ndarray:
+        # Read the slice's own window of the offset and data buffers
+        offsets = np.frombuffer(text.buffers()[1], dtype=np.int64)[text.offset:text.offset + len(text) + 1]
+        data = np.frombuffer(text.buffers()[2], dtype=np.uint8)[offsets[0]:offsets[-1]].astype(np.uint64)
+        offsets = offsets - offsets[0]
+        k = self.shingle_size
+
+        # Rolling hash of every k-byte window, keeping windows inside one text
+        hashes = np.zeros(len(data) - k + 1, dtype=np.uint64)
+        for j in range(k):
+            hashes = hashes * ROLLING_BASE + data[j:len(data) - k + 1 + j]
+        starts = np.arange(len(hashes))
+        owner = np.searchsorted(offsets, starts, side='right') - 1
+        hashes = hashes[starts + k <= offsets[owner + 1]]
+        # Shingles per text, and where each text's block starts in ``hashes``
+        counts = np.diff(offsets) - k + 1
+        first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        signature = np.empty((len(text), self.num_perm), dtype=np.uint32)
+        for p in range(self.num_perm):
+            permuted = hashes * self._perm_a[p] + self._perm_b[p]
+            signature[:, p] = np.minimum.reduceat(permuted, first) >> np.uint64(32)
+        return signature
+
+    def _cluster(self, signatures: np.ndarray) -> np.ndarray:
+        """Index of the pair each row is kept as (itself unless it's a duplicate)"""
+        n = len(signatures)
+        edges_from, edges_to = [], []
+        for band in range(self.bands):
+            rows = signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            keys = rows @ self._band_mix
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            # Link every bucket member to the bucket's lowest index, then verify
+            bucket_start = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+            representative = order[np.flatnonzero(bucket_start)[np.cumsum(bucket_start) - 1]]
+            linked = representative != order
+            members, reps = order[linked], representative[linked]
+            similar = (signatures[members] == signatures[reps]).mean(axis=1) >= self.threshold
+            edges_from.append(members[similar])
+            edges_to.append(reps[similar])
+
+        # Each similar pair once, later row first, in row order
+        edges = np.unique(np.stack([np.concatenate(edges_from), np.concatenate(edges_to)], axis=1), axis=0)
+        kept_as = list(range(n))
+        for member, target in edges.tolist():
+            if kept_as[member] != member:
+                continue
+            # ``target`` is an earlier row, so it is settled: kept, or dropped for a kept row
+            kept = kept_as[target]
+            if kept == target or (signatures[member] == signatures[kept]).mean() >= self.threshold:
+                kept_as[member] = kept
+        return np.array(kept_as, dtype=np.int64)
+
+    @staticmethod
+    def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """(bands, rows) whose LSH S-curve threshold (1/b)^(1/r) is closest to ``threshold``"""
+        options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1)]
+        return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
\ No newline at end of file
@@ -1,7 +1,14 @@
 # src/dataset_preparation/formatter.py
-from typing import List, Dict
+import os
+import json
+from pathlib import Path
+from typing import List, Dict, Iterable, Iterator, Optional, Union
+import numpy as np
 import pandas as pd
 
+OUTPUT_FORMATS = ("text", "jsonl")
+RECORD_FIELDS = ['question', 'answer', 'context', 'source']
+
 class EVQAFormatter:
     def __init__(self, format_template: str = "alpaca"):
         self.format_template = format_template
@@ -16,8 +23,99 @@ class EVQAFormatter:
 
     def format_dataset(self, qa_df: pd.DataFrame) -> List[str]:
         """Convert QA pairs to specified format"""
+        return list(self.iter_formatted(qa_df))
+
+    def iter_formatted(self, qa_df: pd.DataFrame) -> Iterator[str]:
+        """Formatted text per pair, read straight from the column arrays"""
+        format_fn = self.templates[self.format_template]
+        for record in self._iter_rows(qa_df):
+            yield format_fn(record)
+
+    def iter_records(self, qa_df: pd.DataFrame) -> Iterator[Dict]:
+        """JSONL records: the formatted ``text`` plus the raw fields (missing values as None)"""
         format_fn = self.templates[self.format_template]
-        return [format_fn(row) for _, row in qa_df.iterrows()]
+        for record in self._iter_rows(qa_df):
+            yield {"text": format_fn(record), **{key: self._json_value(value) for key, value in record.items()}}
+
+    def write_dataset(self, qa: Union[pd.DataFrame, Iterable[pd.DataFrame]], output_path: Union[str, Path],
+                      output_format: str = "jsonl", shard_bytes: Optional[int] = None) -> List[Path]:
+        """Stream formatted pairs to disk and return the files written
+
+        ``qa`` may be one frame or an iterable of frames (e.g. parquet
+        batches); only one record is held at a time. With ``shard_bytes``,
+        output rolls over to ``<stem>-00000<suffix>``, ``-00001`` ... once a
+        shard reaches that size. "text" separates records with a blank
+        line, as the single training file always has.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        frames = [qa] if isinstance(qa, pd.DataFrame) else qa
+
+        def serialize() -> Iterator[str]:
+            for frame in frames:
+                if output_format == "jsonl":
+                    for record in self.iter_records(frame):
+                        yield json.dumps(record, ensure_ascii=False, allow_nan=False) + "\n"
+                else:
+                    yield from self.iter_formatted(frame)
+
+        separator = "" if output_format == "jsonl" else "\n\n"
+        written, f, size = [], None, 0
+        try:
+            for text in serialize():
+                if f is None or (shard_bytes and size and size + len(text.encode('utf-8')) > shard_bytes):
+                    if f is not None:
+                        written.append(self._close_shard(f))
+                    f = self._open_shard(output_path, len(written) if shard_bytes else None)
+                    size = 0
+                elif size:
+                    f.write(separator)
+                    size += len(separator)
+                f.write(text)
+                size += len(text.encode('utf-8'))
+            if f is None:
+                f = self._open_shard(output_path, 0 if shard_bytes else None)
+            written.append(self._close_shard(f))
+        except Exception:
+            if f is not None:
+                f.close()
+                Path(f.name).unlink(missing_ok=True)
+            raise
+        return written
+
+    @staticmethod
+    def _iter_rows(qa_df: pd.DataFrame) -> Iterator[Dict]:
+        fields = [c for c in RECORD_FIELDS if c in qa_df.columns]
+        for values in zip(*(qa_df[c].to_numpy() for c in fields)):
+            yield dict(zip(fields, values))
+
+    @staticmethod
+    def _json_value(value):
+        """NaN/NA become null (json.dumps would write a bare NaN) and numpy scalars plain Python"""
+        if value is None or value is pd.NA or value is pd.NaT:
+            return None
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and value != value:
+            return None
+        return value
+
+    @staticmethod
+    def _open_shard(output_path: Path, shard: Optional[int]):
+        path = output_path if shard is None else output_path.with_name(
+            f"{output_path.stem}-{shard:05d}{output_path.suffix}")
+        # Written under a temp name and renamed on close, so readers never see half a shard
+        return open(path.with_name(f".{path.name}.tmp"), 'w', encoding='utf-8')
+
+    @staticmethod
+    def _close_shard(f) -> Path:
+        f.close()
+        tmp_path = Path(f.name)
+        final_path = tmp_path.with_name(tmp_path.name[1:-len(".tmp")])
+        os.replace(tmp_path, final_path)
+        return final_path
 
     def _format_alpaca(self, qa: Dict) -> str:
         return (
@@ -0,0 +1,114 @@
+# src/dataset_preparation/generation_cache.py
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from src.config.paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class GenerationCache:
+    """On-disk memo of parsed QA pairs per generation prompt.
+
+    Keys cover the model name, prompt template, chunk text and sampling
+    parameters, so changing any of them regenerates instead of serving
+    stale pairs. Least recently used entries are evicted once
+    ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR / "qa_generation", max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "generations.sqlite"
+        self.max_bytes = max_bytes
+        self._init_db()
+
+    @staticmethod
+    def make_key(model_name: str, template: str, chunk: str, params: Dict) -> str:
+        """Stable key for one chunk generated with one model/template/sampling setup"""
+        parts = {
+            "model": model_name,
+            "template": text_hash(template),
+            "chunk": text_hash(chunk),
+            "params": params
+        }
+        return text_hash(json.dumps(parts, sort_keys=True))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS generations (
+                        key TEXT PRIMARY KEY, pairs TEXT,
+                        size INTEGER, last_access REAL
+                    )""")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_access ON generations (last_access)")
+        finally:
+            conn.close()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Cached pairs for every key that has an entry"""
+        keys = list(dict.fromkeys(keys))
+        hits = {}
+        conn = self._connect()
+        try:
+            with conn:
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    marks = ",".join("?" * len(batch))
+                    rows = conn.execute(
+                        f"SELECT key, pairs FROM generations WHERE key IN ({marks})", batch
+                    ).fetchall()
+                    hits.update((key, json.loads(pairs)) for key, pairs in rows)
+                    conn.execute(
+                        f"UPDATE generations SET last_access = ? WHERE key IN ({marks})",
+                        [time.time(), *batch]
+                    )
+            return hits
+        finally:
+            conn.close()
+
+    def put_many(self, entries: Dict[str, List[Dict]]):
+        """Store freshly generated pairs and evict old entries if over budget"""
+        now = time.time()
+        rows = []
+        for key, pairs in entries.items():
+            payload = json.dumps(pairs)
+            rows.append((key, payload, len(payload.encode('utf-8')), now))
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?)", rows)
+            self._evict(conn)
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used generations until the cache fits in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM generations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        to_free = total - self.max_bytes
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM generations ORDER BY last_access"):
+            victims.append((key,))
+            to_free -= size
+            if to_free <= 0:
+                break
+        with conn:
+            conn.executemany("DELETE FROM generations WHERE key = ?", victims)
+        logger.info(f"Evicted {len(victims)} cached generations")
\ No newline at end of file
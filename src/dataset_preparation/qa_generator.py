@@ -1,75 +1,287 @@
 import logging
 import re
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Sequence, Tuple, Union
+import pyarrow.parquet as pq
 import pandas as pd
 import json  
 import torch
-from transformers import GPT2LMHeadModel, GPT2Tokenizer
+from transformers import GPT2Config, GPT2LMHeadModel, GPT2Tokenizer
+from .generation_cache import GenerationCache
+from .station_templates import DEFAULT_STATION_TEMPLATES, generate_station_qa
+from .rule_based_qa import extract_pdf_qa, split_sentences
+from .quantization import compare_with_fp32, quantize_dynamic_int8
+
+PROMPT_TEMPLATE = """Generate exactly {num_questions} technical question-answer pairs about EV charging from this text.
+Follow these rules:
+1. Questions must be specific to EV charging technology
+2. Answers must be factual and derived from the text
+3. Use this exact format for each pair:
+Question: [Your question here?]
+Answer: [The answer here.]
+
+Example of good questions:
+Question: What types of EV connectors support fast charging?
+Answer: CCS and CHAdeMO connectors support fast charging.
+
+Text to analyze:
+{text}
+
+Generate {num_questions} Q&A pairs:
+"""
 
 class EVQAGenerator:
-    def __init__(self, model_name: str = "gpt2-medium"):
+    def __init__(self, model_name: str = "gpt2-medium", use_gpt: bool = True,
+                 full_document: bool = False, batch_size: int = 8, max_new_tokens: int = 600,
+                 cache: Optional[GenerationCache] = None,
+                 station_templates: Sequence[str] = DEFAULT_STATION_TEMPLATES,
+                 quantize: bool = False):
+        """``use_gpt=False`` mines PDF QA pairs with rules over the spaCy
+        output instead of sampling from GPT-2, and never loads the model.
+        ``full_document`` windows the whole PDF into prompt-sized chunks and
+        generates for ``batch_size`` chunks per ``generate`` call, instead of
+        prompting once with the first 1500 characters. With a ``cache``,
+        pairs are reused per chunk and the model is only loaded on a miss.
+        ``quantize`` runs the model on CPU with dynamic int8 Linear layers;
+        use ``check_quantization`` to compare its output with fp32."""
         self.logger = logging.getLogger(__name__)
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        # Dynamic int8 kernels are CPU-only
+        self.device = "cuda" if torch.cuda.is_available() and not quantize else "cpu"
+        self.quantize = quantize
+        self.model_name = model_name
+        self.use_gpt = use_gpt
+        self.full_document = full_document
+        self.batch_size = batch_size
+        self.cache = cache
+        self.station_templates = station_templates
+        self.generation_params = {
+            "max_new_tokens": max_new_tokens,
+            "temperature": 0.7,
+            "top_p": 0.9,
+            "do_sample": True
+        }
+        self._model = None
+        self._tokenizer = None
+        self._config = None
         
+        if use_gpt:
+            # Fail fast on a bad model name; the weights themselves load lazily
+            self._load_tokenizer()
+
+    def _load_tokenizer(self):
         try:
-            self.tokenizer = GPT2Tokenizer.from_pretrained(model_name)
-            self.model = GPT2LMHeadModel.from_pretrained(model_name).to(self.device)
-            self.tokenizer.pad_token = self.tokenizer.eos_token
-            self.logger.info(f"Loaded {model_name} on {self.device}")
+            self._tokenizer = GPT2Tokenizer.from_pretrained(self.model_name)
+            self._config = GPT2Config.from_pretrained(self.model_name)
+            self._tokenizer.pad_token = self._tokenizer.eos_token
+            # Decoder-only models continue from the last position, so pad on the left
+            self._tokenizer.padding_side = "left"
         except Exception as e:
-            self.logger.error(f"Failed to load model: {str(e)}")
+            self.logger.error(f"Failed to load tokenizer: {str(e)}")
             raise
 
-    def generate_from_source(self, source: Union[Path, pd.DataFrame], source_type: str) -> List[Dict]:
+    @property
+    def tokenizer(self) -> GPT2Tokenizer:
+        if self._tokenizer is None:
+            self._load_tokenizer()
+        return self._tokenizer
+
+    @property
+    def config(self) -> GPT2Config:
+        if self._config is None:
+            self._load_tokenizer()
+        return self._config
+
+    @property
+    def model(self) -> GPT2LMHeadModel:
+        """The LM, loaded on first use so fully cached runs never pay for it"""
+        if self._model is None:
+            try:
+                model = GPT2LMHeadModel.from_pretrained(self.model_name)
+                self._model = quantize_dynamic_int8(model) if self.quantize else model.to(self.device)
+                self.logger.info(f"Loaded {self.model_id} on {self.device}")
+            except Exception as e:
+                self.logger.error(f"Failed to load model: {str(e)}")
+                raise
+        return self._model
+
+    @property
+    def model_id(self) -> str:
+        """Model name plus any quantization, so cached generations never mix the two"""
+        return f"{self.model_name}+dynamic-int8" if self.quantize else self.model_name
+
+    def settings(self) -> Dict:
+        """Constructor arguments that rebuild this generator, e.g. inside a worker process"""
+        return {
+            "model_name": self.model_name,
+            "use_gpt": self.use_gpt,
+            "full_document": self.full_document,
+            "batch_size": self.batch_size,
+            "max_new_tokens": self.generation_params["max_new_tokens"],
+            "cache": self.cache,
+            "station_templates": tuple(self.station_templates),
+            "quantize": self.quantize
+        }
+
+    def check_quantization(self, chunks: List[str], tolerance: float = 0.1) -> Dict:
+        """Quality hook: parse and validator pass rates of this int8 model against fp32"""
+        reference = EVQAGenerator(self.model_name, batch_size=self.batch_size,
+                                  max_new_tokens=self.generation_params["max_new_tokens"])
+        return compare_with_fp32(self, reference, chunks, tolerance)
+
+    def generate_from_source(self, source: Union[Path, pd.DataFrame], source_type: str,
+                             use_gpt: Optional[bool] = None) -> Union[List[Dict], pd.DataFrame]:
+        """``use_gpt`` overrides the generator default for this PDF source"""
         if source_type == 'pdf':
-            return self._generate_from_pdf(source)
+            return self._generate_from_pdf(source, self.use_gpt if use_gpt is None else use_gpt)
         elif source_type == 'stations':
             return self._generate_from_stations(source)
         else:
             raise ValueError(f"Unknown source type: {source_type}")
 
-    def _generate_from_pdf(self, pdf_path: Path) -> List[Dict]:
+    def _generate_from_pdf(self, pdf_path: Path, use_gpt: bool = True) -> List[Dict]:
         try:
-            with open(pdf_path, 'r') as f:
-                pdf_data = json.load(f)[0]['text']
-            return self._gpt_generate_qa(pdf_data)
+            if not use_gpt:
+                sentences, entities = self._load_pdf_analysis(pdf_path)
+                return self._rule_based_pdf_qa(sentences=sentences, entities=entities)
+            
+            text = self._load_pdf_text(pdf_path)
+            if self.full_document:
+                return self._gpt_generate_qa_chunked(text)
+            return self._gpt_generate_qa(text)
         except Exception as e:
+            # Surfaced to the augmentor, which records it against the source
             self.logger.error(f"PDF processing failed: {str(e)}")
-            return []
+            raise
+
+    def _load_pdf_text(self, pdf_path: Path) -> str:
+        """Read the document text from any processed PDF format"""
+        suffix = Path(pdf_path).suffix
+        if suffix == '.parquet':
+            # Only the text column is read from the columnar tokenizer output
+            return pd.read_parquet(pdf_path, columns=['text'])['text'].iloc[0]
+        
+        with open(pdf_path, 'r') as f:
+            if suffix == '.jsonl':
+                # Page-per-line output from DataStorage.save_stream
+                return "\n\n".join(
+                    f"--- PAGE {page['page']} ---\n{page['text']}"
+                    for page in map(json.loads, f) if page.get('text')
+                )
+            return json.load(f)[0]['text']
+
+    def _load_pdf_analysis(self, pdf_path: Path) -> Tuple[List[str], List[Dict]]:
+        """spaCy sentences and entities from the tokenizer output, segmenting the text if absent"""
+        suffix = Path(pdf_path).suffix
+        if suffix == '.parquet':
+            columns = set(pq.read_schema(pdf_path).names)
+            if 'sentences' in columns:
+                df = pd.read_parquet(pdf_path, columns=['sentences'] + (['entities'] if 'entities' in columns else []))
+                return (
+                    [s for doc in df['sentences'] for s in doc],
+                    [e for doc in df.get('entities', []) for e in doc]
+                )
+            return split_sentences(self._load_pdf_text(pdf_path)), []
+        
+        with open(pdf_path, 'r') as f:
+            records = list(map(json.loads, f)) if suffix == '.jsonl' else json.load(f)[:1]
+        sentences, entities = [], []
+        for record in records:
+            sentences.extend(record['sentences'] if 'sentences' in record else split_sentences(record.get('text') or ""))
+            entities.extend(record.get('entities', []))
+        return sentences, entities
+
+    def _rule_based_pdf_qa(self, text: str = "", sentences: Optional[List[str]] = None,
+                           entities: Optional[List[Dict]] = None) -> List[Dict]:
+        """Model-free QA from sentence patterns (charging ratings, definitions, acronyms)"""
+        pairs = extract_pdf_qa(sentences if sentences is not None else split_sentences(text), entities or [])
+        self.logger.info(f"Mined {len(pairs)} rule-based QA pairs")
+        return pairs
 
     def _gpt_generate_qa(self, text: str, num_questions: int = 5) -> List[Dict]:
-        prompt = f"""Generate exactly {num_questions} technical question-answer pairs about EV charging from this text.
-Follow these rules:
-1. Questions must be specific to EV charging technology
-2. Answers must be factual and derived from the text
-3. Use this exact format for each pair:
-Question: [Your question here?]
-Answer: [The answer here.]
+        return self._generate_chunks([text[:1500]], num_questions)[0]
 
-Example of good questions:
-Question: What types of EV connectors support fast charging?
-Answer: CCS and CHAdeMO connectors support fast charging.
+    def _gpt_generate_qa_chunked(self, text: str, num_questions: int = 5) -> List[Dict]:
+        """Generate for every chunk of the document, ``batch_size`` prompts per call"""
+        qa_pairs = []
+        for pairs in self._generate_chunks(self._chunk_text(text, num_questions), num_questions):
+            qa_pairs.extend(pairs)
+        return qa_pairs
 
-Text to analyze:
-{text[:1500]}
+    def _generate_chunks(self, chunks: List[str], num_questions: int = 5) -> List[List[Dict]]:
+        """Parsed pairs per chunk, generating only the chunks missing from the cache"""
+        params = {**self.generation_params, "num_questions": num_questions}
+        keys = [GenerationCache.make_key(self.model_id, PROMPT_TEMPLATE, chunk, params) for chunk in chunks]
+        results = self.cache.get_many(keys) if self.cache else {}
+        
+        missing = list({key: chunk for key, chunk in zip(keys, chunks) if key not in results}.items())
+        self.logger.info(f"Generating from {len(missing)} of {len(chunks)} chunks in batches of {self.batch_size}")
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            prompts = [PROMPT_TEMPLATE.format(num_questions=num_questions, text=chunk) for _, chunk in batch]
+            generated = dict(zip((key for key, _ in batch), self._generate_batch(prompts)))
+            if self.cache:
+                self.cache.put_many(generated)
+            results.update(generated)
+        
+        return [results[key] for key in keys]
 
-Generate {num_questions} Q&A pairs:
-"""
+    def _chunk_text(self, text: str, num_questions: int = 5) -> List[str]:
+        """Window the text so each prompt plus its generation fits the context
+
+        A decoded window doesn't always encode back to as many tokens inside the
+        prompt (a cut through a multi-byte character decodes to U+FFFD, for one),
+        so each chunk is measured as a whole prompt and cut shorter until it fits;
+        the rest of the window starts the next chunk.
+        """
+        max_new_tokens = self.generation_params["max_new_tokens"]
+        max_prompt_tokens = self.config.n_positions - max_new_tokens
+        chunk_tokens = max_prompt_tokens - self._prompt_tokens("", num_questions)
+        if chunk_tokens <= 0:
+            raise ValueError(f"max_new_tokens={max_new_tokens} leaves no room for text in the prompt")
         
-        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
-        outputs = self.model.generate(
-            **inputs,
-            max_new_tokens=600,
-            temperature=0.7,
-            top_p=0.9,
-            do_sample=True,
-            pad_token_id=self.tokenizer.eos_token_id,
-            num_return_sequences=1
-        )
+        ids = self.tokenizer(text, verbose=False)['input_ids']
+        chunks, start = [], 0
+        while start < len(ids):
+            end = min(start + chunk_tokens, len(ids))
+            chunk = self.tokenizer.decode(ids[start:end]).strip()
+            overflow = self._prompt_tokens(chunk, num_questions) - max_prompt_tokens
+            while overflow > 0 and end - start > 1:
+                end = max(start + 1, end - overflow)
+                chunk = self.tokenizer.decode(ids[start:end]).strip()
+                overflow = self._prompt_tokens(chunk, num_questions) - max_prompt_tokens
+            if chunk:
+                chunks.append(chunk)
+            start = end
+        return chunks
+
+    def _prompt_tokens(self, chunk: str, num_questions: int) -> int:
+        return len(self.tokenizer.encode(PROMPT_TEMPLATE.format(num_questions=num_questions, text=chunk), verbose=False))
+
+    def generate_prompts(self, prompts: List[str]) -> List[List[Dict]]:
+        """Parsed pairs per ready-made prompt, ``batch_size`` prompts per call, bypassing the cache"""
+        parsed = []
+        for start in range(0, len(prompts), self.batch_size):
+            parsed.extend(self._generate_batch(prompts[start:start + self.batch_size]))
+        return parsed
+
+    def _generate_batch(self, prompts: List[str]) -> List[List[Dict]]:
+        """One padded ``generate`` call for several prompts; parsed pairs per prompt"""
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.device)
+        prompt_tokens = inputs['input_ids'].shape[1]
+        if prompt_tokens + self.generation_params["max_new_tokens"] > self.config.n_positions:
+            raise ValueError(f"{prompt_tokens} prompt tokens plus max_new_tokens exceed "
+                             f"n_positions={self.config.n_positions}")
+        with torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                **self.generation_params,
+                pad_token_id=self.tokenizer.eos_token_id,
+                num_return_sequences=1
+            )
         
-        generated = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        return self._parse_gpt_output(generated)
+        # Left padding lines every prompt up to the same length; keep only the continuation
+        generated = self.tokenizer.batch_decode(outputs[:, inputs['input_ids'].shape[1]:], skip_special_tokens=True)
+        return [self._parse_gpt_output(text) for text in generated]
 
     def _parse_gpt_output(self, text: str) -> List[Dict]:
         pairs = []
@@ -89,28 +301,6 @@ Generate {num_questions} Q&A pairs:
         
         return pairs
 
-    def _generate_from_stations(self, stations_df: pd.DataFrame) -> List[Dict]:
-        qa_pairs = []
-        
-        for _, row in stations_df.iterrows():
-            # Handle connector information
-            connectors = [c for c in row.get('connectors', []) 
-                         if c not in ['Unknown', '[Unknown]']]
-            connector_text = ', '.join(connectors) if connectors else "No connector information available"
-            
-            qa_pairs.extend([
-                {
-                    "question": f"What connectors are available at {row['station_name']}?",
-                    "answer": connector_text,
-                    "context": f"Station {row['station_name']}",
-                    "source": "stations"
-                },
-                {
-                    "question": f"What type of charging is available at {row['station_name']}?",
-                    "answer": "DC fast charging" if row.get('has_fast_charging') else "AC Level 2 charging",
-                    "context": f"Station ID: {row.name}",
-                    "source": "stations"
-                }
-            ])
-        
-        return qa_pairs
\ No newline at end of file
+    def _generate_from_stations(self, stations_df: pd.DataFrame) -> pd.DataFrame:
+        """Template QA for every station, built column-wise"""
+        return generate_station_qa(stations_df, self.station_templates)
\ No newline at end of file
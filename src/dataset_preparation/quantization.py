@@ -0,0 +1,83 @@
+# src/dataset_preparation/quantization.py
+"""Dynamic int8 GPT-2 for CPU generation, plus a check of what it costs in quality.
+
+GPT-2 implements its projections as ``Conv1D`` (a transposed Linear),
+which ``quantize_dynamic`` doesn't recognise, so they are swapped for
+equivalent ``nn.Linear`` layers first. Weights are then stored as int8
+and activations quantized per batch at run time.
+"""
+import logging
+import time
+from typing import Dict, List
+import pandas as pd
+import torch
+from torch import nn
+from transformers.pytorch_utils import Conv1D
+from .validator import QAValidator
+
+logger = logging.getLogger(__name__)
+
+def _conv1d_to_linear(module: nn.Module):
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            # Built on the meta device so no throwaway weights are allocated
+            linear = nn.Linear(in_features, out_features, device="meta")
+            linear.weight = nn.Parameter(child.weight.data.t().contiguous())
+            linear.bias = nn.Parameter(child.bias.data.clone())
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """CPU model with every Linear/Conv1D projection (and the LM head) in int8"""
+    model = model.cpu().eval()
+    _conv1d_to_linear(model)
+    # In place, so the fp32 weights are released instead of copied
+    model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    # Copy what stays fp32 (embeddings, layer norms) off the memory-mapped checkpoint,
+    # so the mapping and every page read from it during quantization are let go
+    for param in model.parameters():
+        param.data = param.data.clone()
+    return model
+
+def generation_quality(generator, chunks: List[str], num_questions: int = 5) -> Dict:
+    """Parse rate, validator pass rate and speed of ``generator`` on ``chunks``, bypassing the cache"""
+    from .qa_generator import PROMPT_TEMPLATE
+
+    prompts = [PROMPT_TEMPLATE.format(num_questions=num_questions, text=chunk) for chunk in chunks]
+    start = time.perf_counter()
+    parsed = generator.generate_prompts(prompts)
+    seconds = time.perf_counter() - start
+
+    pairs = pd.DataFrame([pair for prompt_pairs in parsed for pair in prompt_pairs])
+    valid_pairs = QAValidator.validate_frame(pairs)['valid_pairs'] if len(pairs) else 0
+    return {
+        "prompts": len(prompts),
+        "pairs": len(pairs),
+        # Share of prompts whose output yielded at least one Question/Answer pair
+        "parse_rate": sum(1 for p in parsed if p) / max(len(prompts), 1),
+        "validator_pass_rate": valid_pairs / max(len(pairs), 1),
+        "seconds_per_prompt": seconds / max(len(prompts), 1)
+    }
+
+def compare_with_fp32(quantized, reference, chunks: List[str], tolerance: float = 0.1,
+                      num_questions: int = 5) -> Dict:
+    """Quality hook: int8 vs fp32 generators on the same chunks.
+
+    ``passed`` is False when the int8 parse rate or validator pass rate
+    falls more than ``tolerance`` below fp32. Both generators sample, so
+    use enough chunks for the rates to be meaningful.
+    """
+    int8 = generation_quality(quantized, chunks, num_questions)
+    fp32 = generation_quality(reference, chunks, num_questions)
+    passed = all(int8[metric] >= fp32[metric] - tolerance for metric in ("parse_rate", "validator_pass_rate"))
+    report = {
+        "int8": int8,
+        "fp32": fp32,
+        "speedup": fp32["seconds_per_prompt"] / max(int8["seconds_per_prompt"], 1e-9),
+        "passed": passed
+    }
+    log = logger.info if passed else logger.warning
+    log(f"Quantized generation check {'passed' if passed else 'FAILED'}: {report}")
+    return report
\ No newline at end of file
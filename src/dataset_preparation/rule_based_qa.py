@@ -0,0 +1,125 @@
+# src/dataset_preparation/rule_based_qa.py
+"""Model-free QA mining over tokenized PDF sentences.
+
+Each rule is a regex pass over one sentence (plus the spaCy entities found
+in the document) that emits template questions, so a whole corpus is
+processed in the time GPT-2 takes for a single prompt.
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+CHARGING_TERMS = re.compile(
+    r"\b(CCS\d?|CHAdeMO|ChaoJi|J1772|NACS|GB/T|Type [12]|Tesla Supercharger|Superchargers?"
+    r"|Level [123](?: charg(?:ing|ers?))?|DC fast charg(?:ing|ers?)|(?:ultra-?|slow |fast )chargers?)",
+    re.IGNORECASE
+)
+QUANTITY = re.compile(
+    r"(?P<qualifier>(?:up to|more than|less than(?: or equal to)?|at least|around|about|over|under|almost)\s+)?"
+    r"(?P<value>\d+(?:[.,]\d+)?)\s?(?P<unit>kWh|kW|MW|volts?|V|amps?|A)\b"
+)
+UNIT_QUESTIONS = {
+    "kw": "power rating", "mw": "power rating", "kwh": "energy capacity",
+    "v": "voltage", "volt": "voltage", "volts": "voltage",
+    "a": "current", "amp": "current", "amps": "current"
+}
+DEFINITION = re.compile(r"^(?P<term>(?:The )?[A-Z][\w\-]*(?: [\w\-]+){0,5}?) (?P<verb>is|are) (?:a|an|the) \S")
+DEFINITION_VERB = re.compile(r" (?:is|are) (?:a|an|the) ")
+DEFINITION_STOPWORDS = {"It", "This", "That", "There", "These", "Those", "They", "He", "She", "We", "What", "Which", "However"}
+ACRONYM = re.compile(r"\(?\b([A-Z]{2,6})(s?)\)?(?=[\s.,;:]|$)")
+ACRONYM_FILLERS = {"of", "and", "for", "the", "to", "in", "on"}
+DEFINITION_ENTITY_LABELS = {"ORG", "PRODUCT", "LAW", "FAC", "EVENT", "WORK_OF_ART"}
+
+def split_sentences(text: str) -> List[str]:
+    """Fallback segmentation when no spaCy sentences are available"""
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+
+def extract_pdf_qa(sentences: Iterable[str], entities: Iterable[Dict] = ()) -> List[Dict]:
+    """Mine QA pairs from sentences; duplicate questions keep their first answer"""
+    names = sorted({
+        e["text"].strip() for e in entities
+        if e.get("label") in DEFINITION_ENTITY_LABELS and len(e.get("text", "").strip()) > 2
+    }, key=len, reverse=True)
+    # One alternation for all entity names (longest first), compiled once per document
+    entity_definition = re.compile(
+        rf"(?:^|(?<=\s))(?P<term>{'|'.join(map(re.escape, names))}) (?P<verb>is|are) (?:a|an|the) \S"
+    ) if names else None
+    pairs, seen = [], set()
+    for sentence in sentences:
+        sentence = re.sub(r"\s+", " ", sentence).strip()
+        if len(sentence) < 20:
+            continue
+        for pair in (*_quantity_pairs(sentence), *_definition_pairs(sentence, entity_definition),
+                     *_acronym_pairs(sentence)):
+            if pair["question"] not in seen:
+                seen.add(pair["question"])
+                pairs.append(pair)
+    return pairs
+
+def _pair(question: str, answer: str, context: str) -> Dict:
+    return {"question": question, "answer": answer, "context": context, "source": "pdf"}
+
+def _quantity_pairs(sentence: str) -> List[Dict]:
+    """Charging term followed by a kW/kWh/V/A figure before the next term"""
+    terms = list(CHARGING_TERMS.finditer(sentence))
+    pairs = []
+    for i, term in enumerate(terms):
+        end = terms[i + 1].start() if i + 1 < len(terms) else len(sentence)
+        quantity = QUANTITY.search(sentence, term.end(), min(end, term.end() + 100))
+        if quantity is None:
+            continue
+        name = term.group(0)
+        measure = UNIT_QUESTIONS[quantity.group("unit").lower()]
+        figure = f"{quantity.group('qualifier') or ''}{quantity.group('value')} {quantity.group('unit')}"
+        pairs.append(_pair(
+            f"What {measure} is given for {name}?",
+            f"The text gives {figure} for {name}.",
+            sentence
+        ))
+    return pairs
+
+def _definition_pairs(sentence: str, entity_definition: Optional[re.Pattern]) -> List[Dict]:
+    """"X is a/an/the ..." sentences, preferring a named entity as X"""
+    if not DEFINITION_VERB.search(sentence):
+        return []
+    match = entity_definition.search(sentence) if entity_definition else None
+    start = match.start() if match else 0
+    if match is None:
+        match = DEFINITION.match(sentence)
+        if not match or match.group("term").split()[0] in DEFINITION_STOPWORDS or re.search(r"\d", match.group("term")):
+            return []
+
+    term = re.sub(r"^The ", "the ", match.group("term"))
+    return [_pair(f"What {match.group('verb')} {term}?", sentence[start:], sentence)]
+
+def _acronym_pairs(sentence: str) -> List[Dict]:
+    """Acronyms whose letters match the initials of the words right before them"""
+    pairs = []
+    for match in ACRONYM.finditer(sentence):
+        acronym = match.group(1)
+        words = re.findall(r"[A-Za-z][\w\-]*", sentence[:match.start()])
+        expansion = _expand(acronym, words)
+        if expansion:
+            pairs.append(_pair(
+                f"What does {acronym} stand for?",
+                f"{acronym} stands for {expansion}.",
+                sentence
+            ))
+    return pairs
+
+def _expand(acronym: str, words: List[str]) -> Optional[str]:
+    """Walk back over ``words`` matching acronym letters to word initials"""
+    letters = list(acronym.lower())
+    used = []
+    for word in reversed(words[-(len(acronym) * 2 + 2):]):
+        if not letters:
+            break
+        if word[0].lower() == letters[-1] and word.upper() != acronym:
+            letters.pop()
+            used.append(word)
+        elif word.lower() in ACRONYM_FILLERS and used:
+            used.append(word)
+        else:
+            return None
+    if letters or len(used) < 2:
+        return None
+    return " ".join(reversed(used))
\ No newline at end of file
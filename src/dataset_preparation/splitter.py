@@ -0,0 +1,182 @@
+# src/dataset_preparation/splitter.py
+import csv
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Union
+from src.utils.shards import shard_paths
+
+ALPACA_HEADER = "Below is an instruction"
+
+def normalize_question(question: str) -> str:
+    """Case, whitespace and trailing punctuation don't make a different question"""
+    return re.sub(r"\s+", " ", question).strip().casefold().rstrip("?.! ")
+
+def split_bucket(question: str) -> float:
+    """Stable position of a question in [0, 1), the same on every run and machine"""
+    digest = hashlib.blake2b(normalize_question(question).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2**64
+
+def detect_file_format(filepath) -> str:
+    """Detect if file is JSONL, CSV, or other format"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        first_line = f.readline().strip()
+
+        try:
+            json.loads(first_line)
+            return 'jsonl'
+        except json.JSONDecodeError:
+            if ',' in first_line and '"' in first_line:
+                return 'csv'
+            return 'txt'
+
+def iter_records(path: Union[str, Path]) -> Iterator[Dict]:
+    """Records from a dataset file or its shards, one at a time"""
+    for shard in shard_paths(path):
+        fmt = detect_file_format(shard)
+        with open(shard, 'r', encoding='utf-8', newline='' if fmt == 'csv' else None) as f:
+            if fmt == 'jsonl':
+                yield from (json.loads(line) for line in f if line.strip())
+            elif fmt == 'csv':
+                yield from csv.DictReader(f)
+            else:
+                yield from _iter_text_records(f)
+
+def _iter_text_records(lines: Iterator[str]) -> Iterator[Dict]:
+    """Multi-line alpaca blocks (each starts with the instruction header) or Q:/A: pairs"""
+    block, question = [], None
+    for line in lines:
+        line = line.rstrip("\n")
+        if line.startswith(ALPACA_HEADER):
+            if block:
+                yield _alpaca_record(block)
+            block = [line]
+        elif block:
+            block.append(line)
+        elif line.startswith(('Q:', 'Question:')):
+            question = line.split(':', 1)[1].strip()
+        elif line.startswith(('A:', 'Answer:')) and question:
+            answer = line.split(':', 1)[1].strip()
+            yield {"text": f"Q: {question}\nA: {answer}", "question": question, "answer": answer}
+            question = None
+    if block:
+        yield _alpaca_record(block)
+
+def _alpaca_record(block) -> Dict:
+    text = "\n".join(block).strip()
+    match = re.search(r"### Instruction:\n(.*?)\n\n###", text, re.DOTALL)
+    return {"text": text, "question": match.group(1).strip() if match else text}
+
+class HashSplitter:
+    """Train/validation split by a hash of each record's normalized question,
+    stratified by ``source``.
+
+    A question goes to validation when its hash bucket falls below
+    ``val_fraction``. A source that ends up with fewer than
+    ``floor(val_fraction * n)`` of its ``n`` records there (always the case
+    for small ones, whose few buckets rarely land low) is topped up with
+    its lowest-bucket train questions. Sides are decided per question, so
+    repeats always land together even across sources, and records below
+    ``val_fraction`` never move when data is added; only a source's top-up
+    can change as it grows.
+
+    The input is streamed three times (count, top-ups, write), holding only
+    per-source counters and the top-up buckets in memory.
+    """
+
+    def __init__(self, val_fraction: float = 0.2):
+        if not 0 < val_fraction < 1:
+            raise ValueError(f"val_fraction must be in (0, 1), got {val_fraction}")
+        self.val_fraction = val_fraction
+        # Buckets above val_fraction moved to validation to fill a source's share
+        self.top_ups: Set[float] = set()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _bucket(record: Dict) -> float:
+        return split_bucket(record.get('question') or record.get('text') or "")
+
+    @staticmethod
+    def _source(record: Dict) -> str:
+        return str(record.get('source', 'unknown'))
+
+    def is_validation(self, record: Dict) -> bool:
+        bucket = self._bucket(record)
+        return bucket < self.val_fraction or bucket in self.top_ups
+
+    def fit(self, input_path: Union[str, Path]) -> Dict[str, int]:
+        """Find each source's top-up; returns how many questions each source borrowed"""
+        totals, below = Counter(), Counter()
+        for record in iter_records(input_path):
+            source = self._source(record)
+            totals[source] += 1
+            below[source] += self._bucket(record) < self.val_fraction
+        shortfall = {source: math.floor(self.val_fraction * n) - below[source] for source, n in totals.items()}
+        shortfall = {source: short for source, short in shortfall.items() if short > 0}
+
+        # Per short source, the lowest distinct buckets above the threshold
+        # (a bounded max-heap of negated buckets, plus a set for repeats)
+        lowest: Dict[str, List[float]] = {source: [] for source in shortfall}
+        seen: Dict[str, Set[float]] = {source: set() for source in shortfall}
+        for record in iter_records(input_path):
+            source, bucket = self._source(record), self._bucket(record)
+            if source not in lowest or bucket < self.val_fraction or bucket in seen[source]:
+                continue
+            heap = lowest[source]
+            if len(heap) < shortfall[source]:
+                heapq.heappush(heap, -bucket)
+            elif bucket < -heap[0]:
+                seen[source].discard(-heapq.heapreplace(heap, -bucket))
+            else:
+                continue
+            seen[source].add(bucket)
+
+        self.top_ups = {-b for heap in lowest.values() for b in heap}
+        return {source: len(heap) for source, heap in lowest.items()}
+
+    def split(self, input_path: Union[str, Path], train_path: Union[str, Path],
+              val_path: Union[str, Path]) -> Dict:
+        """Write JSONL train/validation files and return counts overall and per source"""
+        train_path, val_path = Path(train_path), Path(val_path)
+        inputs = {p.resolve() for p in shard_paths(input_path)}
+        if train_path.resolve() in inputs or val_path.resolve() in inputs:
+            raise ValueError("Split outputs must not overwrite the input dataset")
+
+        top_ups = self.fit(input_path)
+        counts = Counter()
+        by_source: Dict[str, Counter] = {}
+        outputs = {}
+        try:
+            for side, path in (("train", train_path), ("validation", val_path)):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                outputs[side] = open(path.with_name(f".{path.name}.tmp"), 'w', encoding='utf-8')
+
+            for record in iter_records(input_path):
+                side = "validation" if self.is_validation(record) else "train"
+                outputs[side].write(json.dumps(record, ensure_ascii=False) + "\n")
+                counts[side] += 1
+                by_source.setdefault(self._source(record), Counter())[side] += 1
+        except Exception:
+            for f in outputs.values():
+                f.close()
+                Path(f.name).unlink(missing_ok=True)
+            raise
+
+        for side, path in (("train", train_path), ("validation", val_path)):
+            outputs[side].close()
+            os.replace(outputs[side].name, path)
+
+        stats = {
+            "train": counts["train"],
+            "validation": counts["validation"],
+            "by_source": {source: dict(c) for source, c in sorted(by_source.items())},
+            "top_ups": top_ups
+        }
+        self.logger.info(f"Split {sum(counts.values())} records: {stats}")
+        return stats
\ No newline at end of file
@@ -0,0 +1,121 @@
+# src/dataset_preparation/station_templates.py
+"""Column-wise QA templates over the processed station table.
+
+Each template maps the whole frame to question/answer/context columns
+with Arrow compute kernels, so adding a template costs a few vectorized
+string operations instead of a Python dict per station. Register new
+templates in ``STATION_TEMPLATES``.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+QA_COLUMNS = ['question', 'answer', 'context', 'source']
+UNKNOWN_CONNECTORS = ['Unknown', '[Unknown]']
+
+# (question, answer, context, keep) where ``keep`` optionally drops rows the template can't answer
+TemplateResult = Tuple[pa.Array, pa.Array, pa.Array, Optional[np.ndarray]]
+
+def _text(df: pd.DataFrame, col: str) -> pa.Array:
+    """String column as Arrow (nulls become empty strings, missing columns all empty)"""
+    if col not in df.columns:
+        return pa.array([""] * len(df), type=pa.string())
+    return pc.fill_null(pc.cast(pa.array(df[col], from_pandas=True), pa.string()), "")
+
+def _concat(*parts) -> pa.Array:
+    """Element-wise concatenation of Arrow string arrays and literal strings"""
+    return pc.binary_join_element_wise(*parts, "")
+
+def _connectors(df: pd.DataFrame) -> TemplateResult:
+    name = _text(df, 'station_name')
+    if 'connectors' in df.columns:
+        lists = pa.array(df['connectors'], type=pa.list_(pa.string()), from_pandas=True)
+    else:
+        lists = pa.nulls(len(df), type=pa.list_(pa.string()))
+
+    # Drop placeholder connectors inside each list, then join what's left
+    flat = pc.list_flatten(lists)
+    keep = pc.invert(pc.fill_null(pc.is_in(flat, pa.array(UNKNOWN_CONNECTORS)), True)).to_numpy(zero_copy_only=False)
+    parents = pc.list_parent_indices(lists).to_numpy()
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(parents[keep], minlength=len(df)))]).astype(np.int32)
+    known = pa.ListArray.from_arrays(pa.array(offsets), flat.filter(pa.array(keep)))
+    joined = pc.binary_join(known, ", ")
+    answer = pc.if_else(pc.greater(pc.utf8_length(joined), 0), joined,
+                        pa.scalar("No connector information available"))
+
+    return (_concat("What connectors are available at ", name, "?"), answer,
+            _concat("Station ", name), None)
+
+def _charging_type(df: pd.DataFrame) -> TemplateResult:
+    name = _text(df, 'station_name')
+    fast = (df['has_fast_charging'].fillna(False).to_numpy(dtype=bool)
+            if 'has_fast_charging' in df.columns else np.zeros(len(df), dtype=bool))
+    answer = pa.array(np.where(fast, "DC fast charging", "AC Level 2 charging"), type=pa.string())
+    context = _concat("Station ID: ", pa.array(df.index.astype(str), type=pa.string()))
+    return _concat("What type of charging is available at ", name, "?"), answer, context, None
+
+def _network(df: pd.DataFrame) -> TemplateResult:
+    name, network = _text(df, 'station_name'), _text(df, 'ev_network')
+    keep = (pc.greater(pc.utf8_length(network), 0).to_numpy(zero_copy_only=False)
+            & ~pc.is_in(network, pa.array(['UNKNOWN', 'Non-Networked'])).to_numpy(zero_copy_only=False))
+    return (_concat("Which charging network operates ", name, "?"), network,
+            _concat("Station ", name), keep)
+
+def _location(df: pd.DataFrame) -> TemplateResult:
+    name, street, city, state = (_text(df, c) for c in ('station_name', 'street_address', 'city', 'state'))
+    keep = (pc.greater(pc.utf8_length(street), 0).to_numpy(zero_copy_only=False)
+            & pc.greater(pc.utf8_length(city), 0).to_numpy(zero_copy_only=False))
+    answer = pc.utf8_trim_whitespace(_concat(street, ", ", city, ", ", state, " ", _text(df, 'zip')))
+    return _concat("Where is ", name, " located?"), answer, _concat("Station ", name), keep
+
+def _port_count(col: str, df: pd.DataFrame) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    return pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+
+def _power_level(df: pd.DataFrame) -> TemplateResult:
+    name = _text(df, 'station_name')
+    dc, level2 = _port_count('ev_dc_fast_num', df), _port_count('ev_level2_evse_num', df)
+    answer = _concat(pc.cast(pa.array(dc), pa.string()), " DC fast and ",
+                     pc.cast(pa.array(level2), pa.string()), " Level 2 charging ports")
+    return (_concat("How many charging ports does ", name, " have?"), answer,
+            _concat("Station ", name), (dc + level2) > 0)
+
+STATION_TEMPLATES: Dict[str, Callable[[pd.DataFrame], TemplateResult]] = {
+    "connectors": _connectors,
+    "charging_type": _charging_type,
+    "network": _network,
+    "location": _location,
+    "power_level": _power_level
+}
+# The two templates the generator has always produced
+DEFAULT_STATION_TEMPLATES = ("connectors", "charging_type")
+
+def generate_station_qa(stations_df: pd.DataFrame,
+                        templates: Sequence[str] = DEFAULT_STATION_TEMPLATES) -> pd.DataFrame:
+    """QA pairs for every station and template, grouped by station in template order"""
+    unknown = [t for t in templates if t not in STATION_TEMPLATES]
+    if unknown:
+        raise ValueError(f"Unknown station templates: {unknown}")
+
+    tables, rows, order = [], [], []
+    for rank, template in enumerate(templates):
+        question, answer, context, keep = STATION_TEMPLATES[template](stations_df)
+        positions = np.arange(len(stations_df))
+        table = pa.table({'question': question, 'answer': answer, 'context': context})
+        if keep is not None:
+            table, positions = table.filter(pa.array(keep)), positions[keep]
+        tables.append(table)
+        rows.append(positions)
+        order.append(np.full(len(positions), rank))
+
+    if not tables:
+        return pd.DataFrame(columns=QA_COLUMNS)
+    table = pa.concat_tables(tables)
+    # Interleave so each station's pairs stay together, as the row-wise version produced them
+    interleave = np.lexsort((np.concatenate(order), np.concatenate(rows)))
+    table = table.take(pa.array(interleave))
+    table = table.append_column('source', pa.array(np.full(len(table), "stations"), type=pa.string()))
+    return table.to_pandas()
\ No newline at end of file
@@ -1,9 +1,13 @@
 import re
-from typing import Dict, List
+from typing import Dict, List, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 
 class QAValidator:
     MIN_QUESTION_LEN = 10
     MIN_ANSWER_LEN = 5
+    REQUIRED_KEYS = ['question', 'answer', 'context']
     
     @classmethod
     def validate_single(cls, qa: Dict) -> Dict:
@@ -34,15 +38,51 @@ class QAValidator:
         }
     
     @classmethod
-    def validate_batch(cls, qa_list: List[Dict]) -> Dict:
-        results = [cls.validate_single(qa) for qa in qa_list]
-        valid_count = sum(1 for r in results if r['valid'])
+    def validate_frame(cls, qa: Union[pd.DataFrame, pa.Table]) -> Dict:
+        """Column-wise validate_single over a whole frame in one pass
+
+        Returns the per-row ``valid`` mask plus the same counts as
+        validate_batch; each error is counted once per failing row.
+        """
+        df = qa.to_pandas() if isinstance(qa, pa.Table) else qa
+        n = len(df)
+        checks = {}
+        
+        present = {}
+        for key in cls.REQUIRED_KEYS:
+            # Missing column, or a missing key in some records (NaN after framing)
+            present[key] = df[key].notna().to_numpy(dtype=bool) if key in df.columns else np.zeros(n, dtype=bool)
+            checks[f"Missing key: {key}"] = ~present[key]
+        
+        question = df['question'].astype('str') if 'question' in df.columns else pd.Series([''] * n, dtype='str')
+        checks[f"Question too short (<{cls.MIN_QUESTION_LEN} chars)"] = (
+            present['question'] & (question.str.len() < cls.MIN_QUESTION_LEN).to_numpy(dtype=bool))
+        checks["Question should end with '?'"] = (
+            present['question'] & ~question.str.endswith('?').to_numpy(dtype=bool))
+        
+        answer = df['answer'].astype('str') if 'answer' in df.columns else pd.Series([''] * n, dtype='str')
+        checks[f"Answer too short (<{cls.MIN_ANSWER_LEN} chars)"] = (
+            present['answer'] & (answer.str.len() < cls.MIN_ANSWER_LEN).to_numpy(dtype=bool))
+        checks["Answer is 'Unknown'"] = (
+            present['answer'] & (answer.str.lower() == 'unknown').to_numpy(dtype=bool))
+        
+        invalid = np.zeros(n, dtype=bool)
+        breakdown = {}
+        for err, failed in checks.items():
+            invalid |= failed
+            count = int(failed.sum())
+            if count:
+                breakdown[err] = count
         
         return {
-            "valid_pairs": valid_count,
-            "invalid_pairs": len(qa_list) - valid_count,
-            "error_breakdown": {
-                err: sum(1 for r in results if err in r['errors'])
-                for r in results for err in r['errors']
-            }
-        }
\ No newline at end of file
+            "valid": ~invalid,
+            "valid_pairs": int(n - invalid.sum()),
+            "invalid_pairs": int(invalid.sum()),
+            "error_breakdown": breakdown
+        }
+    
+    @classmethod
+    def validate_batch(cls, qa_list: List[Dict]) -> Dict:
+        result = cls.validate_frame(pd.DataFrame(qa_list))
+        result.pop("valid")
+        return result
\ No newline at end of file
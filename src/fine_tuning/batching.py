@@ -0,0 +1,99 @@
+# src/fine_tuning/batching.py
+"""Less padding per training step on CPU.
+
+Packing concatenates short examples into rows of up to ``max_seq_length``
+tokens. The collator gives each row a block-diagonal causal mask and
+per-example position ids, so an example never attends to, or is scored
+on, its neighbours. Unpacked runs can instead sample batches of similar
+length from the pre-tokenized lengths.
+"""
+from typing import Dict, List, Sequence
+import torch
+from transformers import Trainer
+from transformers.trainer_pt_utils import LengthGroupedSampler
+from .tokenized_dataset import TokenizedDataset
+
+def pack_examples(lengths: Sequence[int], max_seq_length: int) -> List[List[int]]:
+    """Best-fit decreasing: example indices per row, every row at most ``max_seq_length`` tokens"""
+    # Rows still open, keyed by the space they have left
+    open_rows: Dict[int, List[List[int]]] = {}
+    rows = []
+    for i in sorted(range(len(lengths)), key=lambda i: -lengths[i]):
+        length = min(int(lengths[i]), max_seq_length)
+        space = next((s for s in range(length, max_seq_length) if open_rows.get(s)), None)
+        if space is None:
+            row, space = [], max_seq_length
+            rows.append(row)
+        else:
+            row = open_rows[space].pop()
+        row.append(i)
+        if space - length:
+            open_rows.setdefault(space - length, []).append(row)
+    return rows
+
+class PackedDataset(torch.utils.data.Dataset):
+    """Rows of concatenated examples; items carry the per-example ``lengths`` for the collator"""
+
+    def __init__(self, dataset: TokenizedDataset, max_seq_length: int):
+        self.dataset = dataset
+        self.rows = pack_examples(dataset.lengths, max_seq_length)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i: int) -> Dict[str, torch.Tensor]:
+        examples = [self.dataset[j]["input_ids"] for j in self.rows[i]]
+        return {
+            "input_ids": torch.cat(examples),
+            "lengths": torch.tensor([len(e) for e in examples])
+        }
+
+class PackedCollator:
+    """Pads packed rows and builds block-diagonal causal masks, position ids and labels"""
+
+    def __init__(self, pad_token_id: int, dtype: torch.dtype = torch.float32):
+        self.pad_token_id = pad_token_id
+        self.dtype = dtype
+
+    def __call__(self, rows: List[Dict[str, torch.Tensor]]) -> Dict[str, torch.Tensor]:
+        width = max(len(row["input_ids"]) for row in rows)
+        input_ids = torch.full((len(rows), width), self.pad_token_id, dtype=torch.long)
+        position_ids = torch.zeros((len(rows), width), dtype=torch.long)
+        # Example number of every position; padding gets -1
+        segments = torch.full((len(rows), width), -1, dtype=torch.long)
+        for r, row in enumerate(rows):
+            lengths = row["lengths"]
+            used = int(lengths.sum())
+            input_ids[r, :used] = row["input_ids"]
+            segments[r, :used] = torch.repeat_interleave(torch.arange(len(lengths)), lengths)
+            starts = torch.repeat_interleave(torch.cumsum(lengths, 0) - lengths, lengths)
+            position_ids[r, :used] = torch.arange(used) - starts
+
+        causal = torch.ones(width, width, dtype=torch.bool).tril()
+        same_example = segments[:, :, None] == segments[:, None, :]
+        # Padding attends only to itself, which keeps its softmax finite
+        allowed = (same_example & (segments[:, :, None] >= 0) & causal) | torch.eye(width, dtype=torch.bool)
+        attention_mask = torch.zeros(allowed.shape, dtype=self.dtype).masked_fill(~allowed, torch.finfo(self.dtype).min)
+
+        labels = input_ids.clone()
+        # No loss on padding, or on an example's first token (predicted from the previous example)
+        labels[(segments < 0) | (position_ids == 0)] = -100
+        return {
+            "input_ids": input_ids,
+            "position_ids": position_ids,
+            "attention_mask": attention_mask[:, None],
+            "labels": labels
+        }
+
+class LengthGroupedTrainer(Trainer):
+    """Trainer that draws batches of similar-length examples, using the artifact's stored lengths"""
+
+    def __init__(self, *args, lengths: Sequence[int], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lengths = [int(length) for length in lengths]
+
+    def _get_train_sampler(self, *args, **kwargs):
+        return LengthGroupedSampler(
+            self.args.train_batch_size * self.args.gradient_accumulation_steps,
+            lengths=self.lengths
+        )
\ No newline at end of file
@@ -26,11 +26,14 @@ class FineTuningConfig:
     
     # Data parameters
     dataset_text_field: str = "text"
-    packing: bool = False  # Must be False for CPU
+    packing: bool = False  # Concatenate examples up to max_seq_length with block-diagonal attention
+    group_by_length: bool = False  # Batches of similar-length examples when not packing (tokenized dataset only)
+    use_tokenized_dataset: bool = True  # Train from the memory-mapped token artifact, building it once if stale
     
     # Data paths
-    train_data_path: str = "data/training/ev_qa_dataset.txt"
-    eval_data_path: str = "data/validation/ev_qa_eval.txt"
+    train_data_path: str = "data/training/ev_qa_train.jsonl"  # Written by run_dataset_preparation.py
+    eval_data_path: str = "data/validation/ev_qa_eval.jsonl"
+    tokenized_data_dir: str = "data/training/tokenized"
     
     # Output directory
     output_dir: str = "models/finetuned_tinyllama_evqa_cpu"
\ No newline at end of file
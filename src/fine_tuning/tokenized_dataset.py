@@ -0,0 +1,178 @@
+# src/fine_tuning/tokenized_dataset.py
+"""Pre-tokenized training data shared across training runs.
+
+Token ids of every example are stored back to back in ``tokens.bin`` with
+example boundaries in ``offsets.npy``. Both are memory-mapped on load, so
+startup does no tokenization, and processes training from the same
+artifact share one copy through the page cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import uuid
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+import torch
+from transformers import AutoTokenizer
+from src.utils.shards import read_texts
+from .config import FineTuningConfig
+
+logger = logging.getLogger(__name__)
+
+def format_instruction(text: str) -> str:
+    """Alpaca prompt reduced to the Instruction/Response form used for training"""
+    if "### Instruction:" in text and "### Response:" in text:
+        instruction = text.split("### Instruction:")[1].split("### Response:")[0].strip()
+        response = text.split("### Response:")[1].strip()
+        return f"Instruction: {instruction}\nResponse: {response}"
+    return text
+
+def load_tokenizer(config: FineTuningConfig):
+    """The training tokenizer, as the trainer and the artifact builder both need it"""
+    tokenizer = AutoTokenizer.from_pretrained(
+        config.local_model_dir or config.model_name,
+        padding_side="right",
+        add_eos_token=True
+    )
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+def source_fingerprint(paths: Iterable[Union[str, Path]]) -> str:
+    """Content hash of the training files the artifact was built from"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def artifact_dir(tokenizer_name: str, max_seq_length: int, root: Union[str, Path]) -> Path:
+    """Artifact location keyed by tokenizer and sequence length"""
+    safe_name = re.sub(r"[^\w.-]+", "--", tokenizer_name)
+    return Path(root) / f"{safe_name}-{max_seq_length}"
+
+class TokenizedDataset(torch.utils.data.Dataset):
+    """Read-only view over a pre-tokenized artifact; items are ``{"input_ids": tensor}``"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path / "meta.json") as f:
+            self.meta = json.load(f)
+        self.offsets = np.load(self.path / "offsets.npy", mmap_mode='r')
+        num_tokens = int(self.offsets[-1])
+        # np.memmap refuses zero-length files
+        self.tokens = (np.memmap(self.path / "tokens.bin", dtype=self.meta["dtype"], mode='r', shape=(num_tokens,))
+                       if num_tokens else np.empty(0, dtype=self.meta["dtype"]))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> Dict[str, torch.Tensor]:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return {"input_ids": torch.from_numpy(self.tokens[start:end].astype(np.int64))}
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @classmethod
+    def load_if_fresh(cls, path: Union[str, Path], fingerprint: str) -> Optional["TokenizedDataset"]:
+        """The artifact at ``path`` if it was built from data with ``fingerprint``"""
+        try:
+            dataset = cls(path)
+        except FileNotFoundError:
+            return None
+        if dataset.meta.get("source_fingerprint") != fingerprint:
+            logger.info(f"Tokenized dataset at {path} is stale")
+            return None
+        return dataset
+
+    @classmethod
+    def build(cls, texts: Iterable[str], tokenizer, tokenizer_name: str, max_seq_length: int,
+              path: Union[str, Path], fingerprint: Optional[str] = None,
+              batch_size: int = 1000) -> "TokenizedDataset":
+        """Tokenize ``texts`` in batches straight to disk and return the loaded artifact"""
+        path = Path(path)
+        # Unique per build, so concurrent builders never write into each other's files
+        tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        tmp_path.mkdir(parents=True)
+        dtype = np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max else np.uint32
+
+        lengths = []
+        with open(tmp_path / "tokens.bin", 'wb') as f:
+            batch = []
+            for text in chain(texts, [None]):
+                if text is not None:
+                    batch.append(text)
+                if batch and (text is None or len(batch) == batch_size):
+                    # Same tokenization SFTTrainer applies: special tokens on, truncated, unpadded
+                    for ids in tokenizer(batch, truncation=True, max_length=max_seq_length)["input_ids"]:
+                        f.write(np.asarray(ids, dtype=dtype).tobytes())
+                        lengths.append(len(ids))
+                    batch = []
+
+        np.save(tmp_path / "offsets.npy", np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]))
+        with open(tmp_path / "meta.json", 'w') as f:
+            json.dump({
+                "tokenizer": tokenizer_name,
+                "max_seq_length": max_seq_length,
+                "dtype": np.dtype(dtype).name,
+                "num_sequences": len(lengths),
+                "num_tokens": int(sum(lengths)),
+                "source_fingerprint": fingerprint
+            }, f, indent=2)
+
+        published = cls._publish(tmp_path, path, fingerprint)
+        if published is not None:
+            logger.info(f"Using the artifact a concurrent build published at {path}")
+            return published
+        logger.info(f"Tokenized {len(lengths)} examples ({sum(lengths)} tokens) to {path}")
+        return cls(path)
+
+    @classmethod
+    def _publish(cls, tmp_path: Path, path: Path, fingerprint: Optional[str],
+                 attempts: int = 5) -> Optional["TokenizedDataset"]:
+        """Rename the finished build to ``path``; returns an equal artifact that got there first, else None
+
+        Renaming onto a missing path is atomic, so readers see the old artifact
+        or the new one, never a mix. A stale artifact is first moved aside (and
+        readers with its files mapped keep their copy).
+        """
+        for _ in range(attempts):
+            try:
+                os.rename(tmp_path, path)
+                return None
+            except OSError:
+                if not path.exists():
+                    continue
+            current = cls.load_if_fresh(path, fingerprint) if fingerprint else None
+            if current is not None:
+                # Same source data, so the concurrent build is as good as ours
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                return current
+            stale = path.with_name(f".{path.name}.stale-{uuid.uuid4().hex[:8]}")
+            try:
+                os.rename(path, stale)
+            except FileNotFoundError:
+                continue  # Another builder moved it aside first
+            shutil.rmtree(stale, ignore_errors=True)
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise OSError(f"Could not publish tokenized dataset at {path}")
+
+def prepare_tokenized_dataset(config: FineTuningConfig, paths: List[Path], tokenizer=None) -> TokenizedDataset:
+    """The artifact for ``config`` built from the training files ``paths``, reused while they are unchanged"""
+    fingerprint = source_fingerprint(paths)
+    path = artifact_dir(config.model_name, config.max_seq_length, config.tokenized_data_dir)
+    dataset = TokenizedDataset.load_if_fresh(path, fingerprint)
+    if dataset is None:
+        dataset = TokenizedDataset.build(
+            map(format_instruction, read_texts(paths)), tokenizer or load_tokenizer(config),
+            config.model_name, config.max_seq_length, path, fingerprint
+        )
+    return dataset
\ No newline at end of file
@@ -7,7 +7,8 @@ from dotenv import load_dotenv
 from huggingface_hub import login
 from transformers import (
     AutoModelForCausalLM,
-    AutoTokenizer,
+    DataCollatorForLanguageModeling,
+    Trainer,
     TrainingArguments,
     set_seed
 )
@@ -16,6 +17,11 @@ from trl import SFTTrainer
 from datasets import Dataset
 from .config import FineTuningConfig
 from .tracker import ExperimentTracker
+from .batching import LengthGroupedTrainer, PackedCollator, PackedDataset
+from .tokenized_dataset import (
+    TokenizedDataset, format_instruction, load_tokenizer, prepare_tokenized_dataset
+)
+from src.utils.shards import read_texts, shard_paths
 
 class EVQATrainer:
     def __init__(self, config: FineTuningConfig):
@@ -39,42 +45,34 @@ class EVQATrainer:
             low_cpu_mem_usage=True
         )
         
-        tokenizer = AutoTokenizer.from_pretrained(
-            self.config.local_model_dir or self.config.model_name,
-            padding_side="right",
-            add_eos_token=True
-        )
-        
-        if tokenizer.pad_token is None:
-            tokenizer.pad_token = tokenizer.eos_token
-            
-        return model, tokenizer
+        return model, load_tokenizer(self.config)
 
     def _format_instruction(self, example):
         """Simplified formatting for CPU"""
-        text = example.get("text", "")
-        if "### Instruction:" in text and "### Response:" in text:
-            instruction = text.split("### Instruction:")[1].split("### Response:")[0].strip()
-            response = text.split("### Response:")[1].strip()
-            return f"Instruction: {instruction}\nResponse: {response}"
-        return text
+        return format_instruction(example.get("text", ""))
 
     def _load_dataset(self):
         """Load dataset with basic formatting"""
         def parse_file(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return [{"text": line.strip()} for line in f if line.strip()]
+            return [{"text": text} for text in read_texts(shard_paths(filepath))]
                 
         train_data = parse_file(self.config.train_data_path)
         train_dataset = Dataset.from_list(train_data)
         
         eval_dataset = None
-        if os.path.exists(self.config.eval_data_path):
-            eval_data = parse_file(self.config.eval_data_path)
-            eval_dataset = Dataset.from_list(eval_data)
+        try:
+            eval_dataset = Dataset.from_list(parse_file(self.config.eval_data_path))
+        except FileNotFoundError:
+            pass
             
         return train_dataset, eval_dataset
 
+    def _load_tokenized_dataset(self) -> TokenizedDataset:
+        """Memory-mapped token ids, tokenizing only if the artifact is missing or stale"""
+        dataset = prepare_tokenized_dataset(self.config, shard_paths(self.config.train_data_path), self.tokenizer)
+        print(f"📦 Using {len(dataset)} pre-tokenized examples from {dataset.path}")
+        return dataset
+
     def _apply_lora(self):
         """Configure LoRA for CPU"""
         peft_config = LoraConfig(
@@ -88,8 +86,9 @@ class EVQATrainer:
         print(f"Trainable params: {sum(p.numel() for p in self.model.parameters() if p.requires_grad):,}")
 
     def train(self):
+        if self.config.packing and not self.config.use_tokenized_dataset:
+            raise ValueError("packing needs use_tokenized_dataset=True")
         self._apply_lora()
-        train_dataset, eval_dataset = self._load_dataset()
 
         # Disable all GPU-related features
         training_args = TrainingArguments(
@@ -109,21 +108,56 @@ class EVQATrainer:
             max_grad_norm=self.config.max_grad_norm,
             report_to=[],  # Disabled TensorBoard
             use_cpu=True,  # Explicit CPU flag
-            disable_tqdm=True  # Disable progress bars for cleaner output
+            disable_tqdm=True,  # Disable progress bars for cleaner output
+            remove_unused_columns=not self.config.packing  # Packed rows carry example lengths for the collator
         )
 
-        trainer = SFTTrainer(
-            model=self.model,
-            args=training_args,
-            train_dataset=train_dataset,
-            tokenizer=self.tokenizer,
-            dataset_text_field="text",
-            max_seq_length=self.config.max_seq_length,
-            formatting_func=self._format_instruction
-        )
+        num_tokens = None
+        if self.config.use_tokenized_dataset:
+            # Already formatted, truncated and tokenized; only batching and label masking remain
+            dataset = self._load_tokenized_dataset()
+            num_tokens = int(dataset.lengths.sum())
+            if self.config.packing:
+                packed = PackedDataset(dataset, self.config.max_seq_length)
+                print(f"📦 Packed {len(dataset)} examples into {len(packed)} rows "
+                      f"({num_tokens / (len(packed) * self.config.max_seq_length):.0%} full)")
+                trainer = Trainer(
+                    model=self.model,
+                    args=training_args,
+                    train_dataset=packed,
+                    tokenizer=self.tokenizer,
+                    data_collator=PackedCollator(self.tokenizer.pad_token_id, self.model.dtype)
+                )
+            else:
+                trainer_cls = LengthGroupedTrainer if self.config.group_by_length else Trainer
+                extra = {"lengths": dataset.lengths} if self.config.group_by_length else {}
+                trainer = trainer_cls(
+                    model=self.model,
+                    args=training_args,
+                    train_dataset=dataset,
+                    tokenizer=self.tokenizer,
+                    data_collator=DataCollatorForLanguageModeling(self.tokenizer, mlm=False),
+                    **extra
+                )
+        else:
+            train_dataset, eval_dataset = self._load_dataset()
+            trainer = SFTTrainer(
+                model=self.model,
+                args=training_args,
+                train_dataset=train_dataset,
+                tokenizer=self.tokenizer,
+                dataset_text_field="text",
+                max_seq_length=self.config.max_seq_length,
+                formatting_func=self._format_instruction
+            )
 
         print("🚀 Starting CPU training (this will take a while)...")
-        trainer.train()
+        result = trainer.train()
+        if num_tokens is not None:
+            # Real (unpadded) tokens only, so packing and grouping are compared fairly
+            tokens_per_second = num_tokens * self.config.num_train_epochs / result.metrics["train_runtime"]
+            self.tracker.log_metric("train_tokens_per_second", tokens_per_second)
+            print(f"⚡ Throughput: {tokens_per_second:.1f} tokens/s")
         
         print("✅ Training completed! Saving model...")
         trainer.model.save_pretrained(self.config.output_dir)
@@ -0,0 +1,80 @@
+import json
+import pytest
+
+
+def write_pdf(path, pages):
+    """Minimal valid PDF with one line of Helvetica text per page"""
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>",
+               3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for n, text in enumerate(pages):
+        page_id, content_id = 4 + 2 * n, 5 + 2 * n
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offsets[obj_id] for obj_id in sorted(objects))
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return path
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Factory writing a small text PDF into the test's tmp dir"""
+    def _make(name, pages):
+        return write_pdf(tmp_path / name, pages)
+    return _make
+
+
+@pytest.fixture(scope="session")
+def spacy_model_dir(tmp_path_factory):
+    """Blank English pipeline with a sentencizer, saved so TextTokenizer can load it by path"""
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    path = tmp_path_factory.mktemp("spacy") / "blank_en"
+    nlp.to_disk(path)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def byte_tokenizer(tmp_path_factory):
+    """Offline GPT-2 style tokenizer: one token per byte, no merges"""
+    transformers = pytest.importorskip("transformers")
+    from transformers.convert_slow_tokenizer import bytes_to_unicode
+
+    path = tmp_path_factory.mktemp("tokenizer")
+    vocab = {char: i for i, char in enumerate(bytes_to_unicode().values())}
+    vocab["<|endoftext|>"] = len(vocab)
+    (path / "vocab.json").write_text(json.dumps(vocab))
+    (path / "merges.txt").write_text("#version: 0.2\n")
+    tokenizer = transformers.GPT2Tokenizer(str(path / "vocab.json"), str(path / "merges.txt"))
+    tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
+    return tokenizer
+
+
+@pytest.fixture
+def tiny_generator(byte_tokenizer):
+    """Factory for an EVQAGenerator over a small random GPT-2, without downloads"""
+    from transformers import GPT2Config, GPT2LMHeadModel
+    from src.dataset_preparation.qa_generator import EVQAGenerator
+
+    def _make(n_positions=1024, max_new_tokens=16, **kwargs):
+        generator = EVQAGenerator("tiny-gpt2", use_gpt=False, max_new_tokens=max_new_tokens, **kwargs)
+        generator._tokenizer = byte_tokenizer
+        generator._config = GPT2Config(vocab_size=len(byte_tokenizer), n_positions=n_positions,
+                                       n_embd=32, n_layer=1, n_head=2)
+        return generator
+    return _make
\ No newline at end of file
@@ -0,0 +1,80 @@
+import pandas as pd
+from src.dataset_preparation.augmentor import DatasetAugmentor
+from src.dataset_preparation.qa_generator import EVQAGenerator
+
+
+def test_sources_run_in_pool_and_failures_are_recorded(tmp_path):
+    stations = pd.DataFrame({
+        "station_name": ["City Hall", "Depot"],
+        "connectors": [["J1772"], ["CCS"]],
+        "has_fast_charging": [False, True],
+    })
+    stations.to_parquet(tmp_path / "stations.parquet")
+    sources = [
+        {"path": tmp_path / "missing.parquet", "type": "stations"},
+        {"path": tmp_path / "stations.parquet", "type": "stations"},
+        {"path": tmp_path / "other.csv", "type": "csv"},
+    ]
+
+    augmentor = DatasetAugmentor(EVQAGenerator(use_gpt=False), max_workers=2)
+    qa_df = augmentor.augment_dataset(sources)
+
+    assert qa_df["question"].tolist()[0] == "What connectors are available at City Hall?"
+    assert len(qa_df) == augmentor.validation["valid_pairs"]
+    reports = {r["path"]: r for r in augmentor.source_reports}
+    assert reports[str(tmp_path / "stations.parquet")]["status"] == "ok"
+    assert reports[str(tmp_path / "stations.parquet")]["pairs"] == 4
+    assert reports[str(tmp_path / "missing.parquet")]["error"].startswith("FileNotFoundError")
+    assert reports[str(tmp_path / "other.csv")]["status"] == "error"
+
+
+class TaggedGenerator(EVQAGenerator):
+    """Subclass override that must also apply inside pool workers"""
+
+    def _rule_based_pdf_qa(self, text="", sentences=None, entities=None):
+        return [{**pair, "context": "tagged"} for pair in super()._rule_based_pdf_qa(text, sentences, entities)]
+
+
+def test_pool_workers_use_the_configured_generator(tmp_path):
+    pd.DataFrame({"station_name": ["City Hall"], "connectors": [["J1772"]], "has_fast_charging": [False]}) \
+        .to_parquet(tmp_path / "stations.parquet")
+    pd.DataFrame({
+        "text": ["Level 2 chargers deliver up to 19.2 kW."],
+        "sentences": [["Level 2 chargers deliver up to 19.2 kW.", "DC fast chargers deliver up to 350 kW."]]
+    }).to_parquet(tmp_path / "guide.parquet")
+    generator = TaggedGenerator(use_gpt=False, station_templates=("connectors",))
+
+    augmentor = DatasetAugmentor(generator, max_workers=2)
+    results = dict(augmentor.iter_sources([
+        {"path": tmp_path / "stations.parquet", "type": "stations"},
+        {"path": tmp_path / "guide.parquet", "type": "pdf"},
+    ]))
+
+    assert {r["worker"] for r in augmentor.source_reports} == {"pool"}
+    # Only the configured template, not the default two
+    assert results[0]["question"].tolist() == ["What connectors are available at City Hall?"]
+    assert len(results[1]) and (results[1]["context"] == "tagged").all()
+
+def test_each_source_is_written_as_it_finishes(tmp_path, monkeypatch):
+    first = pd.DataFrame({"question": ["What is a J1772 connector?", "Short?"],
+                          "answer": ["A Level 2 plug.", "Unknown"], "context": ["guide", "guide"]})
+    second = pd.DataFrame({"question": ["Where is City Hall?"], "answer": ["Downtown."], "context": ["stations"]})
+    output_path = tmp_path / "qa_pairs_raw.jsonl"
+    on_disk = []
+
+    def finished_out_of_order(sources):
+        yield 1, first
+        on_disk.append(pd.read_json(output_path, lines=True)["question"].tolist())
+        yield 0, second
+
+    augmentor = DatasetAugmentor(EVQAGenerator(use_gpt=False))
+    monkeypatch.setattr(augmentor, "iter_sources", finished_out_of_order)
+    qa_df = augmentor.augment_dataset([{}, {}], output_path)
+
+    # The first finished source was on disk before the next one came in, invalid pairs dropped
+    assert on_disk == [["What is a J1772 connector?"]]
+    assert qa_df["question"].tolist() == ["Where is City Hall?", "What is a J1772 connector?"]
+    assert pd.read_json(output_path, lines=True)["question"].tolist() == [
+        "What is a J1772 connector?", "Where is City Hall?"]
+    assert augmentor.validation["invalid_pairs"] == 1
+    assert augmentor.validation["error_breakdown"] == {"Question too short (<10 chars)": 1, "Answer is 'Unknown'": 1}
\ No newline at end of file
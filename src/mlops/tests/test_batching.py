@@ -0,0 +1,36 @@
+import torch
+from transformers import LlamaConfig, LlamaForCausalLM
+from src.fine_tuning.batching import PackedCollator, pack_examples
+
+def test_pack_examples_fills_rows_within_limit():
+    lengths = [200, 60, 50, 180, 70, 10, 256]
+    rows = pack_examples(lengths, 256)
+    assert sorted(i for row in rows for i in row) == list(range(len(lengths)))
+    assert all(sum(lengths[i] for i in row) <= 256 for row in rows)
+    assert len(rows) == 4
+
+def test_packed_rows_match_separate_examples():
+    torch.manual_seed(0)
+    model = LlamaForCausalLM(LlamaConfig(
+        vocab_size=100, hidden_size=32, intermediate_size=64, num_hidden_layers=2,
+        num_attention_heads=4, num_key_value_heads=4, max_position_embeddings=64
+    )).eval()
+    examples = [torch.randint(1, 100, (n,)) for n in (5, 9, 3, 7)]
+    rows = [[1, 3], [0, 2]]
+    batch = PackedCollator(pad_token_id=0)([
+        {"input_ids": torch.cat([examples[j] for j in row]), "lengths": torch.tensor([len(examples[j]) for j in row])}
+        for row in rows
+    ])
+    # Second row is 8 tokens, padded to the first row's 16
+    assert batch["labels"][1, 5].item() == -100 and (batch["labels"][1, 8:] == -100).all()
+    assert batch["position_ids"][0].tolist() == list(range(9)) + list(range(7))
+
+    with torch.no_grad():
+        logits = model(input_ids=batch["input_ids"], attention_mask=batch["attention_mask"],
+                       position_ids=batch["position_ids"]).logits
+        for r, row in enumerate(rows):
+            offset = 0
+            for j in row:
+                expected = model(examples[j][None]).logits[0]
+                assert torch.allclose(logits[r, offset:offset + len(examples[j])], expected, atol=1e-5)
+                offset += len(examples[j])
\ No newline at end of file
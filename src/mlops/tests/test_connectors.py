@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaner import DataCleaner
+from src.data_processing.station_processor import StationProcessor
+
+MIXED = [["J1772", "CHADEMO", "J1772"], [], None, np.nan, "[]", ("J1772",),
+         np.array(["TESLA", "J1772COMBO", "TESLA"], dtype=object), ["NEMA515"]]
+
+
+def _legacy(values):
+    """The per-row apply() derivations the vectorized helpers replaced"""
+    series = pd.Series(values, dtype=object)
+    connectors = series.apply(lambda x: list(set(x)) if isinstance(x, list) else ['Unknown'])
+    return pd.DataFrame({
+        'connectors': [sorted(c) for c in connectors],          # set() order was arbitrary
+        'connector_count': connectors.str.len(),
+        'has_fast_charging': series.apply(lambda x: any('DC' in c for c in x) if isinstance(x, list) else False),
+        'connector_types': series.apply(lambda x: sorted(set(x)) if isinstance(x, list) else [])
+    })
+
+
+def _vectorized(values):
+    df = pd.DataFrame({'ev_connector_types': pd.Series(values, dtype=object)})
+    processor = StationProcessor()
+    out = processor._add_metadata(processor._extract_connectors(df.copy()))
+    out['connector_types'] = DataCleaner()._standardize_connectors(df.copy())['connector_types']
+    return out.drop(columns='ev_connector_types')
+
+
+def test_vectorized_matches_apply_on_mixed_inputs():
+    # numpy arrays (lists read back from parquet) now count as lists; apply() saw them as missing
+    as_lists = [x.tolist() if isinstance(x, np.ndarray) else x for x in MIXED]
+    pd.testing.assert_frame_equal(_vectorized(MIXED), _legacy(as_lists), check_dtype=False)
+
+    new, old = _vectorized(MIXED).iloc[6], _legacy(MIXED).iloc[6]
+    assert new['connectors'] == ["J1772COMBO", "TESLA"] and old['connectors'] == ['Unknown']
\ No newline at end of file
@@ -1,13 +1,13 @@
 import pandas as pd
 from pathlib import Path
+from src.utils.shards import read_texts, shard_paths
 
 def test_training_data_quality():
-    train_path = Path("data/training/ev_qa_dataset.txt")
-    assert train_path.exists()
+    train_path = Path("data/training/ev_qa_dataset.jsonl")
+    shards = shard_paths(train_path)  # The file itself or its -NNNNN shards
     
-    with open(train_path) as f:
-        lines = f.readlines()
-        assert len(lines) > 100  # Minimum expected samples
-        for line in lines:
-            assert "Instruction:" in line
-            assert "Response:" in line
\ No newline at end of file
+    texts = list(read_texts(shards))
+    assert len(texts) > 100  # Minimum expected samples
+    for text in texts:
+        assert "Instruction:" in text
+        assert "Response:" in text
\ No newline at end of file
@@ -0,0 +1,53 @@
+import pandas as pd
+from src.dataset_preparation.deduplicator import QADeduplicator
+
+
+def test_drops_near_duplicates_and_reports_them():
+    echo = "What types of EV connectors support fast charging?"
+    qa_df = pd.DataFrame({
+        "question": [
+            echo,
+            "What connectors are available at Union Station Garage?",
+            echo,
+            "What connectors are available at Union Station  garage?",
+            "What does EVSE stand for?",
+        ],
+        "answer": [
+            "CCS and CHAdeMO connectors support fast charging.",
+            "J1772, CHADEMO",
+            "CCS and CHAdeMO connectors support fast charging.",
+            "J1772, CHADEMO",
+            "EVSE stands for electric vehicle supply equipment.",
+        ],
+        "source": ["pdf", "stations", "pdf", "stations", "pdf"],
+    })
+    deduped, report = QADeduplicator(threshold=0.8).deduplicate(qa_df)
+
+    assert deduped["question"].tolist() == [qa_df["question"][i] for i in (0, 1, 4)]
+    assert len(report) == 2
+    assert (report["similarity"] >= 0.8).all()
+    assert report["kept_question"].tolist() == [echo, qa_df["question"][1]]
+
+
+def test_chained_pairs_are_compared_with_the_kept_pair():
+    words = ("level two chargers deliver alternating current through the onboard charger while dc fast "
+             "chargers bypass it and feed the battery directly at much higher power levels").split()
+    # Each question overlaps the next by 16 of 20 words; the first and last overlap by 12
+    qa_df = pd.DataFrame({"question": [" ".join(words[s:s + 20]) for s in (0, 4, 8)], "answer": [""] * 3})
+    deduper = QADeduplicator(threshold=0.5)
+    signatures = deduper.signatures(qa_df)
+    similarity = lambda i, j: (signatures[i] == signatures[j]).mean()
+    assert similarity(0, 1) >= 0.5 and similarity(1, 2) >= 0.5 > similarity(0, 2)
+
+    deduped, report = deduper.deduplicate(qa_df)
+
+    assert deduped["question"].tolist() == qa_df["question"][[0, 2]].tolist()
+    assert report["kept_question"].tolist() == [qa_df["question"][0]]
+    assert (report["similarity"] >= 0.5).all()
+
+
+def test_no_candidates_keeps_everything():
+    qa_df = pd.DataFrame({"question": ["What is CCS?", "Where is the nearest Tesla Supercharger?"],
+                          "answer": ["A connector.", "Two miles north."]})
+    deduped, report = QADeduplicator().deduplicate(qa_df)
+    assert len(deduped) == 2 and report.empty
\ No newline at end of file
@@ -0,0 +1,45 @@
+import json
+import pandas as pd
+import pytest
+from src.dataset_preparation.formatter import EVQAFormatter
+from src.utils.shards import shard_paths
+
+def _qa_frame(n):
+    return pd.DataFrame({
+        "question": [f"What connectors are available at station {i}?" for i in range(n)],
+        "answer": ["CCS, J1772"] * n,
+        "context": [f"Station {i}" for i in range(n)],
+        "source": ["stations"] * n
+    })
+
+def test_sharded_jsonl_round_trip(tmp_path):
+    formatter = EVQAFormatter()
+    qa_df = _qa_frame(50)
+    written = formatter.write_dataset([qa_df[:20], qa_df[20:]], tmp_path / "train.jsonl", shard_bytes=2000)
+
+    assert len(written) > 1
+    assert shard_paths(tmp_path / "train.jsonl") == written
+    records = [json.loads(line) for path in written for line in path.read_text().splitlines()]
+    assert [r["question"] for r in records] == qa_df["question"].tolist()
+    assert [r["text"] for r in records] == formatter.format_dataset(qa_df)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+def test_missing_values_are_written_as_null(tmp_path):
+    qa_df = _qa_frame(3).assign(context=["Station 0", float("nan"), None], source=pd.array(["pdf", pd.NA, "pdf"]))
+    [path] = EVQAFormatter().write_dataset(qa_df, tmp_path / "train.jsonl")
+
+    # Strict parsing: a bare NaN token would raise here
+    records = [json.loads(line, parse_constant=lambda token: pytest.fail(f"invalid JSON token {token}"))
+               for line in path.read_text().splitlines()]
+    assert [r["context"] for r in records] == ["Station 0", None, None]
+    assert [r["source"] for r in records] == ["pdf", None, "pdf"]
+
+def test_text_output_matches_joined_format(tmp_path):
+    formatter = EVQAFormatter("plain")
+    qa_df = _qa_frame(5)
+    [path] = formatter.write_dataset(qa_df, tmp_path / "train.txt", output_format="text")
+    assert path.read_text() == "\n\n".join(formatter.format_dataset(qa_df))
+
+def test_shard_paths_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        shard_paths(tmp_path / "missing.txt")
\ No newline at end of file
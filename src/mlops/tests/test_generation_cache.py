@@ -0,0 +1,35 @@
+import inspect
+import json
+from src.config.paths import CACHE_DIR
+from src.dataset_preparation.generation_cache import GenerationCache
+
+PARAMS = {"temperature": 0.7, "top_p": 0.9}
+
+
+def test_key_covers_model_template_chunk_and_params():
+    key = GenerationCache.make_key("gpt2-medium", "template", "chunk", PARAMS)
+    assert key == GenerationCache.make_key("gpt2-medium", "template", "chunk", dict(PARAMS))
+    assert key != GenerationCache.make_key("gpt2", "template", "chunk", PARAMS)
+    assert key != GenerationCache.make_key("gpt2-medium", "template v2", "chunk", PARAMS)
+    assert key != GenerationCache.make_key("gpt2-medium", "template", "other chunk", PARAMS)
+    assert key != GenerationCache.make_key("gpt2-medium", "template", "chunk", {**PARAMS, "top_p": 0.8})
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    pairs = [{"question": "What is CCS?", "answer": "A DC fast charging connector."}]
+    # Room for exactly two entries
+    cache = GenerationCache(tmp_path, max_bytes=2 * len(json.dumps(pairs)))
+    cache.put_many({"a": pairs})
+    cache.put_many({"b": pairs})
+    cache.get_many(["a"])
+    cache.put_many({"c": pairs})
+
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_default_location_is_the_configured_cache_dir(monkeypatch, tmp_path):
+    # Independent of the working directory the pipeline is started from
+    monkeypatch.chdir(tmp_path)
+    default = inspect.signature(GenerationCache).parameters["cache_dir"].default
+    assert default == CACHE_DIR / "qa_generation"
+    assert default.is_absolute()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import time
+from src.data_collection import pdf_extractor
+from src.data_collection.page_cache import PageCache
+from src.data_collection.pdf_extractor import PDFExtractor
+
+def test_hit_and_miss(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put_pages("abc", 2, [(0, "first"), (1, None)], "1")
+
+    assert cache.get_page_count("abc") == 2
+    assert cache.get_page("abc", 0, "1") == (True, "first")
+    assert cache.get_page("abc", 1, "1") == (True, None)      # cached page without text
+    assert cache.get_page("abc", 2, "1") == (False, None)
+    assert cache.get_page("other", 0, "1") == (False, None)
+    assert cache.get_pages("abc", [0, 1, 5], "1") == {0: "first", 1: None}
+
+def test_cleaner_version_change_misses(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put_pages("abc", 1, [(0, "old rules")], "1")
+    assert cache.get_page("abc", 0, "2") == (False, None)
+    assert cache.get_pages("abc", [0], "2") == {}
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PageCache(tmp_path, max_bytes=10)
+    cache.put_pages("a", 1, [(0, "aaaa")], "1")
+    time.sleep(0.01)
+    cache.put_pages("b", 1, [(0, "bbbb")], "1")
+    time.sleep(0.01)
+    cache.get_page("a", 0, "1")                                 # "a" is now the most recent
+    time.sleep(0.01)
+    cache.put_pages("c", 1, [(0, "cccc")], "1")                 # 12 bytes > 10: one page goes
+
+    assert cache.get_page("b", 0, "1") == (False, None)
+    assert cache.get_page("a", 0, "1") == (True, "aaaa")
+    assert cache.get_page("c", 0, "1") == (True, "cccc")
+
+def test_extractor_reuses_and_invalidates_pages(make_pdf, tmp_path, monkeypatch):
+    pdf = make_pdf("guide.pdf", ["Level 2 chargers", "DC fast chargers"])
+    cache = PageCache(tmp_path / "cache")
+    first = PDFExtractor(pdf, cache=cache).extract_text()
+
+    reads = []
+    read_pages = pdf_extractor._read_pages
+    monkeypatch.setattr(pdf_extractor, "_read_pages",
+                        lambda reader, indices: reads.append(list(indices)) or read_pages(reader, indices))
+    assert PDFExtractor(pdf, cache=cache).extract_text() == first
+    assert reads == []
+
+    # New cleaning rules re-extract every page
+    monkeypatch.setattr(pdf_extractor, "CLEANER_VERSION", "test-bump")
+    assert PDFExtractor(pdf, cache=cache).extract_text() == first
+    assert reads == [[0, 1]]
+
+    # So does an edited file, which hashes differently
+    make_pdf("guide.pdf", ["Level 2 chargers", "DC fast chargers", "Tesla"])
+    assert PDFExtractor(pdf, cache=cache).extract_text()["pages"] == 3
+    assert reads[-1] == [0, 1, 2]
\ No newline at end of file
@@ -0,0 +1,47 @@
+from src.data_collection.page_cache import PageCache
+from src.data_collection.pdf_extractor import PDFExtractor
+
+PAGES = [f"Page {i} lists Level 2 chargers in county {i}" for i in range(10)]
+
+
+def test_process_pool_matches_serial_in_page_order(make_pdf, monkeypatch):
+    pdf = make_pdf("guide.pdf", PAGES)
+    serial = PDFExtractor(pdf).extract_text()
+
+    shards = []
+    extract_parallel = PDFExtractor._extract_parallel
+    def spy(self, indices):
+        shards.append(indices)
+        return extract_parallel(self, indices)
+    monkeypatch.setattr(PDFExtractor, "_extract_parallel", spy)
+    parallel = PDFExtractor(pdf, max_workers=2).extract_text()
+
+    assert shards == [list(range(10))]
+    assert parallel == serial
+    assert parallel["pages"] == 10
+    assert parallel["text"].index("--- PAGE 2 ---") < parallel["text"].index("--- PAGE 10 ---")
+
+
+def test_single_page_skips_the_pool(make_pdf, monkeypatch):
+    monkeypatch.setattr(PDFExtractor, "_extract_parallel", lambda self, indices: 1 / 0)
+    result = PDFExtractor(make_pdf("one.pdf", PAGES[:1]), max_workers=4).extract_text()
+    assert result["status"] == "success"
+
+
+def test_iter_pages_writes_cache_in_batches(make_pdf, tmp_path, monkeypatch):
+    cache = PageCache(tmp_path / "cache")
+    writes = []
+    put_pages = cache.put_pages
+    monkeypatch.setattr(cache, "put_pages", lambda file_hash, count, pages, version:
+                        writes.append(len(pages)) or put_pages(file_hash, count, pages, version))
+
+    pages = list(PDFExtractor(make_pdf("guide.pdf", PAGES), cache=cache).iter_pages(cache_batch=4))
+    assert [p["page"] for p in pages] == list(range(1, 11))
+    assert writes == [4, 4, 2]
+
+    # Stopping early still stores what was extracted
+    stream = PDFExtractor(make_pdf("other.pdf", PAGES[:5]), cache=cache).iter_pages(cache_batch=4)
+    next(stream)
+    stream.close()
+    assert writes[-1] == 1
+    assert list(PDFExtractor(tmp_path / "other.pdf", cache=cache).iter_pages())[0]["text"] == pages[0]["text"]
\ No newline at end of file
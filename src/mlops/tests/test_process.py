@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+from src.data_collection.page_cache import PageCache
+from src.data_collection.station_delta import StationDeltaTracker
+from src.data_processing import process
+from src.data_processing.spatial_index import StationSpatialIndex
+from src.data_processing.storage import DataStorage
+from src.data_processing.tokenizer import TextTokenizer
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch, spacy_model_dir):
+    """Pipeline branches writing to tmp_path, with a blank spaCy pipeline"""
+    monkeypatch.setattr(process, "DataStorage", lambda: DataStorage(tmp_path / "processed"))
+    monkeypatch.setattr(process, "PageCache", lambda: PageCache(tmp_path / "cache"))
+    monkeypatch.setattr(process, "TextTokenizer", lambda **kwargs: TextTokenizer(spacy_model_dir, **kwargs))
+    return DataStorage(tmp_path / "processed")
+
+
+def test_stream_without_text_fails_and_saves_nothing(make_pdf, isolated):
+    assert process.process_pdf(str(make_pdf("scan.pdf", ["", ""])), stream_pdf=True) is False
+    assert isolated.latest_entry("processed_pdf_scan") is None
+
+
+def test_stream_saves_pages(make_pdf, isolated):
+    pdf = make_pdf("guide.pdf", ["Level 2 chargers.", "DC fast chargers."])
+    assert process.process_pdf(str(pdf), stream_pdf=True) is True
+    assert isolated.latest_entry("processed_pdf_guide")["rows"] == 2
+
+
+def test_concurrent_pipeline_keeps_every_document(make_pdf, isolated, tmp_path):
+    pdfs = [str(make_pdf(f"{name}.pdf", [f"{name} lists Level 2 chargers."] * 3)) for name in ("oregon", "washington")]
+    stations = tmp_path / "stations.parquet"
+    pd.DataFrame({
+        "id": [1, 2], "station_name": ["City Hall", "Depot"], "latitude": [45.5, 47.6],
+        "longitude": [-122.6, -122.3], "ev_connector_types": [["J1772"], ["CHADEMO", "J1772COMBO"]]
+    }).to_parquet(stations)
+
+    for stream_pdf in (False, True):
+        assert process.run_pipeline(pdfs, str(stations), stream_pdf=stream_pdf, max_pdf_workers=2) == (True, True)
+
+    manifest = isolated._read_manifest()
+    for name in ("oregon", "washington"):
+        versions = manifest[f"processed_pdf_{name}"]["versions"].values()
+        assert sorted(v["format"] for v in versions) == ["jsonl", "parquet"]
+        for v in versions:
+            assert isolated.load(tmp_path / "processed" / v["file"])["source"].unique().tolist() == [f"{name}.pdf"]
+    assert isolated.latest_entry("processed_stations")["rows"] == 2
+    # The index goes through the same storage and names the stations version it was built from
+    index = StationSpatialIndex.load(storage=isolated)
+    assert index.stations_file == isolated.latest_entry("processed_stations")["file"]
+
+
+def test_station_deltas_update_processed_stations(isolated, tmp_path):
+    tracker = StationDeltaTracker(tmp_path / "delta_state")
+    snapshot = pd.DataFrame({
+        "id": [1, 2, 3], "station_name": ["City Hall", "Depot", "Library"], "latitude": [45.5, 47.6, 44.0],
+        "longitude": [-122.6, -122.3, -121.3], "ev_connector_types": [["J1772"], ["CHADEMO"], ["J1772"]]
+    })
+    assert process.process_stations([str(tracker.apply(snapshot))])
+
+    # Station 1 closes, station 2 is renamed
+    snapshot = snapshot.iloc[1:].assign(station_name=["Bus Depot", "Library"])
+    assert process.process_stations([str(tracker.apply(snapshot))])
+
+    stations = isolated.load_latest("processed_stations")
+    assert stations[["id", "station_name"]].values.tolist() == [[2, "Bus Depot"], [3, "Library"]]
\ No newline at end of file
@@ -0,0 +1,22 @@
+import pytest
+from src.dataset_preparation.qa_generator import PROMPT_TEMPLATE
+
+def test_chunks_fit_the_context_after_reencoding(tiny_generator):
+    generator = tiny_generator(n_positions=1024, max_new_tokens=100)
+    # Two-byte characters, so windows cut through them and decode to 3-byte U+FFFD
+    text = "Stecker für Schnellladesäule Nr. ü" * 200
+    chunks = generator._chunk_text(text)
+
+    limit = generator.config.n_positions - generator.generation_params["max_new_tokens"]
+    lengths = [len(generator.tokenizer.encode(PROMPT_TEMPLATE.format(num_questions=5, text=chunk)))
+               for chunk in chunks]
+    assert len(chunks) > 5
+    assert max(lengths) <= limit
+    # Cut to fit, not padded out with slack: most prompts use the whole budget
+    assert sum(length >= limit - 2 for length in lengths) >= len(chunks) // 2
+    assert "".join(chunks).replace("�", "").count("Schnellladesäule") >= 195
+
+def test_overlong_prompt_is_rejected_before_generating(tiny_generator):
+    generator = tiny_generator(n_positions=1024, max_new_tokens=100)
+    with pytest.raises(ValueError, match="n_positions"):
+        generator._generate_batch([PROMPT_TEMPLATE.format(num_questions=5, text="x" * 1000)])
\ No newline at end of file
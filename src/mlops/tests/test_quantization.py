@@ -0,0 +1,64 @@
+import copy
+import torch
+from torch import nn
+from transformers import GPT2Config, GPT2LMHeadModel
+from transformers.pytorch_utils import Conv1D
+from src.dataset_preparation.qa_generator import EVQAGenerator
+from src.dataset_preparation.quantization import compare_with_fp32, quantize_dynamic_int8
+
+
+def test_quantized_gpt2_tracks_fp32_logits():
+    torch.manual_seed(0)
+    model = GPT2LMHeadModel(GPT2Config(vocab_size=100, n_positions=32, n_embd=64, n_layer=2, n_head=4)).eval()
+    quantized = quantize_dynamic_int8(copy.deepcopy(model))
+
+    assert not any(isinstance(m, (Conv1D, nn.Linear)) for m in quantized.modules())
+    input_ids = torch.randint(0, 100, (2, 16))
+    with torch.no_grad():
+        expected, actual = model(input_ids).logits, quantized(input_ids).logits
+    assert torch.nn.functional.cosine_similarity(expected.flatten(), actual.flatten(), dim=0) > 0.99
+
+
+def test_quantized_generations_are_cached_separately():
+    assert EVQAGenerator("gpt2", use_gpt=False, quantize=True).model_id == "gpt2+dynamic-int8"
+    assert EVQAGenerator("gpt2", use_gpt=False).model_id == "gpt2"
+
+
+CHUNKS = ["Level 2 chargers deliver up to 19.2 kW.", "CCS connectors support DC fast charging."]
+PAIR = {"question": "What power do Level 2 chargers deliver?", "answer": "Up to 19.2 kW.",
+        "context": "GPT-generated", "source": "pdf"}
+
+
+def _tiny_pair(tiny_generator):
+    torch.manual_seed(0)
+    reference = tiny_generator(batch_size=2)
+    reference._model = GPT2LMHeadModel(reference.config).eval()
+    quantized = tiny_generator(batch_size=2, quantize=True)
+    quantized._model = quantize_dynamic_int8(copy.deepcopy(reference._model))
+    return quantized, reference
+
+
+def test_compare_with_fp32_reports_both_models(tiny_generator):
+    quantized, reference = _tiny_pair(tiny_generator)
+    report = compare_with_fp32(quantized, reference, CHUNKS)
+
+    assert set(report) == {"int8", "fp32", "speedup", "passed"}
+    for side in ("int8", "fp32"):
+        assert set(report[side]) == {"prompts", "pairs", "parse_rate", "validator_pass_rate", "seconds_per_prompt"}
+        assert report[side]["prompts"] == 2 and report[side]["seconds_per_prompt"] > 0
+    assert report["speedup"] > 0
+    # A random model parses nothing either way, so int8 is not worse
+    assert report["passed"] is True
+
+
+def test_compare_with_fp32_fails_beyond_tolerance(tiny_generator, monkeypatch):
+    quantized, reference = _tiny_pair(tiny_generator)
+    monkeypatch.setattr(reference, "generate_prompts", lambda prompts: [[dict(PAIR)] for _ in prompts])
+    # int8 parses half the prompts
+    monkeypatch.setattr(quantized, "generate_prompts", lambda prompts: [[dict(PAIR)]] + [[]] * (len(prompts) - 1))
+
+    report = compare_with_fp32(quantized, reference, CHUNKS, tolerance=0.1)
+    assert report["fp32"]["parse_rate"] == 1.0 and report["int8"]["parse_rate"] == 0.5
+    assert report["fp32"]["validator_pass_rate"] == 1.0
+    assert report["passed"] is False
+    assert compare_with_fp32(quantized, reference, CHUNKS, tolerance=0.5)["passed"] is True
\ No newline at end of file
@@ -0,0 +1,19 @@
+from src.dataset_preparation.rule_based_qa import extract_pdf_qa, split_sentences
+from src.dataset_preparation.validator import QAValidator
+
+def test_mines_ratings_definitions_and_acronyms():
+    sentences = split_sentences(
+        "This station has CCS (50 kW) and CHAdeMO (100 kW). "
+        "The Electric Vehicles Initiative EVI is a multi-governmental policy forum. "
+        "It is a long document."
+    )
+    entities = [{"text": "The Electric Vehicles Initiative EVI", "label": "ORG"}]
+    pairs = extract_pdf_qa(sentences, entities)
+    answers = {p["question"]: p["answer"] for p in pairs}
+
+    assert answers["What power rating is given for CCS?"] == "The text gives 50 kW for CCS."
+    assert answers["What power rating is given for CHAdeMO?"] == "The text gives 100 kW for CHAdeMO."
+    assert answers["What does EVI stand for?"] == "EVI stands for Electric Vehicles Initiative."
+    assert "What is the Electric Vehicles Initiative EVI?" in answers
+    assert not any(q.startswith("What is It") for q in answers)
+    assert all(QAValidator.validate_single(p)["valid"] for p in pairs)
\ No newline at end of file
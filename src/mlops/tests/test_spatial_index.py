@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from src.data_processing.spatial_index import StationSpatialIndex, haversine_km
+from src.data_processing.storage import DataStorage
+
+def make_stations(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "station_name": [f"station {i}" for i in range(rows)],
+        "latitude": rng.uniform(33.5, 34.5, rows),
+        "longitude": rng.uniform(-118.8, -117.8, rows),
+        "has_fast_charging": rng.random(rows) < 0.3,
+        "connectors": [["CHADEMO", "J1772COMBO"] if i % 4 == 0 else ["J1772"] for i in range(rows)]
+    })
+
+def test_queries_match_brute_force(tmp_path):
+    df = make_stations()
+    storage = DataStorage(tmp_path)
+    StationSpatialIndex.from_frame(df, stations_file="processed_stations_1.parquet").save(storage)
+    index = StationSpatialIndex.load(storage=storage)
+    assert index.stations_file == "processed_stations_1.parquet"
+    assert storage.latest_entry("station_index")["rows"] == len(df)
+
+    lat, lon = 34.05, -118.24
+    dist = haversine_km(lat, lon, df["latitude"].to_numpy(), df["longitude"].to_numpy())
+    fast = df["has_fast_charging"].to_numpy()
+    chademo = (df["id"] % 4 == 0).to_numpy()
+
+    expected = df["id"].to_numpy()[np.argsort(np.where(fast & chademo, dist, np.inf))[:5]]
+    nearest = index.nearest(lat, lon, k=5, fast_only=True, connector="CHADEMO")
+    assert nearest["id"].tolist() == expected.tolist()
+
+    within = index.query_radius(lat, lon, 10)
+    assert set(within["id"]) == set(df["id"][dist <= 10])
+    assert within["distance_km"].is_monotonic_increasing
\ No newline at end of file
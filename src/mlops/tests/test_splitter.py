@@ -0,0 +1,51 @@
+import json
+import pytest
+from src.dataset_preparation.splitter import HashSplitter, split_bucket
+
+def _write(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+def _questions(path):
+    return [json.loads(line)["question"] for line in path.read_text().splitlines()]
+
+def test_split_is_stable_and_keeps_questions_on_one_side(tmp_path):
+    records = [{"question": f"What is connector {i}?", "source": "pdf" if i % 3 else "stations"} for i in range(300)]
+    records.append({"question": "  WHAT is connector 7 ", "source": "stations"})
+    _write(tmp_path / "all.jsonl", records)
+
+    splitter = HashSplitter(val_fraction=0.2)
+    stats = splitter.split(tmp_path / "all.jsonl", tmp_path / "train.jsonl", tmp_path / "val.jsonl")
+    train, val = _questions(tmp_path / "train.jsonl"), _questions(tmp_path / "val.jsonl")
+    assert stats["train"] + stats["validation"] == 301
+    assert 30 < len(val) < 90
+    assert set(stats["by_source"]) == {"pdf", "stations"}
+    # The variant of question 7 follows the original
+    assert ("What is connector 7?" in val) == ("  WHAT is connector 7 " in val)
+
+    # Adding data leaves every earlier assignment where it was
+    _write(tmp_path / "all.jsonl", records + [{"question": f"New question {i}?"} for i in range(50)])
+    splitter.split(tmp_path / "all.jsonl", tmp_path / "train.jsonl", tmp_path / "val.jsonl")
+    assert set(val) <= set(_questions(tmp_path / "val.jsonl"))
+    assert set(train) <= set(_questions(tmp_path / "train.jsonl"))
+
+def test_split_refuses_to_overwrite_input(tmp_path):
+    _write(tmp_path / "all.jsonl", [{"question": "What is CCS?"}])
+    with pytest.raises(ValueError):
+        HashSplitter().split(tmp_path / "all.jsonl", tmp_path / "all.jsonl", tmp_path / "val.jsonl")
+def test_small_sources_get_their_validation_share(tmp_path):
+    # Four hand-written questions whose buckets all sit above the threshold
+    manual = [q for q in (f"How do I reset charger {i}?" for i in range(100)) if split_bucket(q) >= 0.25][:4]
+    lowest = min(manual, key=split_bucket)
+    records = [{"question": f"What is connector {i}?", "source": "pdf"} for i in range(400)]
+    records += [{"question": q, "source": "manual"} for q in manual]
+    records.append({"question": lowest, "source": "pdf"})      # the same question in a large source
+    _write(tmp_path / "all.jsonl", records)
+
+    splitter = HashSplitter(val_fraction=0.25)
+    stats = splitter.split(tmp_path / "all.jsonl", tmp_path / "train.jsonl", tmp_path / "val.jsonl")
+
+    # floor(0.25 * 4) = 1: the manual question with the lowest bucket, wherever it appears
+    assert stats["by_source"]["manual"] == {"train": 3, "validation": 1}
+    assert stats["top_ups"]["manual"] == 1
+    assert _questions(tmp_path / "val.jsonl").count(lowest) == 2
+    assert lowest not in _questions(tmp_path / "train.jsonl")
\ No newline at end of file
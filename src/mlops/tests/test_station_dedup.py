@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from src.data_processing.spatial_index import haversine_km
+from src.data_processing.station_dedup import StationDeduplicator
+
+
+def test_merges_same_site_spellings_only():
+    df = pd.DataFrame({
+        "id": [10, 11, 12, 13, 14],
+        "station_name": ["City Hall Garage", "CITY HALL  GARAGE", "City Hall Garage",
+                         "City Hall Garage Level 2", "City Hall Garage Level 3"],
+        # 11 is ~20 m from 10, 12 is ~5 km away, 13/14 share the site but differ by level
+        "latitude": [34.0500, 34.0502, 34.1000, 34.0500, 34.0500],
+        "longitude": [-118.2400, -118.2400, -118.2000, -118.2401, -118.2401],
+    })
+    stations, merge_log = StationDeduplicator().deduplicate(df)
+
+    assert stations["id"].tolist() == [10, 12, 13, 14]
+    assert merge_log[["station_id", "canonical_id"]].values.tolist() == [[11, 10]]
+    assert merge_log["distance_m"].iloc[0] < 100
+
+
+
+def test_members_must_match_the_canonical_station():
+    # 1~2 and 2~3 score >= 95, but 1 and 3 only ~94
+    df = pd.DataFrame({
+        "id": [1, 2, 3],
+        "station_name": ["Riverside Shopping Centre", "Riverside Shopping Center", "Riverside Shoping Center"],
+        "latitude": [34.0500, 34.0501, 34.0502],
+        "longitude": [-118.2400, -118.2400, -118.2400],
+    })
+    stations, merge_log = StationDeduplicator(name_threshold=95).deduplicate(df)
+
+    assert stations["id"].tolist() == [1, 3]
+    assert merge_log[["station_id", "canonical_id", "canonical_name"]].values.tolist() == [
+        [2, 1, "Riverside Shopping Centre"]]
+    assert merge_log["name_score"].iloc[0] >= 95
+
+
+def test_repeated_station_ids_collapse():
+    # Concatenated snapshots list the same station twice
+    df = pd.DataFrame({
+        "id": [7, 8, 7],
+        "station_name": ["City Hall Garage", "Library", "City Hall Garage"],
+        "latitude": [34.0500, 34.1000, 34.0500],
+        "longitude": [-118.2400, -118.2000, -118.2400],
+    })
+    stations, merge_log = StationDeduplicator().deduplicate(df)
+
+    assert stations["id"].tolist() == [7, 8]
+    assert merge_log[["station_id", "canonical_id", "canonical_name"]].values.tolist() == [
+        [7, 7, "City Hall Garage"]]
+
+def test_north_south_twins_at_high_latitude_are_merged():
+    rng = np.random.default_rng(0)
+    n = 300
+    lats = rng.uniform(45, 70, n)
+    lons = rng.uniform(-165, -115, n)
+    # Each station gets a twin 60-95 m due north (~0.00054-0.00085 degrees)
+    offsets = rng.uniform(60, 95, n) / 111_195
+    df = pd.DataFrame({
+        "id": np.arange(2 * n),
+        "station_name": [f"Station {chr(65 + i % 26)}{chr(65 + i // 26)}" for i in range(n)] * 2,
+        "latitude": np.concatenate([lats, lats + offsets]),
+        "longitude": np.concatenate([lons, lons]),
+    })
+    stations, merge_log = StationDeduplicator().deduplicate(df)
+
+    assert len(stations) == n
+    assert sorted(merge_log["station_id"]) == list(range(n, 2 * n))
+
+
+def test_candidate_pairs_match_brute_force():
+    rng = np.random.default_rng(1)
+    n = 400
+    # Clustered points from the equator to the Arctic, so many pairs sit near 100 m
+    centres = rng.uniform([-10, -180], [85, 180], size=(20, 2))
+    points = centres[rng.integers(0, 20, n)] + rng.normal(0, 0.001, size=(n, 2))
+    df = pd.DataFrame({"latitude": points[:, 0], "longitude": points[:, 1]})
+
+    left, right, _ = StationDeduplicator()._candidate_pairs(df)
+    i, j = np.triu_indices(n, k=1)
+    distance = haversine_km(points[i, 0], points[i, 1], points[j, 0], points[j, 1]) * 1000
+    expected = {(a, b) for a, b, d in zip(i, j, distance) if d <= 100}
+
+    assert len(expected) > 100
+    assert {tuple(sorted(p)) for p in zip(left.tolist(), right.tolist())} == expected
\ No newline at end of file
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+from src.data_collection.station_delta import StationDeltaTracker
+
+def _stations():
+    return pd.DataFrame({
+        "id": [1, 2, 3],
+        "station_name": ["City Hall", "Depot", "Library"],
+        "ev_level2_evse_num": [2, 4, 1],
+        "date_last_confirmed": ["2025-01-01"] * 3
+    })
+
+def test_delta_classifies_added_changed_removed(tmp_path):
+    tracker = StationDeltaTracker(tmp_path)
+    first = tracker.apply(_stations())
+    assert first.parent == tmp_path / "deltas"
+    assert set(pd.read_parquet(first)["change_type"]) == {"added"}
+
+    snapshot = _stations()
+    snapshot.loc[1, "station_name"] = "Bus Depot"                  # changed
+    snapshot.loc[2, "date_last_confirmed"] = "2025-02-01"          # ignored column: unchanged
+    snapshot = pd.concat([snapshot.drop(index=0),                  # id 1 removed
+                          pd.DataFrame({"id": [4], "station_name": ["Mall"], "ev_level2_evse_num": [6],
+                                        "date_last_confirmed": ["2025-02-01"]})], ignore_index=True)
+    delta = pd.read_parquet(tracker.apply(snapshot)).set_index("id")["change_type"]
+
+    assert delta.to_dict() == {2: "changed", 4: "added", 1: "removed"}
+    assert sorted(tracker.load_current()["id"]) == [2, 3, 4]
+    assert tracker.apply(snapshot) is None
+
+def test_hash_ignores_int_to_float_dtype_change(tmp_path):
+    tracker = StationDeltaTracker(tmp_path)
+    stations = _stations()
+    tracker.apply(stations)
+
+    # A NaN in another station turns the int column into float64
+    widened = pd.concat([stations, pd.DataFrame({"id": [4], "station_name": ["Mall"], "ev_level2_evse_num": [np.nan],
+                                                 "date_last_confirmed": ["2025-01-01"]})], ignore_index=True)
+    assert widened["ev_level2_evse_num"].dtype == np.float64
+    delta = pd.read_parquet(tracker.apply(widened))
+    assert delta[["id", "change_type"]].values.tolist() == [[4, "added"]]
+
+def test_snapshot_path_resolves_deltas_to_current_table(tmp_path):
+    tracker = StationDeltaTracker(tmp_path / "state")
+    delta = tracker.apply(_stations())
+
+    assert StationDeltaTracker.snapshot_path(delta) == tracker.current_path
+    assert StationDeltaTracker.snapshot_path(tmp_path / "state") == tracker.current_path
+    assert StationDeltaTracker.snapshot_path(tmp_path / "stations.parquet") == tmp_path / "stations.parquet"
\ No newline at end of file
@@ -0,0 +1,25 @@
+import pandas as pd
+from src.dataset_preparation.station_templates import generate_station_qa
+
+def test_templates_match_row_wise_output():
+    stations = pd.DataFrame({
+        "station_name": ["City Hall", "Depot"],
+        "connectors": [["J1772", "Unknown", "CHADEMO"], ["[Unknown]"]],
+        "has_fast_charging": [True, False],
+        "ev_network": ["ChargePoint Network", "UNKNOWN"],
+    })
+    qa = generate_station_qa(stations, ["connectors", "charging_type", "network"])
+
+    assert qa["question"].tolist() == [
+        "What connectors are available at City Hall?",
+        "What type of charging is available at City Hall?",
+        "Which charging network operates City Hall?",
+        "What connectors are available at Depot?",
+        "What type of charging is available at Depot?",
+    ]
+    assert qa["answer"].tolist() == [
+        "J1772, CHADEMO", "DC fast charging", "ChargePoint Network",
+        "No connector information available", "AC Level 2 charging",
+    ]
+    assert qa["context"].tolist()[:2] == ["Station City Hall", "Station ID: 0"]
+    assert (qa["source"] == "stations").all()
\ No newline at end of file
@@ -0,0 +1,124 @@
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+import pandas as pd
+import pytest
+from src.data_processing import storage as storage_module
+from src.data_processing.storage import DataStorage
+
+
+class _FrozenClock(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 1, 12, 0, 0)
+
+
+class _TickingClock(datetime):
+    """One second later on every call"""
+    ticks = 0
+
+    @classmethod
+    def now(cls, tz=None):
+        cls.ticks += 1
+        return cls(2025, 1, 1, 12, 0, 0) + timedelta(seconds=cls.ticks)
+
+
+def _save_one(output_dir: str, i: int) -> Path:
+    return DataStorage(output_dir).save(pd.DataFrame({"id": [i]}), "processed_pdf")
+
+
+class TestDataStorage:
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return DataStorage(tmp_path)
+
+    def test_load_latest_uses_manifest(self, storage):
+        storage.save(pd.DataFrame({"id": [1], "name": ["old"]}), "processed_stations")
+        storage.save(pd.DataFrame({"id": [2, 3], "name": ["a", "b"]}), "processed_stations")
+
+        entry = storage.latest_entry("processed_stations")
+        assert entry["rows"] == 2
+        assert set(entry["schema"]) == {"id", "name"}
+
+        df = storage.load_latest("processed_stations", columns=["id"], verify=True)
+        assert df.columns.tolist() == ["id"]
+        assert df["id"].tolist() == [2, 3]
+
+    def test_memory_mapped_arrow(self, storage):
+        storage.save(pd.DataFrame({"id": [1, 2], "name": ["a", "b"]}), "stations", "arrow")
+        df = storage.load_latest("stations", columns=["name"], memory_map=True)
+        assert df["name"].tolist() == ["a", "b"]
+
+    def test_failed_write_leaves_no_artifact(self, storage, tmp_path):
+        def broken():
+            yield {"page": 1}
+            raise RuntimeError("extractor crashed")
+
+        with pytest.raises(RuntimeError):
+            storage.save_stream(broken(), "processed_pdf")
+
+        assert storage.latest_entry("processed_pdf") is None
+        assert not list(tmp_path.glob("*processed_pdf*"))
+
+    def test_same_second_saves_get_ordered_versions(self, storage, monkeypatch):
+        monkeypatch.setattr(storage_module, "datetime", _FrozenClock)
+
+        for i in range(11):
+            storage.save(pd.DataFrame({"id": [i]}), "processed_stations")
+
+        entry = storage.latest_entry("processed_stations")
+        # "_10" sorts before "_9" as a string
+        assert entry["version"] == "20250101_120000_10"
+        assert storage.load_latest("processed_stations")["id"].tolist() == [10]
+
+    def test_lock_held_by_crashed_process_is_released(self, storage, tmp_path):
+        holder = subprocess.Popen(
+            [sys.executable, "-c", (
+                "import sys, time\n"
+                "from src.data_processing.storage import DataStorage\n"
+                f"with DataStorage({str(tmp_path)!r})._manifest_lock():\n"
+                "    print('locked', flush=True)\n"
+                "    time.sleep(60)\n"
+            )],
+            stdout=subprocess.PIPE, text=True, cwd=Path(__file__).parents[3]
+        )
+        try:
+            assert holder.stdout.readline().strip() == "locked"
+            with pytest.raises(TimeoutError):
+                with storage._manifest_lock(timeout=0.2):
+                    pass
+        finally:
+            holder.kill()
+            holder.wait()
+
+        # The holder died inside the lock; its lock file is still on disk
+        assert (tmp_path / ".manifest.json.lock").exists()
+        storage.save(pd.DataFrame({"id": [1]}), "processed_stations")
+        assert storage.latest_entry("processed_stations")["rows"] == 1
+
+    def test_concurrent_same_second_saves_all_survive(self, storage, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage_module, "datetime", _FrozenClock)
+        # Forked workers inherit the frozen clock
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            paths = list(pool.map(_save_one, [str(tmp_path)] * 8, range(8)))
+
+        assert len(set(paths)) == 8
+        versions = storage._read_manifest()["processed_pdf"]["versions"].values()
+        assert sorted(storage.load(tmp_path / v["file"])["id"][0] for v in versions) == list(range(8))
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_prefix_lookup_spans_per_document_names(self, storage, monkeypatch):
+        monkeypatch.setattr(storage_module, "datetime", _TickingClock)
+        storage.save(pd.DataFrame({"doc": ["guide v1"]}), "processed_pdf_guide")
+        storage.save(pd.DataFrame({"doc": ["2025 report"]}), "processed_pdf_2025_report")
+        storage.save([{"doc": "guide v2"}], "processed_pdf_guide", "json")
+        storage.save(pd.DataFrame({"id": [1]}), "processed_stations")
+
+        latest = storage.latest_by_prefix("processed_pdf_")
+        assert sorted(latest) == ["processed_pdf_2025_report", "processed_pdf_guide"]
+        assert latest["processed_pdf_guide"]["format"] == "json"
+        # Newest across every document, not the last file name in sort order
+        assert storage.load_latest("processed_pdf")["doc"].tolist() == ["guide v2"]
+        assert storage.load_latest("processed_pdf_2025")["doc"].tolist() == ["2025 report"]
\ No newline at end of file
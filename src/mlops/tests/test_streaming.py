@@ -0,0 +1,77 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pandas as pd
+import pytest
+from src.data_processing.station_processor import StationProcessor
+from src.data_processing.streaming import stream_transform
+
+def _stations(n=10):
+    return pd.DataFrame({
+        "id": range(n),
+        "station_name": [f"  Station   {i} " for i in range(n)],
+        "latitude": [45.0 + i / 100 for i in range(n)],
+        "longitude": [-122.0] * n,
+        "ev_connector_types": [["J1772", "CHADEMO"] if i % 2 else None for i in range(n)],
+        "notes": ["x" * 100] * n
+    })
+
+def _write(df, path, row_group_size=3):
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=row_group_size)
+    return path
+
+def test_batches_match_whole_frame_and_read_only_columns(tmp_path):
+    source = _write(_stations(), tmp_path / "stations.parquet")
+    seen = []
+    def transform(df):
+        seen.append(list(df.columns))
+        return df.assign(name_length=df["station_name"].str.len())
+
+    rows = stream_transform(str(source), str(tmp_path / "out.parquet"), transform, ["id", "station_name"],
+                            derived_fields=[pa.field("name_length", pa.int64())], batch_size=4)
+
+    assert rows == 10
+    assert len(seen) > 1 and all(cols == ["id", "station_name"] for cols in seen)
+    out = pd.read_parquet(tmp_path / "out.parquet")
+    expected = transform(pd.read_parquet(source, columns=["id", "station_name"]))
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+
+def test_all_null_batch_keeps_declared_schema(tmp_path):
+    source = _write(_stations(4), tmp_path / "stations.parquet", row_group_size=2)
+    def transform(df):
+        # The first batch has no value at all for the derived column
+        return df.assign(network=None if df["id"].iloc[0] == 0 else "ChargePoint")
+
+    stream_transform(str(source), str(tmp_path / "out.parquet"), transform, ["id"],
+                     derived_fields=[pa.field("network", pa.string())], batch_size=2)
+
+    out = pq.read_table(tmp_path / "out.parquet")
+    assert out.schema.field("network").type == pa.string()
+    assert out.column("network").to_pylist() == [None, None, "ChargePoint", "ChargePoint"]
+
+def test_failures_leave_no_output(tmp_path):
+    source = _write(_stations(), tmp_path / "stations.parquet")
+    output = tmp_path / "out.parquet"
+    with pytest.raises(ValueError, match="Missing columns"):
+        stream_transform(str(source), str(output), lambda df: df, ["id", "ev_network"])
+
+    def crash_later(df):
+        if df["id"].iloc[0] > 0:
+            raise RuntimeError("bad batch")
+        return df
+    with pytest.raises(RuntimeError):
+        stream_transform(str(source), str(output), crash_later, ["id"], batch_size=3)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["stations.parquet"]
+
+def test_station_streaming_matches_in_memory(tmp_path):
+    source = _write(_stations(), tmp_path / "stations.parquet")
+    processor = StationProcessor()
+    rows = processor.process_stations_streaming(str(source), str(tmp_path / "out.parquet"), batch_size=4)
+
+    streamed = pd.read_parquet(tmp_path / "out.parquet")
+    in_memory = processor.process_stations(str(source))[streamed.columns]
+    assert rows == 10
+    assert "notes" not in streamed.columns
+    assert streamed["connectors"].map(list).tolist() == in_memory["connectors"].map(list).tolist()
+    pd.testing.assert_frame_equal(streamed.drop(columns="connectors"), in_memory.drop(columns="connectors"),
+                                  check_dtype=False)
\ No newline at end of file
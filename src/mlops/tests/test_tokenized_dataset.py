@@ -0,0 +1,56 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import PreTrainedTokenizerFast
+from src.fine_tuning.config import FineTuningConfig
+from src.fine_tuning.tokenized_dataset import (
+    TokenizedDataset, format_instruction, prepare_tokenized_dataset, source_fingerprint
+)
+
+
+def _tokenizer():
+    words = ["[UNK]", "Instruction", "Response", ":", "What", "is", "CCS", "?", "A", "connector", "."]
+    backend = Tokenizer(models.WordLevel({w: i for i, w in enumerate(words)}, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    return PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]")
+
+
+def test_artifact_matches_tokenizer_and_is_reused(tmp_path):
+    train_path = tmp_path / "train.txt"
+    texts = ["### Instruction:\nWhat is CCS?\n\n### Response:\nA connector.", "plain line " * 20]
+    train_path.write_text("\n".join(json.dumps({"text": t}) for t in texts))
+    config = FineTuningConfig(model_name="org/tiny", max_seq_length=8, tokenized_data_dir=str(tmp_path / "tok"))
+    tokenizer = _tokenizer()
+
+    dataset = prepare_tokenized_dataset(config, [train_path], tokenizer)
+    assert len(dataset) == 2
+    assert dataset[0]["input_ids"].tolist() == tokenizer(format_instruction(texts[0]))["input_ids"][:8]
+    assert dataset.lengths.tolist() == [8, 8]  # truncated to max_seq_length
+    assert dataset.path.name == "org--tiny-8"
+
+    # Unchanged source: loaded from disk, no tokenizer needed
+    assert prepare_tokenized_dataset(config, [train_path]).meta == dataset.meta
+
+    train_path.write_text(json.dumps({"text": "What is CCS?"}))
+    assert TokenizedDataset.load_if_fresh(dataset.path, source_fingerprint([train_path])) is None
+    rebuilt = prepare_tokenized_dataset(config, [train_path], tokenizer)
+    assert rebuilt[0]["input_ids"].tolist() == [4, 5, 6, 7]
+
+
+def _build(path, texts, fingerprint):
+    dataset = TokenizedDataset.build(texts, _tokenizer(), "org/tiny", 8, path, fingerprint)
+    return dataset[0]["input_ids"].tolist()
+
+
+def test_concurrent_builds_all_succeed(tmp_path):
+    path = tmp_path / "tok" / "org--tiny-8"
+    # A stale artifact from older data is replaced, not merged into
+    TokenizedDataset.build(["A connector ."], _tokenizer(), "org/tiny", 8, path, "old")
+    texts = ["What is CCS ?"] * 50
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_build, [path] * 8, [texts] * 8, ["new"] * 8))
+
+    assert results == [[4, 5, 6, 7]] * 8
+    assert TokenizedDataset.load_if_fresh(path, "new") is not None
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
\ No newline at end of file
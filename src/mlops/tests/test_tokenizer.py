@@ -0,0 +1,37 @@
+from src.data_processing.tokenizer import TextTokenizer
+
+def _long_document(tokenizer):
+    sentence = "Level 2 chargers add about 25 miles of range per hour. "
+    text = sentence * (tokenizer.nlp.max_length // len(sentence) + 5)
+    assert len(text) > tokenizer.nlp.max_length
+    return {"source": "guide.pdf", "text": text}
+
+def _broken_pipe(*args, **kwargs):
+    raise RuntimeError("worker died")
+
+def test_fallback_handles_documents_longer_than_max_length(spacy_model_dir, monkeypatch):
+    tokenizer = TextTokenizer(spacy_model_dir, max_chunk_chars=200)
+    tokenizer.nlp.max_length = 1000
+    documents = [_long_document(tokenizer), {"source": "empty.pdf", "text": ""}]
+    batched = tokenizer.batch_process(documents)
+
+    monkeypatch.setattr(tokenizer.nlp, "pipe", _broken_pipe)
+    fallback = tokenizer.batch_process(documents)
+
+    assert len(fallback) == 1 and fallback[0]["source"] == "guide.pdf"
+    assert fallback[0]["token_count"] > 0
+    assert fallback == batched
+
+def test_fallback_drops_only_the_failing_document(spacy_model_dir, monkeypatch):
+    tokenizer = TextTokenizer(spacy_model_dir)
+    documents = [{"source": "bad.pdf", "text": "Page one. --- BAD ---"},
+                 {"source": "good.pdf", "text": "DC fast chargers."}]
+    monkeypatch.setattr(tokenizer.nlp, "pipe", _broken_pipe)
+    call = type(tokenizer.nlp).__call__
+    def nlp_call(self, text, **kwargs):
+        if "BAD" in text:
+            raise ValueError("unparseable")
+        return call(self, text, **kwargs)
+    monkeypatch.setattr(type(tokenizer.nlp), "__call__", nlp_call)
+
+    assert [doc["source"] for doc in tokenizer.batch_process(documents)] == ["good.pdf"]
\ No newline at end of file
@@ -0,0 +1,21 @@
+import pandas as pd
+from src.dataset_preparation.validator import QAValidator
+
+def test_validate_frame_matches_row_wise_validation():
+    qa_list = [
+        {"question": "What is CCS?", "answer": "A DC fast charging connector.", "context": "c"},
+        {"question": "Short?", "answer": "unknown", "context": "c"},
+        {"question": "What connectors are here", "answer": "J1772"},
+        {"question": "What is the voltage of Level 2?", "context": "c"},
+    ]
+    result = QAValidator.validate_frame(pd.DataFrame(qa_list))
+
+    assert result["valid"].tolist() == [QAValidator.validate_single(qa)["valid"] for qa in qa_list]
+    assert result["valid_pairs"] == 1
+    assert result["error_breakdown"] == {
+        "Missing key: answer": 1,
+        "Missing key: context": 1,
+        "Question too short (<10 chars)": 1,
+        "Question should end with '?'": 1,
+        "Answer is 'Unknown'": 1,
+    }
\ No newline at end of file
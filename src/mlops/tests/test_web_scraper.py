@@ -0,0 +1,61 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from src.data_collection.web_scraper import build_session, fetch_stations_paginated
+
+TOTAL_STATIONS = 1050
+
+class FakeNRELHandler(BaseHTTPRequestHandler):
+    """Stand-in for the NREL alt-fuel-stations endpoint"""
+    failed_offsets = set()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["200"])[0])
+
+        # Fail every page once to exercise retry/backoff
+        if offset not in self.failed_offsets:
+            self.failed_offsets.add(offset)
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        stations = [
+            {"id": i, "station_name": f"Station {i}"}
+            for i in range(offset, min(offset + limit, TOTAL_STATIONS))
+        ]
+        body = json.dumps({"total_results": TOTAL_STATIONS, "fuel_stations": stations}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestPaginatedFetch:
+    @pytest.fixture
+    def server_url(self):
+        FakeNRELHandler.failed_offsets = set()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeNRELHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/api/alt-fuel-stations/v1"
+        server.shutdown()
+        server.server_close()
+
+    def test_fetches_all_pages_in_order(self, server_url):
+        session = build_session(pool_size=4, backoff_factor=0)
+        df = fetch_stations_paginated(api_key="test", base_url=server_url, max_workers=4, session=session)
+        assert len(df) == TOTAL_STATIONS
+        assert df["id"].tolist() == list(range(TOTAL_STATIONS))
+
+    def test_max_pages_limits_fetch(self, server_url):
+        session = build_session(pool_size=2, backoff_factor=0)
+        df = fetch_stations_paginated(api_key="test", base_url=server_url, max_pages=2, session=session)
+        assert len(df) == 400
\ No newline at end of file
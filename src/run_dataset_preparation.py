@@ -3,6 +3,9 @@ import sys
 import logging
 from pathlib import Path
 
+# Modules import shared code as ``src.…``, so the repo root must be importable too
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,60 +22,96 @@ from dataset_preparation import (
     EVQAGenerator,
     DatasetAugmentor, 
     EVQAFormatter,
-    QAValidator
+    QAValidator,
+    GenerationCache,
+    QADeduplicator,
+    HashSplitter
 )
+from utils.shards import shard_paths
+from fine_tuning.config import FineTuningConfig
+from fine_tuning.tokenized_dataset import prepare_tokenized_dataset
+from data_processing.storage import DataStorage
+
+def processed_sources(storage: DataStorage) -> list:
+    """Augmentor sources for the latest processed artifacts, found through the storage manifest"""
+    sources = [
+        {"path": storage.output_dir / entry["file"], "type": "pdf"}
+        for entry in storage.latest_by_prefix("processed_pdf_").values()
+    ]
+    stations = storage.latest_entry("processed_stations")
+    if stations:
+        sources.append({"path": storage.output_dir / stations["file"], "type": "stations"})
+    if not sources:
+        raise FileNotFoundError(f"No processed data in {storage.output_dir}, run the processing pipeline first")
+    return sources
 
 def main():
     try:
         logger.info("Initializing components...")
         
         # Initialize with GPT-2 (updated initialization)
-        qa_generator = EVQAGenerator(model_name="gpt2-medium")
+        qa_generator = EVQAGenerator(model_name="gpt2-medium", cache=GenerationCache())
         augmentor = DatasetAugmentor(qa_generator)
         formatter = EVQAFormatter(format_template="alpaca")
+        deduplicator = QADeduplicator(threshold=0.8)
         
-        # Input sources - update these paths to your actual files
-        sources = [
-            {
-                "path": r"data/processed/processed_pdf_20250730_150124.json",
-                "type": "pdf"
-            },
-            {
-                "path": r"data/processed/processed_stations_20250730_150125.parquet",
-                "type": "stations"
-            }
-        ]
+        # Input sources: the newest output of every processed document plus the station table
+        sources = processed_sources(DataStorage())
         
         logger.info("Starting data processing pipeline...")
         
-        # 1. Generate Q&A pairs
-        qa_df = augmentor.augment_dataset(sources)
-        logger.info(f"Generated {len(qa_df)} QA pairs")
+        output_dir = Path("data/training")
+        output_dir.mkdir(parents=True, exist_ok=True)
         
-        # 2. Validate quality
-        validation = QAValidator.validate_batch(qa_df.to_dict('records'))
+        # 1-2. Generate Q&A pairs, validating each source as it finishes; its valid
+        # pairs are written to qa_pairs_raw.jsonl straight away
+        qa_df = augmentor.augment_dataset(sources, output_dir / "qa_pairs_raw.jsonl")
+        validation = augmentor.validation
+        logger.info(f"Generated {len(qa_df)} QA pairs")
         logger.info(f"Validation: {validation['valid_pairs']} valid, {validation['invalid_pairs']} invalid")
         
-        # 3. Format for training
-        formatted_data = formatter.format_dataset(qa_df)
+        # 3. Drop near-duplicate pairs (template repeats, echoed prompt examples)
+        qa_df, dedup_report = deduplicator.deduplicate(qa_df)
+        logger.info(f"Removed {len(dedup_report)} near-duplicate pairs, {len(qa_df)} remain")
         
-        # 4. Save outputs
-        output_dir = Path("data/training")
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # 4. Format and stream to disk (one JSON record per pair, "text" holds the prompt)
+        training_path = output_dir / "ev_qa_dataset.jsonl"
+        written = formatter.write_dataset(qa_df, training_path, output_format="jsonl")
+        logger.info(f"Saved training data to {', '.join(map(str, written))}")
+        
+        # 5. Hash-based train/validation split (stable across re-runs), then
+        # pre-tokenize the train split so training runs skip tokenization
+        ft_config = FineTuningConfig()
+        split = HashSplitter(val_fraction=0.2).split(training_path, ft_config.train_data_path, ft_config.eval_data_path)
+        logger.info(f"Split into {split['train']} train / {split['validation']} validation pairs")
+        for source, counts in split['by_source'].items():
+            logger.info(f"  {source}: {counts.get('train', 0)} train / {counts.get('validation', 0)} validation")
+        try:
+            tokenized = prepare_tokenized_dataset(ft_config, shard_paths(ft_config.train_data_path))
+            logger.info(f"Saved {len(tokenized)} tokenized examples to {tokenized.path}")
+        except OSError as e:
+            # The trainer builds the artifact itself on first run
+            logger.warning(f"Skipped pre-tokenization, training tokenizer unavailable: {e}")
         
-        training_path = output_dir / "ev_qa_dataset.txt"
-        with open(training_path, 'w', encoding='utf-8') as f:
-            f.write("\n\n".join(formatted_data))
-        logger.info(f"Saved training data to {training_path}")
+        dedup_path = output_dir / "dedup_report.csv"
+        dedup_report.to_csv(dedup_path, index=False)
+        logger.info(f"Saved dedup report to {dedup_path}")
         
         report_path = output_dir / "quality_report.txt"
         with open(report_path, 'w') as f:
             f.write(f"QA Pair Quality Report\n{'='*30}\n")
-            f.write(f"Valid Pairs: {validation['valid_pairs']}/{len(qa_df)}\n")
+            f.write(f"Valid Pairs: {validation['valid_pairs']}/{validation['valid_pairs'] + validation['invalid_pairs']}\n")
             if validation['error_breakdown']:
                 f.write("\nError Breakdown:\n")
                 for err, count in validation['error_breakdown'].items():
                     f.write(f"- {err}: {count}\n")
+            f.write(f"\nNear-duplicates removed: {len(dedup_report)} "
+                    f"(similarity >= {deduplicator.threshold})\n")
+            f.write("\nSources:\n")
+            for report in augmentor.source_reports:
+                outcome = (f"{report['pairs']} pairs in {report['seconds']}s" if report['status'] == "ok"
+                           else f"FAILED ({report['error']})")
+                f.write(f"- {report['path']} [{report['type']}, {report['worker']}]: {outcome}\n")
         logger.info(f"Saved quality report to {report_path}")
         
         logger.info("Pipeline completed successfully!")
@@ -2,8 +2,14 @@
 import os
 import sys
 import torch
+from pathlib import Path
+
+# Modules import shared code as ``src.…``, so the repo root must be importable too
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
 from fine_tuning.config import FineTuningConfig
 from fine_tuning.trainer import EVQATrainer
+from utils.shards import read_texts, shard_paths
 
 def print_system_info():
     print("\n🖥️  System Information:")
@@ -23,7 +29,7 @@ def main():
         print(f"Model: {config.model_name}")
         print(f"Batch size: {config.batch_size}")
         print(f"Seq length: {config.max_seq_length}")
-        print(f"Training samples: {len(open(config.train_data_path).readlines())}")
+        print(f"Training samples: {sum(1 for _ in read_texts(shard_paths(config.train_data_path)))}")
         
         trainer = EVQATrainer(config)
         trainer.train()
@@ -0,0 +1,36 @@
+# src/utils/shards.py
+"""Dataset files on disk, shared by dataset preparation and fine-tuning.
+
+Kept free of model dependencies, so listing or reading training files
+never imports the generation or training stack.
+"""
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, List, Union
+
+def shard_paths(path: Union[str, Path]) -> List[Path]:
+    """Files making up a dataset: the file itself, a directory's files, or its ``-NNNNN`` shards"""
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.is_file() and not p.name.startswith('.'))
+    shards = sorted(path.parent.glob(f"{path.stem}-[0-9][0-9][0-9][0-9][0-9]{path.suffix}"))
+    if not shards:
+        raise FileNotFoundError(f"No dataset file or shards found for {path}")
+    return shards
+
+def read_texts(paths: Iterable[Union[str, Path]]) -> Iterator[str]:
+    """Prompt text per line: the "text" field of JSONL records, or the line itself"""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    yield line
+                    continue
+                yield record.get("text", line) if isinstance(record, dict) else line
\ No newline at end of file